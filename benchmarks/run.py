@@ -0,0 +1,380 @@
+"""Benchmarks painting, region switching, import/export and fingerprinting at
+production mesh sizes, without Maya (see stand_in.py).
+
+Usage:
+    python benchmarks/run.py                         # Compare against baselines.json.
+    python benchmarks/run.py --sizes 10k 1M --record  # Store new baselines.
+    python benchmarks/run.py --time-tolerance 0.5     # Also gate on the wall time.
+
+Every case reports the best wall time over the repeats, the number of Maya calls
+(and components passed to them) and the peak memory traced during an extra run.
+The core cases run on the scene backend (library/api.py) through the stand-in,
+so their Maya calls are counted as in the tool. A case fails when it has no
+baseline, when it makes more Maya calls or passes more components than its
+baseline, or when its memory exceeds the baseline by more than the tolerance.
+These do not depend on the machine, unlike the time, only gated on request. The
+PainterUI cases need PySide2/PySide6 and are skipped without them, unless run
+with --require-qt."""
+
+from pathlib import Path
+import argparse, json, math, os, sys, tempfile, time, tracemalloc
+
+import numpy as np
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, BENCHMARKS_DIR.parent.joinpath("scripts").as_posix())
+
+import stand_in  # noqa: E402
+
+RECORDER = stand_in.install()
+
+from warpaint import ROOT_DIR  # noqa: E402
+from warpaint.core import blending, deformation, documents, feathering, inspection, landmarks, masks, merging, objects, spatial, store, surface_maps, topology  # noqa: E402
+from warpaint.core.numpy_backend import NumpyMesh, grid_mesh  # noqa: E402
+from warpaint.library import api  # noqa: E402
+
+
+BASELINES_FILEPATH = BENCHMARKS_DIR.joinpath("baselines.json")
+SIZES = {"10k": 10_000, "100k": 100_000, "1M": 1_000_000, "2M": 2_000_000}
+
+MESH, MORPH, TARGET, BLEND = "body", "bodyMorph", "bodyTarget", "bodyBlend"
+STROKE_COUNT, REGIONS = 8, ["face", "body"]
+PAINT_FRACTION = 0.1  # -- Of the faces, selected for every paint.
+PREVIEW_TICKS = 10
+
+TIME_TOLERANCE, MEMORY_TOLERANCE = None, 0.25  # -- None, the time is not gated.
+MIN_TIME_DELTA = 0.01  # s, smaller differences are noise.
+
+COLOUR_NAMES = list(json.loads(ROOT_DIR.joinpath("palette", "palette.json").read_text()))
+
+
+# • ───────────────────────────
+# • ──── Fixtures. ────
+
+
+def build_mesh(face_count):
+    rows = int(math.sqrt(face_count))
+    return grid_mesh(rows, math.ceil(face_count / rows))
+
+
+def build_strokes_data(face_count):
+    """Splits half of the faces into bands, one per stroke, across the regions."""
+
+    band = face_count // (2 * STROKE_COUNT)
+    strokes_data = {}
+
+    for index in range(STROKE_COUNT):
+        indices = list(range(2 * index * band, (2 * index + 1) * band))
+        strokes_data[f"stroke_{index}"] = {"colour_name": COLOUR_NAMES[index % len(COLOUR_NAMES)], "indices": indices, "region": REGIONS[index % len(REGIONS)]}
+
+    return strokes_data
+
+
+def paint_indices(face_count):
+    """A block of faces overlapping two strokes and unpainted faces."""
+
+    start = face_count // (2 * STROKE_COUNT) // 2
+    return list(range(start, start + int(face_count * PAINT_FRACTION)))
+
+
+def palette(stroke):
+    return (255, 0, 0) if stroke.is_highlighted else (128, 0, 0)
+
+
+class Fixture:
+    def __init__(self, face_count):
+        self.mesh = build_mesh(face_count)
+        self.strokes_data = build_strokes_data(self.mesh.face_count)
+        self.paint_indices = paint_indices(self.mesh.face_count)
+
+        self.backend = api.MayaBackend()
+        RECORDER.meshes = {MESH: self.mesh}
+
+    def core_store(self):
+        return store.StrokeStore.from_data(MESH, self.strokes_data, self.backend, palette)
+
+    def paint_polygons(self):
+        """The polygons of a paint, with the colour set of the mesh already
+        created, as it is after the first paint."""
+
+        api.get_colour_fn(MESH)
+        return api.to_polygons(MESH, self.paint_indices)
+
+    def painter(self):
+        from warpaint.tabs.paint_ui import PainterUI
+        from warpaint.model.settings import Settings
+
+        painter = PainterUI(Settings())
+        painter.import_data(MESH, {"strokes": self.strokes_data})
+        return painter
+
+    def select_paint_faces(self):
+        RECORDER.selection = [f"{MESH}.f[{index}]" for index in self.paint_indices]
+
+
+# • ───────────────────────────
+# • ──── Cases. ────
+
+
+def _core_paint(mode):
+    def setup(fixture):
+        return fixture, fixture.core_store()
+
+    def run(context):
+        fixture, strokes = context
+        strokes.paint(strokes.all_strokes()[0], fixture.paint_indices, mode)
+
+    return setup, run
+
+
+def _core_deformation(fixture):
+    points = fixture.mesh.points.copy()
+    points[:, 1] += np.sin(points[:, 0] * 8) * 0.05
+    RECORDER.add_mesh(MORPH, NumpyMesh(fixture.mesh.face_counts, fixture.mesh.face_vertices, points))
+
+    def run():
+        changes = deformation.compare(MESH, MORPH, fixture.backend)
+        return [changes.stats(name, values["indices"]) for name, values in fixture.strokes_data.items()]
+
+    return run
+
+
+def _core_blend_preview(fixture):
+    """Previews a morph moving a tenth of the vertices, over a few ticks, on a
+    copy of the mesh."""
+
+    points = fixture.mesh.points.copy()
+    RECORDER.add_mesh(BLEND, NumpyMesh(fixture.mesh.face_counts, fixture.mesh.face_vertices, points.copy()))
+
+    points[: len(points) // 10, 1] += 0.1
+    RECORDER.add_mesh(MORPH, NumpyMesh(fixture.mesh.face_counts, fixture.mesh.face_vertices, points))
+
+    point_blend = blending.PointBlend(BLEND, MORPH, fixture.backend)
+    point_blend.set_weight(0.1)  # -- The first tick writes all the points.
+
+    def run():
+        for weight in np.linspace(0.2, 1.0, PREVIEW_TICKS):
+            point_blend.set_weight(weight)
+
+    return run
+
+
+def _core_surface_map(fixture):
+    RECORDER.add_mesh(TARGET, NumpyMesh(fixture.mesh.face_counts, fixture.mesh.face_vertices, fixture.mesh.points * 1.01))
+    return lambda: surface_maps.build_surface_map(MESH, TARGET, fixture.strokes_data, fixture.strokes_data, fixture.backend)
+
+
+def _core_merge(fixture):
+    """Our side unpaints the last tenth of every stroke, theirs moves the first
+    tenth of every stroke into the next one."""
+
+    names, strokes_data = list(fixture.strokes_data), fixture.strokes_data
+    ours, theirs = {}, {}
+
+    for index, name in enumerate(names):
+        indices = strokes_data[name]["indices"]
+        moved = strokes_data[names[index - 1]]["indices"][: len(strokes_data[names[index - 1]]["indices"]) // 10]
+
+        ours[name] = dict(strokes_data[name], indices=indices[: len(indices) - len(indices) // 10])
+        theirs[name] = dict(strokes_data[name], indices=sorted(indices[len(indices) // 10 :] + moved))
+
+    return [{"strokes": strokes_data}, {"strokes": ours}, {"strokes": theirs}]
+
+
+def _core_manifest(fixture):
+    """Writes the document as a plain file and as a manifest, for reading."""
+
+    directory = Path(tempfile.gettempdir()).joinpath("warpaint_bench")
+    directory.mkdir(exist_ok=True)
+    document = documents.build_document(MESH, fixture.strokes_data, fixture.backend)
+
+    documents.write_document(directory.joinpath("plain.paint"), document)
+    documents.write_document(directory.joinpath("manifest.paint"), document, objects.ObjectStore(directory.joinpath(objects.OBJECTS_DIRNAME)))
+
+    return directory
+
+
+def _painter_paint(mode):
+    def setup(fixture):
+        painter = fixture.painter()
+        getattr(painter, f"{mode}_radio").setChecked(True)
+        fixture.select_paint_faces()
+        return painter
+
+    def run(painter):
+        painter.on_paint()
+
+    return setup, run
+
+
+def _clear_caches():
+    topology.clear_cache()
+    spatial.clear_cache()
+
+
+CASES = {
+    # -- The Maya side of every paint, runs anywhere.
+    "api_to_polygons": (False, lambda fixture: fixture, lambda fixture: api.to_polygons(MESH, fixture.paint_indices)),
+    "api_get_indices": (False, lambda fixture: fixture.paint_polygons(), lambda polygons: api.get_indices(polygons)),
+    "api_colour_polygons": (False, lambda fixture: fixture.paint_polygons(), lambda polygons: api.colour_polygons(255, 0, 0, polygons)),
+    "api_decolour_polygons": (False, lambda fixture: fixture.paint_polygons(), lambda polygons: api.decolour_polygons(polygons)),
+    # -- Core, runs anywhere.
+    "core_import": (False, lambda fixture: fixture, lambda fixture: fixture.core_store()),
+    "core_paint_append": (False, *_core_paint(store.APPEND)),
+    "core_paint_replace": (False, *_core_paint(store.REPLACE)),
+    "core_paint_remove": (False, *_core_paint(store.REMOVE)),
+    "core_region_switch": (False, lambda fixture: fixture.core_store(), lambda strokes: strokes.set_region(REGIONS[1])),
+    "core_export": (False, lambda fixture: fixture.core_store(), lambda strokes: strokes.data()),
+    "core_deformation": (False, _core_deformation, lambda run: run()),
+    "core_blend_preview": (False, _core_blend_preview, lambda run: run()),
+    "core_landmarks": (False, lambda fixture: fixture, lambda fixture: landmarks.extract_landmarks(MESH, fixture.strokes_data, fixture.backend)),
+    "core_surface_map": (False, _core_surface_map, lambda run: run()),
+    "core_feathering": (False, lambda fixture: fixture, lambda fixture: feathering.feather_strokes(MESH, fixture.strokes_data, backend=fixture.backend)),
+    "core_masks": (False, lambda fixture: fixture, lambda fixture: masks.rasterize_strokes(MESH, fixture.strokes_data, workers=1, backend=fixture.backend)),
+    "core_inspection": (False, lambda fixture: fixture, lambda fixture: inspection.inspect_strokes(MESH, fixture.strokes_data, backend=fixture.backend)),
+    "core_merge": (False, _core_merge, lambda documents: merging.merge_documents(*documents)),
+    "core_read_plain": (False, _core_manifest, lambda directory: documents.read_document(directory.joinpath("plain.paint"))),
+    "core_read_manifest": (False, _core_manifest, lambda directory: documents.read_document(directory.joinpath("manifest.paint"))),
+    "fingerprint": (False, lambda fixture: (_clear_caches(), fixture)[1], lambda fixture: documents.build_document(MESH, fixture.strokes_data, fixture.backend)),
+    # -- PainterUI, through the stand-in.
+    "painter_import": (True, lambda fixture: (fixture, fixture.painter()), lambda context: context[1].import_data(MESH, {"strokes": context[0].strokes_data})),
+    "painter_paint_append": (True, *_painter_paint("append")),
+    "painter_paint_replace": (True, *_painter_paint("replace")),
+    "painter_paint_remove": (True, *_painter_paint("remove")),
+    "painter_region_switch": (True, lambda fixture: fixture.painter(), lambda painter: painter.regions.set_region(REGIONS[1])),
+    "painter_export": (True, lambda fixture: fixture.painter(), lambda painter: painter.export_data()),
+}
+
+
+# • ───────────────────────────
+# • ──── Measure. ────
+
+
+def measure(fixture, setup, run, repeat):
+    """Runs a case repeat times for the wall time, then once more traced for the
+    peak memory. Maya calls are counted on the last timed run."""
+
+    seconds = math.inf
+
+    for _ in range(repeat):
+        context = setup(fixture)
+        RECORDER.reset()
+
+        start = time.perf_counter()
+        run(context)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    calls, components = RECORDER.total_calls(), sum(RECORDER.components.values())
+
+    context = setup(fixture)
+    tracemalloc.start()
+    run(context)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"seconds": round(seconds, 4), "calls": calls, "components": components, "peak_mb": round(peak / 2**20, 2)}
+
+
+def compare(result, baseline, time_tolerance, memory_tolerance):
+    """Lists the regressions of a result against its baseline, the time only
+    with a tolerance."""
+
+    regressions = []
+
+    if result["calls"] > baseline["calls"]:
+        regressions.append(f"calls {baseline['calls']} -> {result['calls']}")
+
+    if result["components"] > baseline["components"]:
+        regressions.append(f"components {baseline['components']} -> {result['components']}")
+
+    if time_tolerance is not None and result["seconds"] > max(baseline["seconds"] * (1 + time_tolerance), baseline["seconds"] + MIN_TIME_DELTA):
+        regressions.append(f"time {baseline['seconds']}s -> {result['seconds']}s")
+
+    if result["peak_mb"] > baseline["peak_mb"] * (1 + memory_tolerance):
+        regressions.append(f"memory {baseline['peak_mb']}MB -> {result['peak_mb']}MB")
+
+    return regressions
+
+
+def has_qt():
+    from warpaint import qt
+
+    if not qt.binding:
+        return False
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    qt.QtWidgets.QApplication.instance() or qt.QtWidgets.QApplication([])
+
+    icons_dir = ROOT_DIR.joinpath("resources/icons")  # -- As BaseTemplate does.
+    qt.QtCore.QDir.setSearchPaths(icons_dir.name, [icons_dir.as_posix()])
+    return True
+
+
+# • ───────────────────────────
+# • ──── CLI. ────
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark War Paint without Maya.")
+
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES), help="The mesh sizes, in faces.")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES), help="The cases to run.")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of timed runs per case.")
+    parser.add_argument("--baselines", default=BASELINES_FILEPATH.as_posix(), help="The baselines file.")
+    parser.add_argument("--record", action="store_true", help="Store the results as the new baselines.")
+    parser.add_argument("--require-qt", action="store_true", help="Fail the PainterUI cases without PySide, rather than skip them.")
+    parser.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE, help="The allowed relative slowdown, the time is not gated by default.")
+    parser.add_argument("--memory-tolerance", type=float, default=MEMORY_TOLERANCE, help="The allowed relative memory growth.")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    qt_available = has_qt()
+
+    baselines_filepath = Path(args.baselines)
+    baselines = json.loads(baselines_filepath.read_text()) if baselines_filepath.exists() else {}
+
+    results, failures = {}, []
+    print(f"{'case':<24}{'size':>6}{'seconds':>10}{'calls':>9}{'components':>12}{'peak MB':>10}  status")
+
+    for size in args.sizes:
+        fixture = Fixture(SIZES[size])
+
+        for name in args.cases:
+            requires_qt, setup, run = CASES[name]
+            key = f"{name}/{size}"
+
+            if requires_qt and not qt_available:
+                failures += [key] if args.require_qt else []
+                print(f"{name:<24}{size:>6}{'':>41}  {'FAILED' if args.require_qt else 'skipped'} (no Qt)")
+                continue
+
+            result = results[key] = measure(fixture, setup, run, max(1, args.repeat))
+
+            if args.record:
+                status = "recorded"
+            elif key not in baselines:
+                status = "FAILED (no baseline, run with --record)"
+            else:
+                regressions = compare(result, baselines[key], args.time_tolerance, args.memory_tolerance)
+                status = "REGRESSION: " + ", ".join(regressions) if regressions else "ok"
+
+            failures += [key] if status.startswith(("FAILED", "REGRESSION")) else []
+            print(f"{name:<24}{size:>6}{result['seconds']:>10.4f}{result['calls']:>9}{result['components']:>12}{result['peak_mb']:>10.2f}  {status}")
+
+    if args.record:
+        baselines_filepath.write_text(json.dumps(dict(baselines, **results), indent=4, sort_keys=True))
+        print(f"Baselines saved to: {baselines_filepath}")
+        return 0
+
+    if failures:
+        print(f"{len(failures)} failure(s): {', '.join(failures)}")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
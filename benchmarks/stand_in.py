@@ -0,0 +1,247 @@
+"""A recording stand-in for maya.cmds and maya.api.OpenMaya, so the benchmarks
+run without Maya. Meshes are core NumpyMesh instances; every command and
+function set call is counted, along with the number of components passed to it.
+Commands without a dedicated fake return None."""
+
+from collections import Counter
+import sys, types
+
+import numpy as np
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = Counter()
+        self.components = Counter()
+        self.meshes = {}
+        self.selection = []
+
+    def reset(self):
+        self.calls.clear()
+        self.components.clear()
+
+    def record(self, name, items=None):
+        self.calls[name] += 1
+
+        if isinstance(items, (list, tuple, set)):
+            self.components[name] += len(items)
+
+    def add_mesh(self, name, mesh):
+        self.meshes[name] = mesh
+        return name
+
+    def total_calls(self):
+        return sum(self.calls.values())
+
+
+RECORDER = Recorder()
+
+
+# • ───────────────────────────
+# • ──── maya.cmds ────
+
+
+def _filterExpand(*args, **kwargs):
+    return list(RECORDER.selection) or None
+
+
+def _select(items=None, *args, **kwargs):
+    RECORDER.selection = [] if kwargs.get("clear") or items is None else list(items if isinstance(items, (list, tuple, set)) else [items])
+
+
+def _ls(*args, **kwargs):
+    if kwargs.get("selection"):
+        return list(RECORDER.selection)
+
+    if kwargs.get("type") == "mesh":
+        return [f"{name}Shape" for name in RECORDER.meshes]
+
+    return []
+
+
+def _listRelatives(node, *args, **kwargs):
+    if kwargs.get("shapes"):
+        return [f"{node}Shape"] if node in RECORDER.meshes else None
+
+    if kwargs.get("parent"):
+        return [name[: -len("Shape")] for name in (node if isinstance(node, list) else [node])]
+
+    return []
+
+
+def _objExists(node):
+    node = node.split(".")[0]
+    return node in RECORDER.meshes or (node.endswith("Shape") and node[: -len("Shape")] in RECORDER.meshes)
+
+
+COMMANDS = {"filterExpand": _filterExpand, "select": _select, "ls": _ls, "listRelatives": _listRelatives, "objExists": _objExists}
+
+
+class CommandsModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        command = COMMANDS.get(name)
+
+        def recorded(*args, **kwargs):
+            RECORDER.record(f"cmds.{name}", args[0] if args else None)
+            return command(*args, **kwargs) if command else None
+
+        return recorded
+
+
+# • ───────────────────────────
+# • ──── maya.api.OpenMaya ────
+
+
+class MSpace:
+    kTransform, kPreTransform, kPostTransform, kWorld, kObject = 1, 2, 3, 4, 1
+
+
+class MSelectionList:
+    def __init__(self):
+        RECORDER.record("om2.MSelectionList")
+        self.items = []
+
+    def add(self, node):
+        self.items.append(node)
+
+    def getDagPath(self, index):
+        return self.items[index]
+
+    def getDependNode(self, index):
+        return self.items[index]
+
+
+class MIntArray(list):
+    pass
+
+
+class MPoint(tuple):
+    def __new__(cls, values):
+        return super().__new__(cls, values)
+
+
+class MPointArray(list):
+    pass
+
+
+class MColor(tuple):
+    def __new__(cls, values):
+        return super().__new__(cls, values)
+
+
+class MColorArray(list):
+    def __init__(self, length=0, colour=None):
+        super().__init__([colour] * length)
+
+
+class MFnMesh:
+    def __init__(self, node):
+        RECORDER.record("om2.MFnMesh")
+        name = node.split("|")[-1].split(".")[0]
+        self.mesh = RECORDER.meshes[name[: -len("Shape")] if name.endswith("Shape") else name]
+
+        if not hasattr(self.mesh, "colour_sets"):
+            self.mesh.colour_sets, self.mesh.current_colour_set = [], None
+
+    def getVertices(self):
+        RECORDER.record("om2.MFnMesh.getVertices")
+        return self.mesh.face_counts, self.mesh.face_vertices
+
+    def getPoints(self, space=MSpace.kObject):
+        RECORDER.record("om2.MFnMesh.getPoints")
+        points = self.mesh.world_points() if space == MSpace.kWorld else self.mesh.points
+        return np.hstack([points, np.ones((len(points), 1))])
+
+    def setPoints(self, points, space=MSpace.kObject):
+        RECORDER.record("om2.MFnMesh.setPoints", points)
+        self.mesh.points = np.array(points, dtype=np.float64)
+
+    def updateSurface(self):
+        RECORDER.record("om2.MFnMesh.updateSurface")
+
+    def getColorSetNames(self):
+        return list(self.mesh.colour_sets)
+
+    def createColorSet(self, name, clamped, *args, **kwargs):
+        RECORDER.record("om2.MFnMesh.createColorSet")
+        self.mesh.colour_sets.append(name)
+
+    def deleteColorSet(self, name, *args, **kwargs):
+        RECORDER.record("om2.MFnMesh.deleteColorSet")
+        self.mesh.colour_sets.remove(name)
+        self.mesh.coloured[:] = False
+
+    def currentColorSetName(self):
+        return self.mesh.current_colour_set
+
+    def setCurrentColorSetName(self, name, *args, **kwargs):
+        self.mesh.current_colour_set = name
+
+    def setFaceColors(self, colours, faces, *args, **kwargs):
+        RECORDER.record("om2.MFnMesh.setFaceColors", faces)
+        self.mesh.colours[faces] = np.array(colours[0][:3]) * 255 if colours else 0
+        self.mesh.coloured[faces] = True
+
+    def removeFaceColors(self, faces):
+        RECORDER.record("om2.MFnMesh.removeFaceColors", faces)
+        self.mesh.coloured[faces] = False
+
+    def currentUVSetName(self):
+        return "map1"
+
+    def getUVs(self, uv_set=None):
+        RECORDER.record("om2.MFnMesh.getUVs")
+        uvs = self.mesh.uvs if self.mesh.uvs is not None else np.empty((0, 2))
+        return uvs[:, 0], uvs[:, 1]
+
+    def getAssignedUVs(self, uv_set=None):
+        RECORDER.record("om2.MFnMesh.getAssignedUVs")
+
+        if self.mesh.uvs is None:
+            return np.zeros(self.mesh.face_count, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        return self.mesh.face_counts, self.mesh.uv_ids
+
+    def getPolygonNormal(self, index):
+        RECORDER.record("om2.MFnMesh.getPolygonNormal")
+        return types.SimpleNamespace(x=0.0, y=1.0, z=0.0)
+
+
+class OpenMayaModule(types.ModuleType):
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        def recorded(*args, **kwargs):
+            RECORDER.record(f"{self.__name__}.{name}")
+
+        return recorded
+
+
+def install():
+    """Installs the stand-in modules, must run before importing warpaint modules
+    that import Maya.
+
+    Returns:
+    - Recorder: The recorder of all the calls."""
+
+    maya = types.ModuleType("maya")
+    maya.cmds = CommandsModule("maya.cmds")
+    maya.api = types.ModuleType("maya.api")
+
+    maya.api.OpenMaya = OpenMayaModule("maya.api.OpenMaya")
+    for api_class in [MSpace, MSelectionList, MFnMesh, MIntArray, MPoint, MPointArray, MColor, MColorArray]:
+        setattr(maya.api.OpenMaya, api_class.__name__, api_class)
+
+    maya.api.OpenMayaUI = OpenMayaModule("maya.api.OpenMayaUI")
+    maya.OpenMayaUI = OpenMayaModule("maya.OpenMayaUI")
+
+    modules = {"maya": maya, "maya.cmds": maya.cmds, "maya.api": maya.api, "maya.OpenMayaUI": maya.OpenMayaUI}
+    modules.update({"maya.api.OpenMaya": maya.api.OpenMaya, "maya.api.OpenMayaUI": maya.api.OpenMayaUI})
+    sys.modules.update(modules)
+
+    return RECORDER
+
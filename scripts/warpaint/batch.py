@@ -0,0 +1,249 @@
+"""Applies .paint documents to many scenes or mesh files without the UI, spread
+over a pool of mayapy worker processes.
+
+Usage:
+    python -m warpaint.batch template.paint scenes/*.mb --jobs 8 --output-dir painted
+    python -m warpaint.batch --manifest manifest.json --source template.mb --report report.json
+    python -m warpaint.batch template.paint scenes/*.mb --landmarks  # Also export the landmarks.
+    python -m warpaint.batch template.paint scenes/*.mb --masks 4096 --packed-masks  # And UV masks.
+
+A manifest is a JSON object mapping every scene to its .paint file, or a list of
+jobs such as {"scene": "hero.mb", "paint": "hero.paint", "mesh": "body"}. Relative
+paths are resolved against the manifest's directory."""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+import argparse, json, os, subprocess, sys
+
+
+RESULT_PREFIX = "WARPAINT_RESULT "
+SOURCE_NAMESPACE = "warPaintSource"
+TRANSFERRED, FAILED = "transferred", "failed"
+
+SCENE_TYPES = {".ma": "mayaAscii", ".mb": "mayaBinary"}
+IMPORT_TYPES = {".obj": ("objExport", "OBJ"), ".fbx": ("fbxmaya", "FBX")}
+
+
+# • ───────────────────────────
+# • ──── Jobs. ────
+
+
+def load_jobs(args):
+    """Builds the list of jobs from the command line arguments."""
+
+    defaults = {"mesh": args.mesh, "source": args.source, "source_mesh": args.source_mesh, "output_dir": args.output_dir, "landmarks": args.landmarks}
+    defaults.update(masks=args.masks, packed_masks=args.packed_masks)
+
+    if args.manifest:
+        manifest_path = Path(args.manifest).resolve()
+        manifest = json.loads(manifest_path.read_text())
+
+        if isinstance(manifest, dict):
+            manifest = [{"scene": scene, "paint": paint} for scene, paint in manifest.items()]
+
+        jobs = [dict(defaults, **entry) for entry in manifest]
+
+        for job in jobs:
+            for key in ["scene", "paint", "source", "output_dir"]:
+                if job.get(key):
+                    job[key] = manifest_path.parent.joinpath(job[key]).as_posix()
+
+        return jobs
+
+    return [dict(defaults, scene=Path(scene).resolve().as_posix(), paint=Path(args.paint).resolve().as_posix()) for scene in args.scenes]
+
+
+def run_batch(jobs, mayapy, workers):
+    """Runs every job in its own mayapy process, at most workers at a time.
+
+    Returns:
+    - list[dict]: The result of every job, in order."""
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(partial(_run_worker, mayapy), jobs))
+
+
+def _run_worker(mayapy, job):
+    scripts_dir = Path(__file__).resolve().parent.parent.as_posix()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [scripts_dir, env.get("PYTHONPATH")]))
+
+    command = [mayapy, "-m", "warpaint.batch", "--worker", json.dumps(job)]
+    process = subprocess.run(command, env=env, capture_output=True, text=True)
+
+    for line in reversed(process.stdout.splitlines()):
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX) :])
+
+    error = (process.stderr or process.stdout).strip().splitlines()
+    return {"scene": job["scene"], "status": FAILED, "error": error[-1] if error else f"Exit code {process.returncode}."}
+
+
+# • ───────────────────────────
+# • ──── Worker. ────
+
+
+def run_job(job):
+    """Applies a .paint document to a scene and saves it, along with the .paint
+    document matching the painted mesh. Runs inside mayapy."""
+
+    import maya.standalone
+
+    maya.standalone.initialize(name="python")
+
+    from maya import cmds
+    from warpaint.core import documents, landmarks, masks, store
+    from warpaint.model import strokes
+
+    scene = Path(job["scene"])
+    _open_scene(cmds, scene)
+
+    mesh = _find_mesh(cmds, job.get("mesh"))
+    document, status = documents.match_document(mesh, documents.read_document(job["paint"]))
+    strokes_data = document["strokes"]
+
+    if status == documents.MISMATCHED:
+        if not job.get("source"):
+            raise RuntimeError(f"'{mesh}' does not match the paint, pass a source scene to transfer it.")
+
+        strokes_data, status = _transfer_from_source(cmds, documents, job, mesh), TRANSFERRED
+
+    stroke_store = store.StrokeStore(mesh, palette=strokes.Stroke.rgb)
+
+    for name, values in strokes_data.items():
+        stroke_store.add_stroke(strokes.Stroke.from_data(name, values))
+
+    output_dir = Path(job["output_dir"]) if job.get("output_dir") else scene.parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    output_scene = output_dir.joinpath(scene.name if scene.suffix in SCENE_TYPES else f"{scene.stem}.mb")
+    cmds.file(rename=output_scene.as_posix())
+    cmds.file(save=True, force=True, type=SCENE_TYPES[output_scene.suffix])
+
+    output_paint = output_scene.with_suffix(documents.FILE_EXTENSION)
+    documents.write_document(output_paint, documents.build_document(mesh, strokes_data))
+
+    result = {"scene": job["scene"], "status": status, "mesh": mesh, "strokes": len(strokes_data), "output": output_scene.as_posix()}
+
+    if job.get("landmarks"):
+        json_path, _ = landmarks.write_landmarks(output_scene.with_suffix(""), mesh, landmarks.extract_landmarks(mesh, strokes_data))
+        result["landmarks"] = json_path.as_posix()
+
+    if job.get("masks"):
+        # -- The scenes already run in parallel, the strokes of a scene are rasterized in its process.
+        stroke_masks = masks.rasterize_strokes(mesh, strokes_data, resolution=job["masks"], workers=1)
+        result["masks"] = [path.as_posix() for path in masks.write_masks(output_scene.with_suffix(""), stroke_masks, packed=job.get("packed_masks"))]
+
+    return result
+
+
+def _open_scene(cmds, path):
+    if path.suffix in SCENE_TYPES:
+        cmds.file(path.as_posix(), open=True, force=True)
+        return
+
+    plugin, file_type = IMPORT_TYPES[path.suffix.lower()]
+
+    if not cmds.pluginInfo(plugin, query=True, loaded=True):
+        cmds.loadPlugin(plugin)
+
+    cmds.file(new=True, force=True)
+    cmds.file(path.as_posix(), i=True, type=file_type, ignoreVersion=True)
+
+
+def _find_mesh(cmds, name=None, namespace=None):
+    if name:
+        name = f"{namespace}:{name}" if namespace else name
+
+        if not cmds.objExists(name):
+            raise RuntimeError(f"Mesh '{name}' not found.")
+
+        return name
+
+    shapes = cmds.ls(f"{namespace}:*" if namespace else "*", type="mesh", noIntermediate=True, long=True) or []
+    meshes = sorted(set(cmds.listRelatives(shapes, parent=True) or []))
+
+    if len(meshes) != 1:
+        raise RuntimeError(f"Expected one mesh, found {len(meshes)}: pass the mesh name.")
+
+    return meshes[0]
+
+
+def _transfer_from_source(cmds, documents, job, mesh):
+    """Imports the source scene, which the paint matches, and projects the paint
+    from its mesh onto the target mesh."""
+
+    cmds.file(job["source"], i=True, namespace=SOURCE_NAMESPACE, force=True)
+
+    try:
+        source_mesh = _find_mesh(cmds, job.get("source_mesh"), namespace=SOURCE_NAMESPACE)
+        source_document, status = documents.match_document(source_mesh, documents.read_document(job["paint"]))
+
+        if status == documents.MISMATCHED:
+            raise RuntimeError(f"The source mesh '{source_mesh}' does not match the paint either.")
+
+        return documents.transfer_document(source_mesh, mesh, source_document["strokes"])
+
+    finally:
+        cmds.namespace(removeNamespace=SOURCE_NAMESPACE, deleteNamespaceContent=True)
+
+
+# • ───────────────────────────
+# • ──── CLI. ────
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="warpaint.batch", description="Apply .paint files to many scenes headlessly.")
+
+    parser.add_argument("paint", nargs="?", help="The .paint file applied to every scene.")
+    parser.add_argument("scenes", nargs="*", help="The scenes or mesh files (.ma, .mb, .obj, .fbx).")
+    parser.add_argument("--manifest", help="A JSON manifest of scenes and their .paint files.")
+    parser.add_argument("--mesh", help="The name of the mesh to paint, if the scenes hold several.")
+    parser.add_argument("--source", help="A scene the paint matches, to transfer from onto mismatching meshes.")
+    parser.add_argument("--source-mesh", help="The name of the mesh in the source scene.")
+    parser.add_argument("--output-dir", help="Where to save the painted scenes, in place by default.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="The number of mayapy processes.")
+    parser.add_argument("--mayapy", default=os.getenv("MAYAPY", "mayapy"), help="The mayapy executable.")
+    parser.add_argument("--report", help="Write the results to this JSON file.")
+    parser.add_argument("--landmarks", action="store_true", help="Also export the landmarks of every painted mesh (.landmarks.json and .landmarks).")
+    parser.add_argument("--masks", type=int, metavar="RESOLUTION", help="Also export a UV mask of every stroke at this resolution (.png).")
+    parser.add_argument("--packed-masks", action="store_true", help="Pack the masks four per RGBA image, listed in a .masks.json file.")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+
+    if not args.worker and not args.manifest and not (args.paint and args.scenes):
+        parser.error("pass a .paint file and scenes, or a manifest.")
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if args.worker:
+        job = json.loads(args.worker)
+
+        try:
+            result = run_job(job)
+        except Exception as err:
+            result = {"scene": job["scene"], "status": FAILED, "error": str(err)}
+
+        print(f"{RESULT_PREFIX}{json.dumps(result)}")
+        return 0 if result["status"] != FAILED else 1
+
+    results = run_batch(load_jobs(args), args.mayapy, max(1, args.jobs))
+
+    for result in results:
+        print(f"{result['status']:<12} {result['scene']}  {result.get('error', result.get('output', ''))}")
+
+    if args.report:
+        Path(args.report).write_text(json.dumps(results, indent=4))
+
+    return 1 if any(result["status"] == FAILED for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+from abc import ABC, abstractmethod
+
+
+_BACKEND = None
+
+
+class MeshBackend(ABC):
+    """The few mesh operations the core relies on. Meshes are referred to by
+    name and faces by index, so the core never handles component strings nor
+    imports Maya: the Maya backend lives in library/api.py, and core/numpy_backend.py
+    provides an in-memory backend for batch tools and benchmarks."""
+
+    @abstractmethod
+    def get_topology(self, mesh):
+        """Retrieves the topology of the mesh.
+
+        Args:
+        - mesh (str): The name of the mesh.
+
+        Returns:
+        - topology.Topology: The topology, cached per fingerprint."""
+
+    @abstractmethod
+    def get_points(self, mesh, world=False):
+        """Retrieves the positions of all vertices of the mesh.
+
+        Args:
+        - mesh (str): The name of the mesh.
+        - world (bool): Whether to retrieve world space positions.
+
+        Returns:
+        - np.ndarray: The (V, 3) vertex positions."""
+
+    @abstractmethod
+    def set_points(self, mesh, points, indices=None):
+        """Moves all vertices of the mesh at once.
+
+        Args:
+        - mesh (str): The name of the mesh.
+        - points (np.ndarray): The (V, 3) object space vertex positions.
+        - indices (np.ndarray, optional): The only vertices moved since the
+        previous call, e.g. the vertices a morph moves, all of them by default."""
+
+    @abstractmethod
+    def get_uvs(self, mesh, uv_set=None):
+        """Retrieves the UVs of the mesh and the UV of every face corner.
+
+        Args:
+        - mesh (str): The name of the mesh.
+        - uv_set (str, optional): The UV set, the current one by default.
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray]: The (U, 2) UVs and the UV index of every
+        face corner, in face_vertices order, -1 for corners without UVs."""
+
+    @abstractmethod
+    def colour_faces(self, mesh, indices, rgb):
+        """Displays a colour on the faces of the mesh.
+
+        Args:
+        - mesh (str): The name of the mesh.
+        - indices (np.ndarray): The face indices.
+        - rgb (tuple[int, int, int]): The colour, from 0 to 255."""
+
+    @abstractmethod
+    def decolour_faces(self, mesh, indices):
+        """Removes the displayed colour from the faces of the mesh."""
+
+    @abstractmethod
+    def select_faces(self, mesh, indices):
+        """Selects the faces of the mesh."""
+
+
+def set_backend(backend):
+    global _BACKEND
+    _BACKEND = backend
+
+
+def get_backend():
+    """Retrieves the active backend, falling back to the Maya backend which
+    registers itself on import.
+
+    Returns:
+    - MeshBackend: The active backend."""
+
+    if _BACKEND is None:
+        try:
+            from warpaint.library import api  # noqa: F401
+        except ImportError:
+            raise RuntimeError("No mesh backend set, see backend.set_backend.")
+
+    return _BACKEND
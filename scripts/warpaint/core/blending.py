@@ -0,0 +1,47 @@
+import numpy as np
+
+from warpaint.core import instrumentation
+from warpaint.core.backend import get_backend
+
+
+class PointBlend:
+    """Previews the blend of a base mesh towards a morph of the same topology
+    without a deformer: both point arrays are read once, then every weight is
+    interpolated in NumPy and written back to the base mesh in a single call.
+    Restoring writes the original points back, thus there is nothing to clean up
+    in the scene."""
+
+    def __init__(self, base_mesh, morph_mesh, backend=None):
+        self.backend = backend or get_backend()
+        self.base_mesh = base_mesh
+
+        self.base_points = np.array(self.backend.get_points(base_mesh), dtype=np.float64)
+        morph_points = np.asarray(self.backend.get_points(morph_mesh), dtype=np.float64)
+
+        if self.base_points.shape != morph_points.shape:
+            raise ValueError(f"Vertex counts differ: {len(self.base_points)} and {len(morph_points)}.")
+
+        self.deltas = morph_points - self.base_points
+        self.moved = np.flatnonzero(self.deltas.any(axis=1))  # -- Only these are written once previewing.
+        self.points = np.empty_like(self.base_points)
+        self.weight, self.is_previewing = 0.0, False
+
+    @instrumentation.traced("blending.set_weight")
+    def set_weight(self, weight):
+        """Writes the base points moved towards the morph by the weight.
+
+        Args:
+        - weight (float): The blend weight, 0 for the base and 1 for the morph."""
+
+        if weight == self.weight:
+            return
+
+        np.multiply(self.deltas, weight, out=self.points)
+        self.points += self.base_points
+
+        self.backend.set_points(self.base_mesh, self.points, self.moved if self.is_previewing else None)
+        self.weight, self.is_previewing = weight, True
+
+    def restore(self):
+        self.backend.set_points(self.base_mesh, self.base_points)
+        self.weight, self.is_previewing = 0.0, False
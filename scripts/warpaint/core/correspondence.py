@@ -0,0 +1,290 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from warpaint.core import topology
+
+
+CACHE_SIZE = 8
+MAX_SEEDS = 32
+
+_CORRESPONDENCES = OrderedDict()
+
+
+class Correspondence:
+    """The permutation between two meshes with identical topology but different
+    face and vertex order: face_map[i] and vertex_map[i] are the indices on the
+    target mesh of face and vertex i of the source mesh."""
+
+    def __init__(self, face_map, vertex_map):
+        self.face_map = face_map
+        self.vertex_map = vertex_map
+
+    def remap_faces(self, groups):
+        """Remaps groups of source face indices in one pass.
+
+        Args:
+        - groups (list[Sequence[int]]): The source face indices of each group.
+
+        Returns:
+        - list[np.ndarray]: The target face indices of each group."""
+
+        arrays = [np.asarray(group, dtype=np.int64) for group in groups]
+        bounds = np.cumsum([len(array) for array in arrays])[:-1]
+
+        remapped = self.face_map[np.concatenate(arrays)] if arrays else np.empty(0, dtype=np.int64)
+        return np.split(remapped, bounds)
+
+
+def solve(source, target):
+    """Finds the face and vertex permutation mapping the source topology onto the
+    target topology. Seeds are matched through per-face signatures, then the
+    match is propagated breadth-first over the half-edges: once a face pair and
+    its corner alignment are known, the faces across every edge are known too.
+    The solution is verified by re-hashing the permuted source topology, and
+    cached per pair of fingerprints.
+
+    Note:
+    - Topologies with rotational symmetries (e.g. a bare sphere) admit several
+    solutions, any of which is returned. Character meshes are mirror symmetric at
+    most, which flips the winding and thus never yields a false match.
+
+    Args:
+    - source (topology.Topology): The topology the indices refer to (e.g. stored).
+    - target (topology.Topology): The topology to map them onto (e.g. current).
+
+    Returns:
+    - Correspondence/None: The permutation, None if the topologies differ."""
+
+    key = (source.fingerprint, target.fingerprint)
+
+    if key in _CORRESPONDENCES:
+        _CORRESPONDENCES.move_to_end(key)
+        return _CORRESPONDENCES[key]
+
+    correspondence = _solve(source, target)
+    _CORRESPONDENCES[key] = correspondence
+
+    while len(_CORRESPONDENCES) > CACHE_SIZE:
+        _CORRESPONDENCES.popitem(last=False)
+
+    return correspondence
+
+
+def clear_cache():
+    _CORRESPONDENCES.clear()
+
+
+def _solve(source, target):
+    if source.face_count != target.face_count or source.vertex_count != target.vertex_count:
+        return None
+
+    if not np.array_equal(np.bincount(source.face_counts), np.bincount(target.face_counts)):
+        return None
+
+    face_map = np.full(source.face_count, -1, dtype=np.int64)
+    rotations = np.zeros(source.face_count, dtype=np.int64)
+    taken = np.zeros(target.face_count, dtype=bool)
+
+    source_valences, target_valences = _valences(source), _valences(target)
+    source_signatures = _signatures(source, source_valences)
+    target_signatures = _signatures(target, target_valences)
+
+    # -- Every iteration matches one connected shell.
+    while (face_map < 0).any():
+        component = _match_shell(source, target, source_signatures, target_signatures, source_valences, target_valences, face_map, taken)
+
+        if component is None:
+            return None
+
+        faces, matched_faces, matched_rotations = component
+        face_map[faces], rotations[faces], taken[matched_faces] = matched_faces, matched_rotations, True
+
+    vertex_map = _vertex_map(source, target, face_map, rotations)
+
+    if vertex_map is None or not _verify(source, target, face_map, rotations, vertex_map):
+        return None
+
+    return Correspondence(face_map, vertex_map)
+
+
+def _match_shell(source, target, source_signatures, target_signatures, source_valences, target_valences, face_map, taken):
+    """Matches the shell of the unmatched source face with the rarest signature,
+    trying every target face with that signature as seed."""
+
+    unmatched = np.flatnonzero(face_map < 0)
+    available = target_signatures[~taken]
+
+    signatures, counts = np.unique(available, return_counts=True)
+    rarity = np.full(len(unmatched), np.iinfo(np.int64).max)
+
+    positions = np.minimum(np.searchsorted(signatures, source_signatures[unmatched]), len(signatures) - 1)
+    found = signatures[positions] == source_signatures[unmatched]
+    rarity[found] = counts[positions[found]]
+
+    if not found.any():
+        return None
+
+    seed = unmatched[rarity.argmin()]
+    seed_valences = source_valences[source.face_vertices[source.face_offsets[seed] : source.face_offsets[seed + 1]]]
+    candidates = np.flatnonzero(~taken & (target_signatures == source_signatures[seed]))
+
+    for candidate in candidates[:MAX_SEEDS]:
+        candidate_valences = target_valences[target.face_vertices[target.face_offsets[candidate] : target.face_offsets[candidate + 1]]]
+
+        for rotation in range(len(seed_valences)):
+            if not np.array_equal(np.roll(candidate_valences, -rotation), seed_valences):
+                continue
+
+            component = _propagate(source, target, seed, candidate, rotation, taken)
+
+            if component is not None:
+                return component
+
+    return None
+
+
+def _propagate(source, target, seed, candidate, rotation, taken):
+    """Propagates a seed match breadth-first, one ring of faces at a time.
+    Corner k of a source face is aligned with corner (k + rotation) % n of its
+    target face.
+
+    Returns:
+    - tuple[np.ndarray]/None: The source faces, their target faces and rotations
+    or None if the propagation ran into a contradiction."""
+
+    source_twins, target_twins = source.half_edge_twins, target.half_edge_twins
+    source_corner_faces, target_corner_faces = source.corner_faces, target.corner_faces
+
+    local_map = np.full(source.face_count, -1, dtype=np.int64)
+    local_rotations = np.zeros(source.face_count, dtype=np.int64)
+    owners = np.full(target.face_count, -1, dtype=np.int64)
+
+    local_map[seed], local_rotations[seed], owners[candidate] = candidate, rotation, seed
+    frontier = np.array([seed])
+
+    while len(frontier):
+        matched, rotations = local_map[frontier], local_rotations[frontier]
+        counts = source.face_counts[frontier]
+
+        # -- All the corners of the frontier faces, aligned across both meshes.
+        corners = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        repeated_counts = np.repeat(counts, counts)
+
+        source_half_edges = np.repeat(source.face_offsets[frontier], counts) + corners
+        target_half_edges = np.repeat(target.face_offsets[matched], counts) + (corners + np.repeat(rotations, counts)) % repeated_counts
+
+        source_opposite, target_opposite = source_twins[source_half_edges], target_twins[target_half_edges]
+
+        if not np.array_equal(source_opposite < 0, target_opposite < 0):
+            return None
+
+        inner = source_opposite >= 0
+        source_opposite, target_opposite = source_opposite[inner], target_opposite[inner]
+
+        neighbours, matched_neighbours = source_corner_faces[source_opposite], target_corner_faces[target_opposite]
+        neighbour_counts = source.face_counts[neighbours]
+
+        if not np.array_equal(neighbour_counts, target.face_counts[matched_neighbours]):
+            return None
+
+        source_corners = source_opposite - source.face_offsets[neighbours]
+        target_corners = target_opposite - target.face_offsets[matched_neighbours]
+        neighbour_rotations = (target_corners - source_corners) % neighbour_counts
+
+        # -- Neighbours matched already must agree, new ones must agree among themselves.
+        known = local_map[neighbours] >= 0
+
+        if not np.array_equal(local_map[neighbours[known]], matched_neighbours[known]):
+            return None
+
+        if not np.array_equal(local_rotations[neighbours[known]], neighbour_rotations[known]):
+            return None
+
+        neighbours, matched_neighbours, neighbour_rotations = neighbours[~known], matched_neighbours[~known], neighbour_rotations[~known]
+
+        order = np.argsort(neighbours, kind="stable")
+        neighbours, matched_neighbours, neighbour_rotations = neighbours[order], matched_neighbours[order], neighbour_rotations[order]
+
+        repeated = np.zeros(len(neighbours), dtype=bool)
+        repeated[1:] = neighbours[1:] == neighbours[:-1]
+        previous = np.flatnonzero(repeated) - 1
+
+        if not np.array_equal(matched_neighbours[repeated], matched_neighbours[previous]):
+            return None
+
+        if not np.array_equal(neighbour_rotations[repeated], neighbour_rotations[previous]):
+            return None
+
+        neighbours, matched_neighbours, neighbour_rotations = neighbours[~repeated], matched_neighbours[~repeated], neighbour_rotations[~repeated]
+
+        if (owners[matched_neighbours] >= 0).any() or taken[matched_neighbours].any():
+            return None
+
+        if len(np.unique(matched_neighbours)) != len(matched_neighbours):
+            return None
+
+        local_map[neighbours], local_rotations[neighbours] = matched_neighbours, neighbour_rotations
+        owners[matched_neighbours] = neighbours
+        frontier = neighbours
+
+    faces = np.flatnonzero(local_map >= 0)
+    return faces, local_map[faces], local_rotations[faces]
+
+
+def _vertex_map(source, target, face_map, rotations):
+    """Derives the vertex permutation from the aligned face corners."""
+
+    counts = source.face_counts
+    corners = np.arange(len(source.face_vertices)) - np.repeat(source.face_offsets[:-1], counts)
+    repeated_counts = np.repeat(counts, counts)
+
+    target_corners = np.repeat(target.face_offsets[face_map], counts) + (corners + np.repeat(rotations, counts)) % repeated_counts
+    matched_vertices = target.face_vertices[target_corners]
+
+    vertex_map = np.full(source.vertex_count, -1, dtype=np.int64)
+    vertex_map[source.face_vertices] = matched_vertices
+
+    # -- Every corner of a vertex must agree, and the map must be a bijection.
+    if not np.array_equal(vertex_map[source.face_vertices], matched_vertices):
+        return None
+
+    used = vertex_map[vertex_map >= 0]
+
+    if len(np.unique(used)) != len(used):
+        return None
+
+    return vertex_map
+
+
+def _verify(source, target, face_map, rotations, vertex_map):
+    """Rebuilds the target topology from the permuted source and compares hashes."""
+
+    inverse = np.empty_like(face_map)
+    inverse[face_map] = np.arange(len(face_map))
+
+    counts = source.face_counts[inverse]
+    corners = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    # -- Target corner k of a face is source corner (k - rotation) % n.
+    source_corners = np.repeat(source.face_offsets[inverse], counts) + (corners - np.repeat(rotations[inverse], counts)) % np.repeat(counts, counts)
+    face_vertices = vertex_map[source.face_vertices[source_corners]]
+
+    return topology.fingerprint(counts, face_vertices) == target.fingerprint
+
+
+def _valences(mesh_topology):
+    return np.bincount(mesh_topology.face_vertices, minlength=mesh_topology.vertex_count)
+
+
+def _signatures(mesh_topology, valences):
+    """A rotation invariant signature of every face: its degree and the valences
+    of its vertices. Only used to narrow down the seed candidates."""
+
+    corner_valences = valences[mesh_topology.face_vertices]
+    offsets = mesh_topology.face_offsets[:-1]
+
+    first = np.add.reduceat(corner_valences, offsets)
+    second = np.add.reduceat(corner_valences**2, offsets)
+
+    return (second * 1024 + first) * 64 + mesh_topology.face_counts
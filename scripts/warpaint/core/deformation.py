@@ -0,0 +1,163 @@
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+from warpaint.core import instrumentation
+from warpaint.core.backend import get_backend
+
+
+PERCENTILE = 95
+HEATMAP_STEPS = 16
+HEATMAP_RAMP = np.array([[59, 76, 192], [221, 221, 221], [180, 4, 38]], dtype=np.float64)  # -- Cool to warm.
+
+
+@dataclass
+class DeformationStats:
+    name: str
+    face_count: int
+    mean: float
+    max: float
+    percentile: float
+    area_change: float  # -- Relative, e.g. 0.1 when the faces grew by 10%.
+    normal_deviation: float  # -- In degrees.
+    max_normal_deviation: float
+
+    def data(self):
+        return asdict(self)
+
+
+class Deformation:
+    """The differences between a base mesh and a morph of the same topology,
+    computed once over the whole mesh: the displacement of every vertex, and the
+    area and normal of every face before and after. The statistics of any group
+    of faces, e.g. a stroke, are then read from these arrays."""
+
+    def __init__(self, topology, base_points, morph_points):
+        base_points, morph_points = np.asarray(base_points), np.asarray(morph_points)
+
+        if base_points.shape != morph_points.shape:
+            raise ValueError(f"Vertex counts differ: {len(base_points)} and {len(morph_points)}.")
+
+        self.topology = topology
+        self.displacements = np.linalg.norm(morph_points - base_points, axis=1)
+
+        face_sums = np.add.reduceat(self.displacements[topology.face_vertices], topology.face_offsets[:-1])
+        self.face_displacements = face_sums / topology.face_counts
+
+        base_vectors, morph_vectors = topology.newell_vectors(base_points), topology.newell_vectors(morph_points)
+        self.base_areas = topology.face_areas(base_points, base_vectors)
+        self.morph_areas = topology.face_areas(morph_points, morph_vectors)
+
+        base_normals = topology.face_normals(base_points, base_vectors)
+        morph_normals = topology.face_normals(morph_points, morph_vectors)
+        dots = np.einsum("ij,ij->i", base_normals, morph_normals)
+        self.normal_deviations = np.degrees(np.arccos(np.clip(dots, -1, 1)))
+
+    def stats(self, name, faces=None):
+        """Computes the statistics of a group of faces.
+
+        Args:
+        - name (str): The name of the group, e.g. the stroke's.
+        - faces (np.ndarray, optional): The face indices, the whole mesh by default.
+
+        Returns:
+        - DeformationStats: The statistics, zeroed for an empty group."""
+
+        faces = np.arange(self.topology.face_count) if faces is None else np.asarray(faces, dtype=np.int64)
+
+        if not len(faces):
+            return DeformationStats(name, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+        if faces.min() < 0 or faces.max() >= self.topology.face_count:
+            raise ValueError(f"{name} has faces outside of the mesh ({self.topology.face_count} faces).")
+
+        displacements = self.displacements[self.topology.face_vertex_indices(faces)]
+        deviations = self.normal_deviations[faces]
+
+        base_area = self.base_areas[faces].sum()
+        area_change = (self.morph_areas[faces].sum() - base_area) / base_area if base_area > 0 else 0.0
+
+        return DeformationStats(
+            name,
+            len(faces),
+            float(displacements.mean()),
+            float(displacements.max()),
+            float(np.percentile(displacements, PERCENTILE)),
+            float(area_change),
+            float(deviations.mean()),
+            float(deviations.max()),
+        )
+
+    def heatmap(self, faces=None):
+        """Bins the face displacements into HEATMAP_STEPS colours, from cool to
+        warm. The ramp tops out at the PERCENTILE displacement, so that a few
+        outliers do not flatten it.
+
+        Args:
+        - faces (np.ndarray, optional): The face indices, the whole mesh by default.
+
+        Returns:
+        - dict[tuple[int, int, int], np.ndarray]: The face indices of every colour."""
+
+        faces = np.arange(self.topology.face_count) if faces is None else np.asarray(faces, dtype=np.int64)
+        values = self.face_displacements[faces]
+
+        if not len(values):
+            return {}
+
+        maximum = np.percentile(values, PERCENTILE)
+        steps = np.zeros(len(values), dtype=np.int64)
+
+        if maximum > 0:
+            steps = np.minimum((values / maximum * HEATMAP_STEPS).astype(np.int64), HEATMAP_STEPS - 1)
+
+        return {heatmap_colour(step / (HEATMAP_STEPS - 1)): faces[steps == step] for step in np.unique(steps)}
+
+
+def heatmap_colour(value):
+    """Interpolates the heatmap ramp.
+
+    Args:
+    - value (float): The position on the ramp, from 0 to 1.
+
+    Returns:
+    - tuple[int, int, int]: The colour, from 0 to 255."""
+
+    position = np.clip(value, 0, 1) * (len(HEATMAP_RAMP) - 1)
+    index = min(int(position), len(HEATMAP_RAMP) - 2)
+
+    colour = HEATMAP_RAMP[index] + (HEATMAP_RAMP[index + 1] - HEATMAP_RAMP[index]) * (position - index)
+    return tuple(int(round(channel)) for channel in colour)
+
+
+@instrumentation.traced("deformation.compare")
+def compare(base_mesh, morph_mesh, backend=None):
+    """Compares a morph against its base mesh, reading the points of both in
+    bulk, in object space.
+
+    Args:
+    - base_mesh (str): The name of the base mesh.
+    - morph_mesh (str): The name of the morph mesh, of the same topology.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - Deformation: The differences, see Deformation.stats and Deformation.heatmap."""
+
+    backend = backend or get_backend()
+    return Deformation(backend.get_topology(base_mesh), backend.get_points(base_mesh), backend.get_points(morph_mesh))
+
+
+@instrumentation.traced("deformation.show_heatmap")
+def show_heatmap(mesh, deformation, faces=None, backend=None):
+    """Displays the displacement heatmap on the mesh, one colour call per step.
+
+    Args:
+    - mesh (str): The name of the mesh to colour.
+    - deformation (Deformation): The differences, see compare.
+    - faces (np.ndarray, optional): The face indices, the whole mesh by default.
+    - backend (MeshBackend, optional): The backend, the active one by default."""
+
+    backend = backend or get_backend()
+
+    for rgb, indices in deformation.heatmap(faces).items():
+        backend.colour_faces(mesh, indices, rgb)
@@ -0,0 +1,191 @@
+from pathlib import Path
+import json
+
+import numpy as np
+
+from warpaint.core import correspondence, instrumentation, meshes, objects, topology
+from warpaint.core.backend import get_backend
+
+
+FILE_EXTENSION = ".paint"
+NORMAL_AGREEMENT = 0.5  # cos(60°)
+
+MATCHED, REMAPPED, MISMATCHED = "matched", "remapped", "mismatched"
+
+
+# • ───────────────────────────
+# • ──── IO. ────
+
+
+@instrumentation.traced("documents.read")
+def read_document(filepath):
+    """Reads a .paint document, resolved from its object store if it was written
+    as a manifest (see objects.write_manifest)."""
+
+    return open_document(filepath)[0]
+
+
+def open_document(filepath):
+    """Reads a .paint document along with the object store it was written to.
+
+    Returns:
+    - tuple[dict, objects.ObjectStore]: The document, and its object store, None
+    for plain documents."""
+
+    content = json.loads(Path(filepath).read_text())
+
+    if not objects.is_manifest(content):
+        return content, None
+
+    return objects.read_manifest(filepath, content), objects.manifest_store(filepath, content)
+
+
+@instrumentation.traced("documents.write")
+def write_document(filepath, document, store=None):
+    """Writes a .paint document, as a manifest of blocks in the object store if
+    one is given, thus storing strokes shared with other documents once.
+
+    Args:
+    - filepath (Path/str): The filepath.
+    - document (dict): The .paint document.
+    - store (objects.ObjectStore, optional): The object store."""
+
+    if store:
+        objects.write_manifest(filepath, document, store)
+        return
+
+    Path(filepath).write_text(json.dumps(document, indent=4, default=_to_list))
+
+
+def _to_list(value):
+    """Serializes the arrays of indices of documents read from manifests."""
+
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+@instrumentation.traced("documents.build")
+def build_document(mesh, strokes_data, backend=None):
+    """Builds a .paint document for the strokes painted on the mesh, together
+    with the point order hash and the topology used to match it on import.
+
+    Args:
+    - mesh (str): The name of the painted mesh.
+    - strokes_data (dict): The strokes data, as exported by the PainterUI.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - dict: The document."""
+
+    backend = backend or get_backend()
+    mesh_topology = backend.get_topology(mesh)
+
+    return {"point_order_hash": meshes.point_order_hash(mesh, backend), "topology": mesh_topology.data(), "strokes": strokes_data}
+
+
+# • ───────────────────────────
+# • ──── Matching. ────
+
+
+@instrumentation.traced("documents.match")
+def match_document(mesh, document, backend=None):
+    """Matches a document against the mesh it is applied to.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - document (dict): The .paint document.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - tuple[dict, str]: The document (remapped if needed) and either MATCHED,
+    REMAPPED (same topology, different point order) or MISMATCHED."""
+
+    if meshes.point_order_hash(mesh, backend) == document.get("point_order_hash", None):
+        return document, MATCHED
+
+    remapped_document = remap_point_order(mesh, document, backend)
+
+    if remapped_document:
+        return remapped_document, REMAPPED
+
+    return document, MISMATCHED
+
+
+def remap_point_order(mesh, document, backend=None):
+    """Remaps the strokes onto a mesh with the same topology as the one stored in
+    the document, but with a different face and vertex order.
+
+    Args:
+    - mesh (str): The name of the mesh to apply the document to.
+    - document (dict): The .paint document, with the stored "topology".
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - dict/None: The document with remapped indices, None if the topologies differ."""
+
+    if "topology" not in document:
+        return None
+
+    stored_topology = topology.from_data(document["topology"])
+    solution = correspondence.solve(stored_topology, (backend or get_backend()).get_topology(mesh))
+
+    if not solution:
+        return None
+
+    strokes_data = document["strokes"]
+    remapped = solution.remap_faces([values["indices"] for values in strokes_data.values()])
+    strokes_data = {name: dict(values, indices=indices.tolist()) for (name, values), indices in zip(strokes_data.items(), remapped)}
+
+    return dict(document, strokes=strokes_data)
+
+
+# • ───────────────────────────
+# • ──── Transfer. ────
+
+
+@instrumentation.traced("documents.transfer")
+def transfer_document(source_mesh, target_mesh, strokes_data, min_dot=NORMAL_AGREEMENT, backend=None):
+    """Projects the strokes painted on the source mesh onto the target mesh,
+    regardless of their topologies (see meshes.transfer_map).
+
+    Args:
+    - source_mesh (str): The name of the painted mesh.
+    - target_mesh (str): The name of the mesh to transfer onto.
+    - strokes_data (dict): The strokes data of the source mesh.
+    - min_dot (float, optional): The minimum dot product between matched face normals.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - dict: The strokes data of the target mesh."""
+
+    backend = backend or get_backend()
+
+    face_map = meshes.transfer_map(source_mesh, target_mesh, min_dot=min_dot, backend=backend)
+    source_face_count = backend.get_topology(source_mesh).face_count
+
+    return transfer_strokes(strokes_data, face_map, source_face_count)
+
+
+def transfer_strokes(strokes_data, face_map, source_face_count):
+    """Remaps the indices of the strokes through a face map.
+
+    Args:
+    - strokes_data (dict): The strokes data, as exported by the PainterUI.
+    - face_map (np.ndarray): The source face index of every target face, -1 for none.
+    - source_face_count (int): The number of faces of the source mesh.
+
+    Returns:
+    - dict: The strokes data with the indices of the target faces."""
+
+    names = list(strokes_data)
+    source_labels = np.full(source_face_count + 1, -1, dtype=np.int64)  # -- Last slot catches -1.
+
+    for label, name in enumerate(names):
+        source_labels[np.asarray(strokes_data[name]["indices"], dtype=np.int64)] = label
+
+    target_labels = source_labels[face_map]
+    target_indices = topology.split_labels(target_labels, len(names))
+
+    return {name: dict(strokes_data[name], indices=indices.tolist()) for name, indices in zip(names, target_indices)}
@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from warpaint.core import instrumentation
+from warpaint.core.backend import get_backend
+
+
+FEATHER_RINGS = 4  # -- The default width of the falloff, in average edge lengths.
+FILE_EXTENSION = ".weights.npz"
+
+
+@dataclass
+class WeightMaps:
+    """The feathered weights of every stroke, stored sparsely in CSR form: the
+    weights of stroke i are weights[offsets[i]:offsets[i + 1]], on the vertices
+    at the same positions. Vertices without weight are left out."""
+
+    names: list
+    vertex_count: int
+    offsets: np.ndarray
+    vertices: np.ndarray
+    weights: np.ndarray
+
+    def get(self, name):
+        """Retrieves the weight map of a stroke.
+
+        Args:
+        - name (str): The name of the stroke.
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray]: The vertex indices and their weights."""
+
+        index = self.names.index(name)
+        start, end = self.offsets[index], self.offsets[index + 1]
+
+        return self.vertices[start:end], self.weights[start:end]
+
+    def dense(self, name):
+        """Retrieves the weight of every vertex of the mesh for a stroke."""
+
+        values = np.zeros(self.vertex_count)
+        vertices, weights = self.get(name)
+        values[vertices] = weights
+
+        return values
+
+    def save(self, filepath):
+        np.savez_compressed(
+            filepath,
+            names=np.array(self.names),
+            vertex_count=self.vertex_count,
+            offsets=self.offsets,
+            vertices=self.vertices.astype(np.int32),
+            weights=self.weights.astype(np.float32),
+        )
+
+    @classmethod
+    def load(cls, filepath):
+        with np.load(filepath) as content:
+            names, vertex_count = content["names"].tolist(), int(content["vertex_count"])
+            return cls(names, vertex_count, content["offsets"], content["vertices"].astype(np.int64), content["weights"].astype(np.float64))
+
+
+@instrumentation.traced("feathering.feather_strokes")
+def feather_strokes(mesh, strokes_data, width=None, rings=FEATHER_RINGS, backend=None):
+    """Converts every stroke into a per-vertex weight map: 1 on the stroke,
+    falling off smoothly to 0 at the given geodesic distance from its boundary.
+    The distances of all the strokes are solved at once (see geodesic_distances).
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - strokes_data (dict): The strokes data, as exported by the PainterUI.
+    - width (float, optional): The width of the falloff, in world units.
+    - rings (float): The width of the falloff in average edge lengths, when no
+    width is given.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - WeightMaps: The weight maps, in the order of the strokes."""
+
+    backend = backend or get_backend()
+    mesh_topology, points = backend.get_topology(mesh), backend.get_points(mesh)
+
+    names = list(strokes_data)
+    sources = [mesh_topology.face_vertex_indices(np.asarray(strokes_data[name]["indices"], dtype=np.int64)) for name in names]
+    width = width or rings * average_edge_length(mesh_topology, points)
+
+    labels, vertices, distances = geodesic_distances(mesh_topology, points, sources, width)
+    weights = falloff(distances / width)
+
+    kept = weights > 0
+    labels, vertices, weights = labels[kept], vertices[kept], weights[kept]
+
+    offsets = np.zeros(len(names) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(labels, minlength=len(names)), out=offsets[1:])
+
+    return WeightMaps(names, mesh_topology.vertex_count, offsets, vertices, weights)
+
+
+def geodesic_distances(mesh_topology, points, sources, max_distance):
+    """Computes the distances along the edges of the mesh from several groups of
+    source vertices, up to a maximum distance, for all the groups at once. The
+    solver is a label-correcting Dijkstra run in bulk: every (group, vertex)
+    pair reached is a sorted key, and each pass relaxes all the edges around
+    the pairs improved by the previous pass, until none improves.
+
+    Args:
+    - mesh_topology (topology.Topology): The topology of the mesh.
+    - points (np.ndarray): The (V, 3) vertex positions.
+    - sources (list[np.ndarray]): The source vertex indices of every group.
+    - max_distance (float): Vertices farther than this are left out.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray, np.ndarray]: The group, vertex and distance
+    of every pair reached, sorted by group then vertex."""
+
+    vertex_count = mesh_topology.vertex_count
+    points = np.asarray(points, dtype=np.float64)
+
+    keys = [label * vertex_count + np.asarray(vertices, dtype=np.int64) for label, vertices in enumerate(sources)]
+    keys = np.unique(np.concatenate(keys)) if keys else np.empty(0, dtype=np.int64)
+    distances = np.zeros(len(keys))
+
+    frontier_keys, frontier_distances = keys, distances
+
+    while len(frontier_keys):
+        frontier_labels, frontier_vertices = np.divmod(frontier_keys, vertex_count)
+        owners, neighbours = mesh_topology.vertex_neighbours(frontier_vertices)
+
+        lengths = np.linalg.norm(points[neighbours] - points[frontier_vertices[owners]], axis=1)
+        candidates = frontier_distances[owners] + lengths
+        reached = candidates <= max_distance
+
+        candidate_keys, candidates = frontier_labels[owners[reached]] * vertex_count + neighbours[reached], candidates[reached]
+
+        if not len(candidate_keys):
+            break
+
+        # -- The best candidate per key.
+        order = np.lexsort((candidates, candidate_keys))
+        candidate_keys, candidates = candidate_keys[order], candidates[order]
+        first = np.concatenate([[True], candidate_keys[1:] != candidate_keys[:-1]])
+        candidate_keys, candidates = candidate_keys[first], candidates[first]
+
+        positions = np.minimum(np.searchsorted(keys, candidate_keys), len(keys) - 1)
+        exists = keys[positions] == candidate_keys
+        improved = ~exists | (candidates < distances[positions] - 1e-12)
+
+        updated = exists & improved
+        distances[positions[updated]] = candidates[updated]
+
+        added = ~exists
+        keys, distances = np.concatenate([keys, candidate_keys[added]]), np.concatenate([distances, candidates[added]])
+        order = np.argsort(keys, kind="stable")
+        keys, distances = keys[order], distances[order]
+
+        frontier_keys, frontier_distances = candidate_keys[improved], candidates[improved]
+
+    labels, vertices = np.divmod(keys, vertex_count)
+    return labels, vertices, distances
+
+
+def falloff(values):
+    """The smooth falloff: 1 at 0, easing to 0 at 1 and beyond (smoothstep)."""
+
+    values = np.clip(values, 0, 1)
+    return 1 - values * values * (3 - 2 * values)
+
+
+def average_edge_length(mesh_topology, points):
+    offsets, indices = mesh_topology.vertex_adjacency
+    rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+    return float(np.linalg.norm(points[indices] - points[rows], axis=1).mean()) if len(indices) else 1.0
+
+
+def write_weight_maps(filepath, weight_maps):
+    """Writes the weight maps as a compressed array file.
+
+    Args:
+    - filepath (Path/str): The path without extension, e.g. "exports/body".
+    - weight_maps (WeightMaps): The weight maps.
+
+    Returns:
+    - Path: The filepath."""
+
+    filepath = Path(filepath)
+    filepath = filepath.with_name(f"{filepath.name}{FILE_EXTENSION}")
+
+    weight_maps.save(filepath)
+    return filepath
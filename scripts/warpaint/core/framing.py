@@ -0,0 +1,123 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from warpaint.core import instrumentation
+from warpaint.core.backend import get_backend
+
+
+UP_AXES = np.array([[0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])  # -- The camera's up, and the fallback when looking along it.
+
+
+@dataclass
+class Framing:
+    """Where a face, or a group of faces such as a stroke, sits on the mesh, in
+    world space."""
+
+    name: str
+    centroid: np.ndarray
+    normal: np.ndarray
+    radius: float
+    area: float
+    face: int  # -- The face closest to the centroid, to attach to.
+
+
+@instrumentation.traced("framing.frame_faces")
+def frame_faces(mesh, indices, backend=None):
+    """Frames every given face on its own, in one pass.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - indices (Sequence[int]): The face indices.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - list[Framing]: The framing of every face, named f<index>."""
+
+    indices = np.asarray(indices, dtype=np.int64)
+    return frame_groups(mesh, {f"f{index}": [index] for index in indices}, backend)
+
+
+@instrumentation.traced("framing.frame_groups")
+def frame_groups(mesh, groups, backend=None):
+    """Frames groups of faces, e.g. strokes, in one vectorized pass over the
+    mesh: the centroid is area weighted, the normal is the sum of the faces'
+    (area weighted) normals and the radius bounds the vertices of the group.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - groups (dict[str, Sequence[int]]): The face indices of every group.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - list[Framing]: The framing of every non empty group, in order."""
+
+    backend = backend or get_backend()
+    topology, points = backend.get_topology(mesh), backend.get_points(mesh, world=True)
+
+    names = [name for name, faces in groups.items() if len(faces)]
+
+    if not names:
+        return []
+
+    faces = np.concatenate([np.asarray(groups[name], dtype=np.int64) for name in names])
+    labels = np.repeat(np.arange(len(names)), [len(groups[name]) for name in names])
+
+    newell_vectors = topology.newell_vectors(points)[faces]
+    face_centroids = topology.face_centroids(points)[faces]
+    areas = np.maximum(np.linalg.norm(newell_vectors, axis=1) / 2, 1e-12)
+
+    group_areas = np.bincount(labels, areas, len(names))
+    centroids = _group_sums(labels, face_centroids * areas[:, None], len(names)) / group_areas[:, None]
+
+    normals = _group_sums(labels, newell_vectors, len(names))
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals = np.where(lengths > 0, normals / np.where(lengths > 0, lengths, 1), UP_AXES[0])
+
+    # -- Bound the vertices of every group.
+    corner_labels = np.repeat(labels, topology.face_counts[faces])
+    corner_points = points[topology.face_vertices[topology.face_corners(faces)]]
+
+    radii = np.zeros(len(names))
+    np.maximum.at(radii, corner_labels, np.linalg.norm(corner_points - centroids[corner_labels], axis=1))
+
+    # -- The face closest to the centroid of every group, the first one per label once sorted.
+    order = np.lexsort((np.linalg.norm(face_centroids - centroids[labels], axis=1), labels))
+    anchors = faces[order][np.concatenate([[True], labels[order][1:] != labels[order][:-1]])]
+
+    return [Framing(name, centroids[index], normals[index], float(radii[index]), float(group_areas[index]), int(anchors[index])) for index, name in enumerate(names)]
+
+
+def look_at_matrices(targets, normals, distances):
+    """Computes the world matrices of cameras looking at targets along their
+    normals, from the given distances. Maya cameras look down their -Z axis, so
+    Z is the normal; Y stays as close to the world's up as possible.
+
+    Args:
+    - targets (np.ndarray): The (N, 3) points to look at.
+    - normals (np.ndarray): The (N, 3) unit directions to look from.
+    - distances (np.ndarray/float): The distance of the cameras to the targets.
+
+    Returns:
+    - np.ndarray: The (N, 4, 4) row-major matrices, as cmds.xform(matrix=) expects."""
+
+    z_axes = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+    is_vertical = np.abs(z_axes @ UP_AXES[0]) > 0.999
+    up_axes = np.where(is_vertical[:, None], UP_AXES[1], UP_AXES[0])
+
+    x_axes = np.cross(up_axes, z_axes)
+    x_axes /= np.linalg.norm(x_axes, axis=1, keepdims=True)
+    y_axes = np.cross(z_axes, x_axes)
+
+    matrices = np.zeros((len(z_axes), 4, 4))
+    matrices[:, 0, :3], matrices[:, 1, :3], matrices[:, 2, :3] = x_axes, y_axes, z_axes
+    matrices[:, 3, :3] = np.asarray(targets).reshape(-1, 3) + z_axes * np.reshape(distances, (-1, 1))
+    matrices[:, 3, 3] = 1
+
+    return matrices
+
+
+def _group_sums(labels, values, count):
+    """Sums the (N, 3) values per label."""
+
+    return np.stack([np.bincount(labels, values[:, axis], count) for axis in range(3)], axis=1)
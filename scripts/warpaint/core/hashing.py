@@ -7,3 +7,9 @@ def hash_str(content):
     hasher = hashlib.md5()
     hasher.update(content.encode("utf-8"))
     return hasher.hexdigest()
+
+
+def hash_bytes(content):
+    """Computes the MD5 hash of bytes."""
+
+    return hashlib.md5(content).hexdigest()
@@ -0,0 +1,124 @@
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+
+from warpaint.core import instrumentation, meshes
+from warpaint.core.backend import get_backend
+from warpaint.core.store import counterpart_name
+
+
+MIRROR_AXIS = "x"
+
+
+@dataclass
+class StrokeReport:
+    name: str
+    region: str
+    face_count: int
+    islands: int
+    area: float = None  # -- None without the mesh's points.
+    mirror_mismatch: int = None  # -- Faces differing from the mirrored counterpart, on L_/R_ pairs.
+
+
+@dataclass
+class Report:
+    """The QA report of the strokes painted on a mesh."""
+
+    face_count: int
+    painted_faces: int
+    overlapping_faces: int  # -- Faces painted by more than one stroke.
+    coverage: float  # -- The painted fraction of the faces.
+    unpainted_islands: int
+    area_coverage: float = None  # -- The painted fraction of the area, None without points.
+    strokes: list = field(default_factory=list)
+    empty: list = field(default_factory=list)
+    missing: list = field(default_factory=list)  # -- Template names without a stroke.
+    extra: list = field(default_factory=list)  # -- Strokes not in the template.
+    unpaired: list = field(default_factory=list)  # -- L_/R_ strokes without counterpart.
+    asymmetric: list = field(default_factory=list)
+
+    @property
+    def issues(self):
+        return len(self.empty) + len(self.missing) + len(self.extra) + len(self.unpaired) + len(self.asymmetric)
+
+    def data(self):
+        return dict(asdict(self), issues=self.issues)
+
+
+@instrumentation.traced("inspection.inspect_strokes")
+def inspect_strokes(mesh, strokes_data, template=None, axis=MIRROR_AXIS, geometry=True, backend=None):
+    """Checks the strokes painted on a mesh: coverage, overlaps, per-stroke face
+    counts, areas and islands, names against a template and L_/R_ symmetry. The
+    faces of all the strokes are labelled once and counted with bincount, the
+    islands are labelled in one pass (see Topology.islands).
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - strokes_data (dict): The strokes, as exported (see Stroke.data).
+    - template (Sequence[str], optional): The required stroke names.
+    - axis (str): The mirror axis of the L_/R_ pairs.
+    - geometry (bool): Whether the mesh's points are known; areas and symmetry
+    are skipped without them.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - Report: The report."""
+
+    backend = backend or get_backend()
+    mesh_topology = backend.get_topology(mesh)
+    face_count = mesh_topology.face_count
+
+    names = list(strokes_data)
+    groups = [np.unique(np.asarray(strokes_data[name]["indices"], dtype=np.int64)) for name in names]
+    faces = np.concatenate(groups) if groups else np.empty(0, dtype=np.int64)
+
+    paint_counts = np.bincount(faces, minlength=face_count)
+    painted = paint_counts > 0
+
+    labels = mesh_topology.to_labels(groups)
+    islands = mesh_topology.islands(labels)
+    unpainted_islands = mesh_topology.islands(np.where(painted, -1, 0)).get(0, [])
+
+    report = Report(face_count, int(painted.sum()), int((paint_counts > 1).sum()), float(painted.mean()) if face_count else 0.0, len(unpainted_islands))
+    face_counts = [len(group) for group in groups]
+    areas = [None] * len(names)
+
+    if geometry:
+        face_areas = mesh_topology.face_areas(backend.get_points(mesh, world=True))
+        stroke_labels = np.repeat(np.arange(len(names)), face_counts)
+
+        areas = np.bincount(stroke_labels, face_areas[faces], len(names)).tolist()
+        report.area_coverage = float(face_areas[painted].sum() / face_areas.sum()) if face_areas.sum() else 0.0
+
+    for label, name in enumerate(names):
+        region = strokes_data[name].get("region", "")
+        report.strokes.append(StrokeReport(name, region, face_counts[label], len(islands.get(label, [])), areas[label]))
+
+    report.empty = [name for name, count in zip(names, face_counts) if not count]
+
+    if template is not None:
+        report.missing = [name for name in template if name not in strokes_data]
+        report.extra = [name for name in names if name not in set(template)]
+
+    report.unpaired = [name for name in names if counterpart_name(name) and counterpart_name(name) not in strokes_data]
+
+    if geometry:
+        _check_symmetry(report, meshes.mirror_map(mesh, axis, backend), dict(zip(names, groups)))
+
+    return report
+
+
+def _check_symmetry(report, mirror_map, groups):
+    """Compares every L_/R_ pair with its mirror image, both ways."""
+
+    for stroke_report in report.strokes:
+        counterpart = groups.get(counterpart_name(stroke_report.name) or "")
+
+        if counterpart is None:
+            continue
+
+        mirrored = mirror_map[groups[stroke_report.name]]
+        stroke_report.mirror_mismatch = len(np.setxor1d(mirrored[mirrored >= 0], counterpart))
+
+        if stroke_report.mirror_mismatch:
+            report.asymmetric.append(stroke_report.name)
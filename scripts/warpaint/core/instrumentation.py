@@ -0,0 +1,278 @@
+from collections import deque
+from functools import wraps
+from pathlib import Path
+import inspect, json, os, sys, threading, time
+
+
+MAX_OPERATIONS = 50
+MAX_EVENTS = 100_000
+MAYA_MODULES = ("cmds", "om2", "oma2", "omui2")
+
+OPERATIONS = deque(maxlen=MAX_OPERATIONS)
+EVENTS = deque(maxlen=MAX_EVENTS)
+
+_ENABLED = False
+_REGISTERED = {}  # -- Module name: the names of its functions excluded from tracing, None for all.
+_ORIGINALS = {}  # -- (module name, attribute): original value, while enabled.
+_LOCAL = threading.local()
+
+
+class Span:
+    """A timed operation. Maya calls and components (faces, vertices, etc. handed
+    to Maya) accumulate on the innermost open span and roll up into its parent
+    when it closes, so every operation reports its totals."""
+
+    __slots__ = ("name", "category", "start", "duration", "depth", "maya_calls", "components", "thread")
+
+    def __init__(self, name, category, depth):
+        self.name, self.category, self.depth = name, category, depth
+        self.maya_calls, self.components, self.duration = 0, 0, 0
+        self.thread = threading.get_ident()
+        self.start = time.perf_counter_ns()
+
+    def data(self):
+        return {"name": self.name, "ms": self.duration / 1e6, "maya_calls": self.maya_calls, "components": self.components}
+
+
+# • ───────────────────────────
+# • ──── State. ────
+
+
+def is_enabled():
+    return _ENABLED
+
+
+def enable(enabled=True):
+    """Enables or disables the instrumentation. The functions and Maya modules of
+    the registered modules are swapped for recording wrappers while enabled, and
+    restored when disabled, thus disabled instrumentation costs nothing.
+
+    Args:
+    - enabled (bool): Whether to record."""
+
+    global _ENABLED
+
+    if enabled == _ENABLED:
+        return
+
+    _ENABLED = enabled
+
+    if enabled:
+        for module_name in _REGISTERED:
+            _instrument(module_name)
+    else:
+        for (module_name, attribute), value in _ORIGINALS.items():
+            setattr(sys.modules[module_name], attribute, value)
+
+        _ORIGINALS.clear()
+
+
+def register(module_name, functions=True, exclude=()):
+    """Registers a module for instrumentation: its calls to the Maya modules are
+    counted and, optionally, its public functions are traced as spans.
+
+    Args:
+    - module_name (str): The name of the module, usually __name__.
+    - functions (bool): Whether to trace the functions defined in the module.
+    - exclude (Iterable[str]): Functions too small to trace, called per component."""
+
+    _REGISTERED[module_name] = set(exclude) if functions else None
+
+    if _ENABLED:
+        _instrument(module_name)
+
+
+def clear():
+    OPERATIONS.clear()
+    EVENTS.clear()
+
+
+def _instrument(module_name):
+    module = sys.modules[module_name]
+    wrapped = {name: CountingModule(getattr(module, name)) for name in MAYA_MODULES if hasattr(module, name)}
+
+    exclude = _REGISTERED[module_name]
+
+    if exclude is not None:
+        for name, function in inspect.getmembers(module, inspect.isfunction):
+            if function.__module__ == module_name and not name.startswith("_") and name not in exclude:
+                wrapped[name] = _trace(function, f"{module_name.rsplit('.', 1)[-1]}.{name}", "api")
+
+    for name, value in wrapped.items():
+        _ORIGINALS.setdefault((module_name, name), getattr(module, name))
+        setattr(module, name, value)
+
+
+# • ───────────────────────────
+# • ──── Spans. ────
+
+
+def _stack():
+    if not hasattr(_LOCAL, "stack"):
+        _LOCAL.stack = []
+
+    return _LOCAL.stack
+
+
+def open_span(name, category="warpaint"):
+    stack = _stack()
+    span = Span(name, category, len(stack))
+    stack.append(span)
+
+    return span
+
+
+def close_span(span):
+    span.duration = time.perf_counter_ns() - span.start
+    stack = _stack()
+    stack.pop()
+
+    if stack:
+        stack[-1].maya_calls += span.maya_calls
+        stack[-1].components += span.components
+    else:
+        OPERATIONS.append(span)
+
+    EVENTS.append(span)
+
+
+def count_call(components=0):
+    stack = _stack()
+
+    if stack:
+        stack[-1].maya_calls += 1
+        stack[-1].components += components
+
+
+def traced(name=None, category="warpaint"):
+    """Traces every call of the decorated function as a span, while enabled.
+
+    Args:
+    - name (str, optional): The name of the span, the function's by default.
+    - category (str): The category of the span, shown in chrome://tracing."""
+
+    def decorator(function):
+        traced_function = _trace(function, name or function.__name__, category)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return function(*args, **kwargs)
+
+            return traced_function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _trace(function, name, category):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        span = open_span(name, category)
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            close_span(span)
+
+    return wrapper
+
+
+def _components(args, kwargs):
+    """The size of the first collection passed, e.g. the polygons to colour."""
+
+    for value in list(args) + list(kwargs.values()):
+        if hasattr(value, "__len__") and not isinstance(value, (str, dict)):
+            return len(value)
+
+    return 0
+
+
+def counting(instance):
+    """Counts the method calls of a Maya function set on the current span, e.g.
+    the getPoints of an MFnMesh, while enabled.
+
+    Args:
+    - instance (object): The function set, or any OpenMaya instance.
+
+    Returns:
+    - object: The instance, wrapped while enabled."""
+
+    return CountingInstance(instance) if _ENABLED else instance
+
+
+class CountingModule:
+    """Wraps a Maya module (cmds, OpenMaya) and counts the calls of its functions
+    on the current span. Classes are handed out as they are, so that isinstance
+    and subclassing keep working: the methods of their instances are counted
+    through counting instead."""
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        value = getattr(self._module, name)
+
+        if not callable(value) or isinstance(value, type):
+            return value
+
+        return CountingCallable(value)
+
+
+class CountingCallable:
+    __slots__ = ("_target",)
+
+    def __init__(self, target):
+        self._target = target
+
+    def __call__(self, *args, **kwargs):
+        count_call(_components(args, kwargs))
+        return self._target(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+
+class CountingInstance:
+    """Counts the method calls of an instance, which it still passes for in
+    isinstance checks."""
+
+    __slots__ = ("_target",)
+
+    def __init__(self, target):
+        self._target = target
+
+    @property
+    def __class__(self):
+        return type(self._target)
+
+    def __getattr__(self, name):
+        value = getattr(self._target, name)
+        return CountingCallable(value) if callable(value) else value
+
+
+# • ───────────────────────────
+# • ──── Export. ────
+
+
+def trace_data():
+    """Converts the recorded spans into the Trace Event Format, which loads in
+    chrome://tracing and Perfetto.
+
+    Returns:
+    - dict: The trace."""
+
+    pid = os.getpid()
+    events = []
+
+    for span in EVENTS:
+        args = {"maya_calls": span.maya_calls, "components": span.components}
+        events.append({"name": span.name, "cat": span.category, "ph": "X", "ts": span.start / 1e3, "dur": span.duration / 1e3, "pid": pid, "tid": span.thread, "args": args})
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_trace(filepath):
+    Path(filepath).write_text(json.dumps(trace_data()))
+    return filepath
@@ -0,0 +1,239 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+import json, struct
+
+import numpy as np
+
+from warpaint.core import framing, instrumentation
+from warpaint.core.backend import get_backend
+
+
+JSON_EXTENSION, BINARY_EXTENSION = ".landmarks.json", ".landmarks"
+MAGIC, VERSION = b"WPLM", 1
+
+RECORD_DTYPE = np.dtype(
+    [
+        ("centroid", "<f4", 3),
+        ("normal", "<f4", 3),
+        ("box_centre", "<f4", 3),
+        ("box_axes", "<f4", (3, 3)),
+        ("box_extents", "<f4", 3),
+        ("area", "<f4"),
+        ("face_count", "<u4"),
+        ("boundary_offset", "<u4"),
+        ("boundary_count", "<u4"),
+    ]
+)
+
+
+@dataclass
+class Landmark:
+    """The geometry of a stroke, in world space, for rig placement."""
+
+    name: str
+    region: str
+    face_count: int
+    area: float
+    centroid: np.ndarray
+    normal: np.ndarray  # -- Area weighted.
+    box_centre: np.ndarray
+    box_axes: np.ndarray  # -- (3, 3) oriented bounding box axes, one per row, longest first.
+    box_extents: np.ndarray  # -- Half sizes along the axes.
+    boundary: list = field(default_factory=list)  # -- Vertex loops, longest first.
+
+    def data(self):
+        return {
+            "name": self.name,
+            "region": self.region,
+            "face_count": self.face_count,
+            "area": self.area,
+            "centroid": self.centroid.tolist(),
+            "normal": self.normal.tolist(),
+            "box_centre": self.box_centre.tolist(),
+            "box_axes": self.box_axes.tolist(),
+            "box_extents": self.box_extents.tolist(),
+            "boundary": [loop.tolist() for loop in self.boundary],
+        }
+
+
+# • ───────────────────────────
+# • ──── Extraction. ────
+
+
+@instrumentation.traced("landmarks.extract")
+def extract_landmarks(mesh, strokes_data, backend=None):
+    """Computes the landmark of every painted stroke, all strokes at once from
+    the mesh's arrays; only the boundary loops are chained stroke by stroke.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - strokes_data (dict): The strokes, as exported (see Stroke.data).
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - list[Landmark]: The landmarks, in the order of the strokes, empty ones skipped."""
+
+    backend = backend or get_backend()
+    topology, points = backend.get_topology(mesh), backend.get_points(mesh, world=True)
+
+    groups = {name: np.asarray(values["indices"], dtype=np.int64) for name, values in strokes_data.items()}
+    framings = framing.frame_groups(mesh, groups, backend)
+    boxes = oriented_boxes(topology, points, [groups[item.name] for item in framings])
+
+    landmarks = []
+
+    for item, (centre, axes, extents) in zip(framings, boxes):
+        faces, region = groups[item.name], strokes_data[item.name].get("region", "")
+        boundary = topology.boundary_loops(faces)
+
+        landmarks.append(Landmark(item.name, region, len(faces), item.area, item.centroid, item.normal, centre, axes, extents, boundary))
+
+    return landmarks
+
+
+def oriented_boxes(topology, points, groups):
+    """Fits an oriented bounding box around the vertices of every group of faces,
+    along the principal axes of the vertices. The covariances of all the groups
+    are accumulated in one pass and decomposed as a batch.
+
+    Args:
+    - topology (topology.Topology): The topology of the mesh.
+    - points (np.ndarray): The (V, 3) vertex positions.
+    - groups (list[np.ndarray]): The face indices of every group, none empty.
+
+    Returns:
+    - list[tuple[np.ndarray, np.ndarray, np.ndarray]]: The centre, (3, 3) axes and
+    half extents of every box."""
+
+    count = len(groups)
+
+    if not count:
+        return []
+
+    faces = np.concatenate(groups)
+    face_labels = np.repeat(np.arange(count), [len(group) for group in groups])
+
+    # -- The unique vertices of every group.
+    corner_labels = np.repeat(face_labels, topology.face_counts[faces])
+    keys = np.sort(corner_labels * len(points) + topology.face_vertices[topology.face_corners(faces)])
+    keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+    labels, vertices = keys // len(points), keys % len(points)
+
+    counts = np.bincount(labels, minlength=count)[:, None]
+    means = np.stack([np.bincount(labels, points[vertices, axis], count) for axis in range(3)], axis=1) / counts
+    centred = points[vertices] - means[labels]
+
+    covariances = np.zeros((count, 3, 3))
+
+    for row in range(3):
+        for column in range(row, 3):
+            covariances[:, row, column] = covariances[:, column, row] = np.bincount(labels, centred[:, row] * centred[:, column], count)
+
+    # -- eigh sorts the eigenvalues ascending, the longest axis comes last.
+    _, eigenvectors = np.linalg.eigh(covariances / counts[:, :, None])
+    axes = eigenvectors[:, :, ::-1].transpose(0, 2, 1)
+    axes[:, 2] = np.cross(axes[:, 0], axes[:, 1])
+
+    projected = np.einsum("ij,ikj->ik", centred, axes[labels])
+    low, high = np.full((count, 3), np.inf), np.full((count, 3), -np.inf)
+    np.minimum.at(low, labels, projected)
+    np.maximum.at(high, labels, projected)
+
+    centres = means + np.einsum("ij,ijk->ik", (low + high) / 2, axes)
+    return list(zip(centres, axes, (high - low) / 2))
+
+
+# • ───────────────────────────
+# • ──── IO. ────
+
+
+def write_landmarks(filepath, mesh, landmarks):
+    """Writes the landmarks both as JSON and as packed binary, side by side.
+
+    Args:
+    - filepath (Path/str): The path without extension, e.g. "exports/body".
+    - mesh (str): The name of the mesh.
+    - landmarks (list[Landmark]): The landmarks.
+
+    Returns:
+    - tuple[Path, Path]: The JSON and binary filepaths."""
+
+    filepath = Path(filepath)
+    json_path, binary_path = filepath.with_name(f"{filepath.name}{JSON_EXTENSION}"), filepath.with_name(f"{filepath.name}{BINARY_EXTENSION}")
+
+    json_path.write_text(json.dumps({"version": VERSION, "mesh": mesh, "landmarks": [landmark.data() for landmark in landmarks]}, indent=4))
+    write_binary(binary_path, mesh, landmarks)
+
+    return json_path, binary_path
+
+
+def write_binary(filepath, mesh, landmarks):
+    """Packs the landmarks for the rig build, little endian:
+    - MAGIC, then the version and the size of the header as uint32.
+    - The header, UTF-8 JSON: the mesh, and the names, regions and boundary loop
+    sizes of the landmarks.
+    - One RECORD_DTYPE record per landmark.
+    - The boundary vertex indices as uint32: the loops of every landmark back to
+    back, from boundary_offset for boundary_count indices.
+
+    Args:
+    - filepath (Path/str): The filepath.
+    - mesh (str): The name of the mesh.
+    - landmarks (list[Landmark]): The landmarks."""
+
+    records = np.zeros(len(landmarks), dtype=RECORD_DTYPE)
+    boundaries, offset = [], 0
+
+    for record, landmark in zip(records, landmarks):
+        record["centroid"], record["normal"], record["area"] = landmark.centroid, landmark.normal, landmark.area
+        record["box_centre"], record["box_axes"], record["box_extents"] = landmark.box_centre, landmark.box_axes, landmark.box_extents
+
+        boundary_count = sum(len(loop) for loop in landmark.boundary)
+        record["face_count"], record["boundary_offset"], record["boundary_count"] = landmark.face_count, offset, boundary_count
+
+        boundaries.extend(landmark.boundary)
+        offset += boundary_count
+
+    header = {
+        "mesh": mesh,
+        "names": [landmark.name for landmark in landmarks],
+        "regions": [landmark.region for landmark in landmarks],
+        "loop_sizes": [[len(loop) for loop in landmark.boundary] for landmark in landmarks],
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    boundary = np.concatenate(boundaries).astype("<u4") if boundaries else np.zeros(0, dtype="<u4")
+
+    with open(filepath, "wb") as file:
+        file.write(MAGIC + struct.pack("<II", VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        file.write(records.tobytes())
+        file.write(boundary.tobytes())
+
+
+def read_binary(filepath):
+    """Reads landmarks packed by write_binary.
+
+    Args:
+    - filepath (Path/str): The filepath.
+
+    Returns:
+    - tuple[dict, np.ndarray, np.ndarray]: The header, the RECORD_DTYPE records
+    and the boundary vertex indices."""
+
+    content = Path(filepath).read_bytes()
+
+    if content[:4] != MAGIC:
+        raise ValueError(f"{filepath} is not a landmarks file.")
+
+    version, header_size = struct.unpack_from("<II", content, 4)
+
+    if version > VERSION:
+        raise ValueError(f"Unsupported landmarks version: {version}.")
+
+    start = 12 + header_size
+    header = json.loads(content[12:start].decode("utf-8"))
+
+    records = np.frombuffer(content, dtype=RECORD_DTYPE, count=len(header["names"]), offset=start)
+    boundary = np.frombuffer(content, dtype="<u4", offset=start + records.nbytes)
+
+    return header, records, boundary
@@ -0,0 +1,279 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import json, multiprocessing, os, struct, sys, zlib
+
+import numpy as np
+
+from warpaint.core import instrumentation
+from warpaint.core.backend import get_backend
+
+
+MASK_RESOLUTION = 2048
+CHUNK_ROWS = 1 << 21  # -- The (triangle, pixel row) pairs rasterized at once.
+FILE_EXTENSION, PACKED_EXTENSION = ".png", ".masks.json"
+CHANNELS = "RGBA"
+
+
+# • ───────────────────────────
+# • ──── Rasterization. ────
+
+
+@instrumentation.traced("masks.rasterize_strokes")
+def rasterize_strokes(mesh, strokes_data, resolution=MASK_RESOLUTION, padding=0, by_region=False, workers=None, uv_set=None, backend=None):
+    """Rasterizes every stroke into a mask in UV space. The triangles of the
+    strokes are gathered from the mesh once, then the strokes are rasterized in
+    parallel over a process pool (see rasterize), without a renderer nor Maya in
+    the workers.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - strokes_data (dict): The strokes, as exported (see Stroke.data).
+    - resolution (int): The width and height of the masks, in pixels.
+    - padding (int): The pixels to grow the masks by, to hide UV seams.
+    - by_region (bool): Whether to merge the strokes of every region into one mask.
+    - workers (int, optional): The size of the process pool, one per core by
+    default, 1 to rasterize in this process.
+    - uv_set (str, optional): The UV set, the current one by default.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - dict[str, np.ndarray]: The (resolution, resolution) boolean mask of every
+    stroke or region, row 0 at the top of the UV square."""
+
+    backend = backend or get_backend()
+    mesh_topology = backend.get_topology(mesh)
+    uvs, uv_ids = backend.get_uvs(mesh, uv_set)
+
+    groups = region_groups(strokes_data) if by_region else {name: values["indices"] for name, values in strokes_data.items()}
+    triangles = {name: uv_triangles(mesh_topology, uvs, uv_ids, faces) for name, faces in groups.items()}
+
+    workers = min(workers or os.cpu_count() or 1, len(triangles))
+
+    if workers <= 1:
+        return {name: rasterize(values, resolution, padding) for name, values in triangles.items()}
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as executor:
+        masks = executor.map(_rasterize_packed, triangles.values(), [resolution] * len(triangles), [padding] * len(triangles))
+        return {name: np.unpackbits(mask, count=resolution * resolution).astype(bool).reshape(resolution, resolution) for name, mask in zip(triangles, masks)}
+
+
+def region_groups(strokes_data):
+    """Gathers the faces of the strokes by region, in the order regions appear."""
+
+    groups = {}
+
+    for values in strokes_data.values():
+        groups.setdefault(values.get("region") or "default", []).extend(values["indices"])
+
+    return groups
+
+
+def uv_triangles(mesh_topology, uvs, uv_ids, faces):
+    """Fans the faces into triangles in UV space, skipping those without UVs.
+
+    Args:
+    - mesh_topology (topology.Topology): The topology of the mesh.
+    - uvs (np.ndarray): The (U, 2) UVs.
+    - uv_ids (np.ndarray): The UV index of every face corner, -1 if none.
+    - faces (Sequence[int]): The face indices.
+
+    Returns:
+    - np.ndarray: The (T, 3, 2) UV triangles, as float32 to halve the transfer
+    to the workers."""
+
+    _, corners = mesh_topology.triangle_corners(np.asarray(faces, dtype=np.int64))
+    ids = uv_ids[corners]
+
+    return uvs[ids[(ids >= 0).all(axis=1)]].astype(np.float32)
+
+
+def rasterize(triangles, resolution, padding=0):
+    """Rasterizes triangles given in UV space into a mask, as scanlines: every
+    (triangle, pixel row) pair is intersected with the triangle's edges at the
+    centre of the row, and the span of pixel centres inside is written into a
+    difference array, summed along the rows at the end. Pixel centres on a
+    shared edge belong to one triangle only, and triangles smaller than a pixel
+    still mark the pixel of their centroid.
+
+    Args:
+    - triangles (np.ndarray): The (T, 3, 2) UV triangles.
+    - resolution (int): The width and height of the mask, in pixels.
+    - padding (int): The pixels to grow the mask by.
+
+    Returns:
+    - np.ndarray: The (resolution, resolution) boolean mask, row 0 at the top
+    of the UV square (V = 1)."""
+
+    points = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 2) * resolution
+    spans = np.zeros(resolution * (resolution + 1), dtype=np.int32)
+
+    # -- The pixel rows whose centre (row + 0.5) falls within every triangle.
+    low = np.clip(np.ceil(points[:, :, 1].min(axis=1) - 0.5), 0, resolution).astype(np.int64)
+    high = np.clip(np.floor(points[:, :, 1].max(axis=1) - 0.5), -1, resolution - 1).astype(np.int64)
+    row_counts = np.maximum(high - low + 1, 0)
+    row_offsets = np.cumsum(row_counts) - row_counts
+
+    for start, end in _chunks(row_counts, CHUNK_ROWS):
+        counts = row_counts[start:end]
+        owners = np.repeat(np.arange(start, end), counts)
+        rows = low[owners] + np.arange(counts.sum()) - np.repeat(row_offsets[start:end] - row_offsets[start], counts)
+
+        left, right = _row_spans(points[owners], rows + 0.5)
+        first, last = np.ceil(left - 0.5), np.floor(right - 0.5)
+
+        kept = (first <= last) & (last >= 0) & (first < resolution)
+        rows, first, last = rows[kept], np.clip(first[kept], 0, resolution).astype(np.int64), np.clip(last[kept], -1, resolution - 1).astype(np.int64)
+
+        spans += np.bincount(rows * (resolution + 1) + first, minlength=len(spans)).astype(np.int32)
+        spans -= np.bincount(rows * (resolution + 1) + last + 1, minlength=len(spans)).astype(np.int32)
+
+    mask = np.cumsum(spans.reshape(resolution, resolution + 1), axis=1)[:, :resolution] > 0
+
+    if len(points):
+        centroids = np.clip(np.floor(points.mean(axis=1)), 0, resolution - 1).astype(np.int64)
+        mask[centroids[:, 1], centroids[:, 0]] = True
+
+    return dilate(mask, padding)[::-1]
+
+
+def _rasterize_packed(triangles, resolution, padding):
+    """The worker of the pool, returning the mask as bits to cut the transfer."""
+
+    return np.packbits(rasterize(triangles, resolution, padding))
+
+
+def _row_spans(triangles, heights):
+    """Intersects the horizontal lines at the given heights with the edges of
+    the triangles, each edge half open so vertices are not counted twice.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray]: The left and right ends of the spans."""
+
+    left, right = np.full(len(heights), np.inf), np.full(len(heights), -np.inf)
+
+    for a, b in ((0, 1), (1, 2), (2, 0)):
+        start, end = triangles[:, a], triangles[:, b]
+        bottom, top = np.minimum(start[:, 1], end[:, 1]), np.maximum(start[:, 1], end[:, 1])
+        crossed = (bottom <= heights) & (heights < top)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = start[:, 0] + (heights - start[:, 1]) * (end[:, 0] - start[:, 0]) / (end[:, 1] - start[:, 1])
+
+        left = np.where(crossed, np.minimum(left, x), left)
+        right = np.where(crossed, np.maximum(right, x), right)
+
+    return left, right
+
+
+def _chunks(counts, size):
+    """Splits the items into consecutive ranges whose counts sum to about size."""
+
+    bounds = np.searchsorted(np.cumsum(counts), np.arange(size, counts.sum(), size), side="right")
+    bounds = np.unique(np.concatenate([[0], bounds, [len(counts)]]))
+
+    return zip(bounds[:-1], bounds[1:])
+
+
+def dilate(mask, padding):
+    """Grows the mask by the given pixels, to the four neighbours at every step."""
+
+    for _ in range(padding):
+        grown = mask.copy()
+        grown[1:] |= mask[:-1]
+        grown[:-1] |= mask[1:]
+        grown[:, 1:] |= mask[:, :-1]
+        grown[:, :-1] |= mask[:, 1:]
+        mask = grown
+
+    return mask
+
+
+def _pool_context():
+    """The multiprocessing context of the pool. Inside Maya's UI, sys.executable
+    is the Maya binary itself, so the workers are spawned with the mayapy next
+    to it instead."""
+
+    executable = Path(sys.executable)
+
+    if not executable.stem.lower().startswith("maya") or executable.stem.lower() == "mayapy":
+        return None
+
+    context = multiprocessing.get_context("spawn")
+    context.set_executable(str(executable.with_name(f"mayapy{executable.suffix}")))
+
+    return context
+
+
+# • ───────────────────────────
+# • ──── IO. ────
+
+
+def write_masks(filepath, masks, packed=False):
+    """Writes the masks as 8-bit PNG images, either one grayscale image per mask
+    named after it, or the masks packed four per RGBA image, with a JSON file
+    listing the mask of every channel.
+
+    Args:
+    - filepath (Path/str): The path without extension, e.g. "exports/body".
+    - masks (dict[str, np.ndarray]): The masks, see rasterize_strokes.
+    - packed (bool): Whether to pack the masks into the channels of RGBA images.
+
+    Returns:
+    - list[Path]: The filepaths written."""
+
+    filepath = Path(filepath)
+
+    if not packed:
+        filepaths = [filepath.with_name(f"{filepath.name}_{name}{FILE_EXTENSION}") for name in masks]
+
+        for path, mask in zip(filepaths, masks.values()):
+            write_png(path, mask.astype(np.uint8) * 255)
+
+        return filepaths
+
+    names, filepaths, channels = list(masks), [], {}
+
+    for index in range(0, len(names), len(CHANNELS)):
+        path = filepath.with_name(f"{filepath.name}_masks_{index // len(CHANNELS)}{FILE_EXTENSION}")
+        group = names[index : index + len(CHANNELS)]
+
+        pixels = np.zeros(masks[group[0]].shape + (len(CHANNELS),), dtype=np.uint8)
+        # -- An opaque alpha unless it holds a mask, so the images stay visible.
+        pixels[:, :, 3] = 255
+
+        for channel, name in enumerate(group):
+            pixels[:, :, channel] = masks[name].astype(np.uint8) * 255
+            channels[name] = {"image": path.name, "channel": CHANNELS[channel]}
+
+        write_png(path, pixels)
+        filepaths.append(path)
+
+    index_path = filepath.with_name(f"{filepath.name}{PACKED_EXTENSION}")
+    index_path.write_text(json.dumps(channels, indent=4))
+
+    return filepaths + [index_path]
+
+
+def write_png(filepath, pixels):
+    """Writes 8-bit pixels as an unfiltered, zlib deflated PNG, which
+    needs no imaging library.
+
+    Args:
+    - filepath (Path/str): The filepath.
+    - pixels (np.ndarray): The (H, W) grayscale or (H, W, C) pixels, with C among
+    2 (grayscale and alpha), 3 (RGB) and 4 (RGBA)."""
+
+    pixels = np.ascontiguousarray(pixels, dtype=np.uint8)
+    height, width = pixels.shape[:2]
+    colour_type = {1: 0, 2: 4, 3: 2, 4: 6}[1 if pixels.ndim == 2 else pixels.shape[2]]
+
+    # -- Every scanline starts with its filter type, 0 for none.
+    scanlines = np.concatenate([np.zeros((height, 1), dtype=np.uint8), pixels.reshape(height, -1)], axis=1)
+
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, colour_type, 0, 0, 0)
+    content = chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 6)) + chunk(b"IEND", b"")
+
+    Path(filepath).write_bytes(b"\x89PNG\r\n\x1a\n" + content)
@@ -0,0 +1,237 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from warpaint.core import instrumentation
+from warpaint.core import store
+
+
+OURS, THEIRS, BASE = "ours", "theirs", "base"
+POLICIES = [OURS, THEIRS, BASE]
+METADATA = ["region", "colour_name"]
+
+
+@dataclass
+class StrokeDiff:
+    name: str
+    added: np.ndarray
+    removed: np.ndarray
+    changes: dict = field(default_factory=dict)  # -- Metadata key: (old, new).
+
+    def data(self):
+        return {"name": self.name, "added": self.added.tolist(), "removed": self.removed.tolist(), "changes": self.changes}
+
+
+@dataclass
+class DocumentDiff:
+    """The differences between two .paint documents, stroke by stroke."""
+
+    added: list = field(default_factory=list)  # -- Names of the new strokes.
+    removed: list = field(default_factory=list)  # -- Names of the deleted strokes.
+    changed: list = field(default_factory=list)  # -- StrokeDiff of the strokes in both.
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def data(self):
+        return {"added": self.added, "removed": self.removed, "changed": [stroke_diff.data() for stroke_diff in self.changed]}
+
+
+@dataclass
+class MergeResult:
+    document: dict
+    conflicts: np.ndarray  # -- The faces both sides gave to different strokes.
+    stroke_conflicts: list = field(default_factory=list)  # -- Strokes deleted on a side and modified on the other.
+
+
+# • ───────────────────────────
+# • ──── Diff. ────
+
+
+@instrumentation.traced("merging.diff")
+def diff_documents(document, other):
+    """Compares the strokes of two documents: the strokes added and removed, and
+    the faces added to and removed from the strokes in both, with set operations
+    on their sorted face arrays (see sorted_difference).
+
+    Args:
+    - document (dict): The original .paint document.
+    - other (dict): The modified .paint document.
+
+    Returns:
+    - DocumentDiff: The differences, in the order of the strokes."""
+
+    strokes_data, other_strokes_data = document["strokes"], other["strokes"]
+    result = DocumentDiff(added=[name for name in other_strokes_data if name not in strokes_data], removed=[name for name in strokes_data if name not in other_strokes_data])
+
+    for name, values in strokes_data.items():
+        if name not in other_strokes_data:
+            continue
+
+        other_values = other_strokes_data[name]
+        faces, other_faces = sorted_faces(values["indices"]), sorted_faces(other_values["indices"])
+
+        stroke_diff = StrokeDiff(name, sorted_difference(other_faces, faces), sorted_difference(faces, other_faces))
+        stroke_diff.changes = {key: (values.get(key), other_values.get(key)) for key in METADATA if values.get(key) != other_values.get(key)}
+
+        if len(stroke_diff.added) or len(stroke_diff.removed) or stroke_diff.changes:
+            result.changed.append(stroke_diff)
+
+    return result
+
+
+def sorted_faces(indices):
+    """Converts face indices into a sorted, unique array, skipping the sort for
+    indices already stored sorted, as the store writes them."""
+
+    faces = np.asarray(indices, dtype=np.int64)
+    return faces if (faces[1:] > faces[:-1]).all() else store.to_faces(faces)
+
+
+def sorted_difference(values, other):
+    """The values not in other, both sorted and unique. Looks the values up in
+    other with a binary search, rather than sorting both again as np.setdiff1d."""
+
+    if not len(other):
+        return values
+
+    positions = np.minimum(np.searchsorted(other, values), len(other) - 1)
+    return values[other[positions] != values]
+
+
+# • ───────────────────────────
+# • ──── Merge. ────
+
+
+@instrumentation.traced("merging.merge")
+def merge_documents(base, ours, theirs, policy=OURS):
+    """Merges the strokes of two documents painted from the same base. The
+    changes of each side are replayed onto the base stroke by stroke: faces
+    added by either side are added, faces removed by either side are removed.
+    As a face belongs to one stroke only, a face given to different strokes by
+    each side is a conflict, resolved for all faces at once by the policy:
+    OURS or THEIRS keep the stroke of that side, BASE keeps the base stroke.
+    Metadata changed on both sides and strokes deleted on a side but modified
+    on the other are resolved the same way, BASE keeping the modified stroke.
+
+    Args:
+    - base (dict): The common ancestor .paint document.
+    - ours (dict): Our .paint document.
+    - theirs (dict): Their .paint document.
+    - policy (str): One of POLICIES.
+
+    Returns:
+    - MergeResult: The merged document, with our point order hash and topology,
+    and the conflicts."""
+
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}', expected one of {POLICIES}.")
+
+    hashes = {document.get("point_order_hash") for document in (base, ours, theirs)}
+
+    if len(hashes) > 1:
+        raise ValueError("The documents were painted on different meshes.")
+
+    sides = {BASE: base["strokes"], OURS: ours["strokes"], THEIRS: theirs["strokes"]}
+    names = list(dict.fromkeys([*sides[BASE], *sides[OURS], *sides[THEIRS]]))
+    faces = {side: {name: sorted_faces(values["indices"]) for name, values in strokes_data.items()} for side, strokes_data in sides.items()}
+
+    # -- Aligned with names, deleted strokes are left empty and dropped at the end.
+    merged_faces, strokes_data, stroke_conflicts = [], {}, []
+    empty = np.empty(0, dtype=np.int64)
+
+    for name in names:
+        base_faces = faces[BASE].get(name, empty)
+        side_faces = {side: faces[side].get(name) for side in (OURS, THEIRS)}
+        present = [side for side in (OURS, THEIRS) if side_faces[side] is not None]
+
+        deleted = [side for side in (OURS, THEIRS) if name in sides[BASE] and side not in present]
+        modified = [side for side in present if _modified(sides[BASE].get(name), sides[side][name], base_faces, side_faces[side])]
+
+        if deleted and modified:
+            stroke_conflicts.append(name)
+
+        if deleted and (not modified or policy in deleted):
+            merged_faces.append(empty)
+            continue
+
+        added = [sorted_difference(side_faces[side], base_faces) for side in present]
+        removed = [sorted_difference(base_faces, side_faces[side]) for side in present]
+
+        merged_faces.append(sorted_union(sorted_difference(base_faces, sorted_union(*removed)), *added))
+        strokes_data[name] = _merge_metadata(sides, name, policy)
+
+    indices, conflicts = resolve_ownership(merged_faces, [faces[policy].get(name, empty) for name in names])
+
+    for name, stroke_indices in zip(names, indices):
+        if name in strokes_data:
+            strokes_data[name]["indices"] = stroke_indices.tolist()
+
+    return MergeResult(dict(ours, strokes=strokes_data), conflicts, stroke_conflicts)
+
+
+def resolve_ownership(merged_faces, policy_faces):
+    """Gives every face claimed by several merged strokes to a single one, the
+    stroke owning it in the document of the policy, or none. The claims are
+    counted over all the strokes at once; only the few conflicting faces are
+    then looked up stroke by stroke.
+
+    Args:
+    - merged_faces (list[np.ndarray]): The sorted faces of every merged stroke.
+    - policy_faces (list[np.ndarray]): The sorted faces of the same strokes in
+    the document of the policy.
+
+    Returns:
+    - tuple[list[np.ndarray], np.ndarray]: The faces of every stroke, and the
+    conflicting faces."""
+
+    all_faces = np.concatenate(merged_faces) if merged_faces else np.empty(0, dtype=np.int64)
+    conflicts = np.flatnonzero(np.bincount(all_faces) > 1) if len(all_faces) else all_faces
+
+    if not len(conflicts):
+        return merged_faces, conflicts
+
+    return [sorted_union(sorted_difference(faces, conflicts), sorted_intersection(conflicts, owned)) for faces, owned in zip(merged_faces, policy_faces)], conflicts
+
+
+def sorted_union(*arrays):
+    """The union of sorted, unique arrays. A stable sort merges the sorted runs
+    in linear time, where np.union1d sorts from scratch."""
+
+    values = np.sort(np.concatenate(arrays), kind="stable") if len(arrays) > 1 else arrays[0]
+    return values[np.concatenate([[True], values[1:] != values[:-1]])] if len(values) else values
+
+
+def sorted_intersection(values, other):
+    """The values also in other, both sorted and unique (see sorted_difference)."""
+
+    if not len(other):
+        return other
+
+    positions = np.minimum(np.searchsorted(other, values), len(other) - 1)
+    return values[other[positions] == values]
+
+
+def _modified(base_values, values, base_faces, faces):
+    if base_values is None or not np.array_equal(base_faces, faces):
+        return True
+
+    return any(values.get(key) != base_values.get(key) for key in METADATA)
+
+
+def _merge_metadata(sides, name, policy):
+    """Takes the metadata of the side that changed it, the policy's on both."""
+
+    base_values = sides[BASE].get(name)
+    present = [side for side in (OURS, THEIRS) if name in sides[side]]
+    values = dict(sides[present[0]][name] if base_values is None else base_values)
+
+    for key in METADATA:
+        changed = {side: sides[side][name].get(key) for side in present if base_values is None or sides[side][name].get(key) != base_values.get(key)}
+
+        if len(changed) == 1 or (len(changed) == 2 and len(set(changed.values())) == 1):
+            values[key] = next(iter(changed.values()))
+        elif len(changed) == 2 and policy in changed:
+            values[key] = changed[policy]
+
+    return values
@@ -0,0 +1,165 @@
+import numpy as np
+
+from warpaint.core.backend import get_backend
+from warpaint.core import hashing, spatial, surface_maps
+
+
+REFINE_CHUNK = 1 << 16  # -- Target faces refined at once, about 10 candidate triangles each.
+
+
+def point_order_hash(mesh, backend=None):
+    """Computes the hash of the vertex indices of all faces, in the order they
+    are stored, as written in the .paint documents.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - str: The MD5 hash of the point order."""
+
+    mesh_topology = (backend or get_backend()).get_topology(mesh)
+    return hashing.hash_str(str(mesh_topology.face_vertices.tolist()))
+
+
+def stroke_vertices(mesh, strokes_data, backend=None):
+    """Retrieves the vertices of every stroke from the face-vertex arrays of the
+    (cached) topology, read once for all the strokes.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - strokes_data (dict): The strokes data, as exported by the PainterUI.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - dict[str, np.ndarray]: The sorted vertex indices of every stroke."""
+
+    mesh_topology = (backend or get_backend()).get_topology(mesh)
+    return {name: mesh_topology.face_vertex_indices(np.asarray(values["indices"], dtype=np.int64)) for name, values in strokes_data.items()}
+
+
+def centroid_grid(mesh, backend=None):
+    """Retrieves a spatial index over the face centroids of the mesh, cached per
+    topology and point positions.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - tuple[str, spatial.UniformGrid]: The cache key and the grid, whose points
+    are the face centroids."""
+
+    backend = backend or get_backend()
+    mesh_topology, points = backend.get_topology(mesh), backend.get_points(mesh)
+    key = ("centroids", mesh_topology.fingerprint, spatial.points_fingerprint(points))
+
+    return key, spatial.cached(key, lambda: spatial.UniformGrid(mesh_topology.face_centroids(points)))
+
+
+def mirror_map(mesh, axis="x", backend=None):
+    """Retrieves the counterpart of every face of the mesh across the axis.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - axis (str): The mirror axis, one of "x", "y" or "z".
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - np.ndarray: The counterpart face index of every face, -1 where there is none."""
+
+    grid_key, grid = centroid_grid(mesh, backend)
+    return spatial.cached(("mirror", grid_key, axis), lambda: spatial.mirror_map(grid.points, axis, grid=grid))
+
+
+def transfer_map(source_mesh, target_mesh, min_dot=None, backend=None):
+    """Maps every face of the target mesh onto the face of the source mesh it lies
+    on, regardless of their topologies: the source face of the nearest centroid,
+    refined by a closest-point query (see refine_transfer_map). The meshes are
+    compared in world space, thus they should overlap. The map is cached per
+    topology and point positions of both meshes.
+
+    Args:
+    - source_mesh (str): The name of the source mesh.
+    - target_mesh (str): The name of the target mesh.
+    - min_dot (float, optional): The minimum dot product between matched face normals.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - np.ndarray: The source face index of every target face, -1 only when the
+    source mesh has no face."""
+
+    backend = backend or get_backend()
+
+    source_topology, source_points = backend.get_topology(source_mesh), backend.get_points(source_mesh, world=True)
+    target_topology, target_points = backend.get_topology(target_mesh), backend.get_points(target_mesh, world=True)
+
+    key = ("transfer", source_topology.fingerprint, spatial.points_fingerprint(source_points))
+    key += (target_topology.fingerprint, spatial.points_fingerprint(target_points), min_dot)
+
+    def build():
+        source_centroids, target_centroids = source_topology.face_centroids(source_points), target_topology.face_centroids(target_points)
+        source_normals, target_normals = source_topology.face_normals(source_points), target_topology.face_normals(target_points)
+        indices = spatial.transfer_map(source_centroids, target_centroids, source_normals, target_normals, min_dot)
+        return refine_transfer_map(source_topology, source_points, target_centroids, indices, source_normals, target_normals, min_dot)
+
+    return spatial.cached(key, build)
+
+
+def refine_transfer_map(source_topology, source_points, target_centroids, indices, source_normals=None, target_normals=None, min_dot=None):
+    """Refines the nearest-centroid match of every target face: among the matched
+    source face and its neighbours, the face whose surface is nearest to the
+    target centroid is kept. The nearest centroid alone picks the wrong face
+    where neighbouring faces differ a lot in size, but the right face is then
+    next to it. Neighbours whose normals disagree are not considered.
+
+    Args:
+    - source_topology (topology.Topology): The source topology.
+    - source_points (np.ndarray): The (P, 3) source points.
+    - target_centroids (np.ndarray): The (T, 3) target face centroids.
+    - indices (np.ndarray): The nearest source face of every target face, or -1.
+    - source_normals (np.ndarray, optional): The (S, 3) unit source face normals.
+    - target_normals (np.ndarray, optional): The (T, 3) unit target face normals.
+    - min_dot (float, optional): The minimum dot product between matched normals.
+
+    Returns:
+    - np.ndarray: The source face index of every target face, -1 where it was."""
+
+    indices = indices.copy()
+    offsets, adjacent = source_topology.face_adjacency
+    matched = np.flatnonzero(indices >= 0)
+
+    for start in range(0, len(matched), REFINE_CHUNK):
+        queries = matched[start:start + REFINE_CHUNK]
+        faces = indices[queries]
+
+        # -- The matched face first, so it wins ties, then its neighbours.
+        counts = offsets[faces + 1] - offsets[faces]
+        positions = np.repeat(offsets[faces] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        owners = np.concatenate([np.arange(len(queries)), np.repeat(np.arange(len(queries)), counts)])
+        candidates = np.concatenate([faces, adjacent[positions]])
+
+        if min_dot is not None and source_normals is not None and target_normals is not None:
+            agree = np.einsum("ij,ij->i", source_normals[candidates], target_normals[queries[owners]]) >= min_dot
+            agree[: len(queries)] = True
+            owners, candidates = owners[agree], candidates[agree]
+
+        # -- The distance of every candidate triangle to the centroid, the nearest per face.
+        triangles = source_topology.triangles(candidates)[1]
+        fan_counts = np.maximum(source_topology.face_counts[candidates] - 2, 0)
+        triangle_candidates = np.repeat(np.arange(len(candidates)), fan_counts)
+
+        a, b, c = (source_points[triangles[:, corner]] for corner in range(3))
+        centroids = target_centroids[queries[owners[triangle_candidates]]]
+        barycentrics = surface_maps.closest_barycentrics(centroids, a, b, c)
+        closest = barycentrics[:, :1] * a + barycentrics[:, 1:2] * b + barycentrics[:, 2:] * c
+
+        # -- The triangles of every candidate are contiguous, reduced in one pass.
+        distances, fanned = np.full(len(candidates), np.inf), np.flatnonzero(fan_counts)
+        distances[fanned] = np.minimum.reduceat(((closest - centroids) ** 2).sum(axis=1), (np.cumsum(fan_counts) - fan_counts)[fanned])
+
+        order = np.lexsort((np.arange(len(candidates)), distances, owners))
+        first = order[np.concatenate([[True], owners[order][1:] != owners[order][:-1]])]
+        indices[queries[owners[first]]] = candidates[first]
+
+    return indices
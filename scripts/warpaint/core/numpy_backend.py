@@ -0,0 +1,169 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from warpaint.core import topology
+from warpaint.core.backend import MeshBackend
+
+
+@dataclass
+class NumpyMesh:
+    face_counts: np.ndarray
+    face_vertices: np.ndarray
+    points: np.ndarray
+    matrix: np.ndarray = field(default_factory=lambda: np.eye(4))
+    uvs: np.ndarray = None
+    uv_ids: np.ndarray = None
+
+    def __post_init__(self):
+        self.colours = np.zeros((len(self.face_counts), 3), dtype=np.uint8)
+        self.coloured = np.zeros(len(self.face_counts), dtype=bool)
+
+    @property
+    def face_count(self):
+        return len(self.face_counts)
+
+    def world_points(self):
+        """Transforms the points by the matrix, stored row-major like Maya's."""
+
+        return self.points @ self.matrix[:3, :3] + self.matrix[3, :3]
+
+
+class NumpyBackend(MeshBackend):
+    """An in-memory backend holding NumpyMesh instances by name, so the core can
+    run in batch tools, benchmarks and CI without Maya. The displayed colours and
+    the selection are stored as arrays, for inspection."""
+
+    def __init__(self, meshes=None):
+        self.meshes = dict(meshes or {})
+        self.selection = {}
+
+    def add_mesh(self, name, mesh):
+        self.meshes[name] = mesh
+        return name
+
+    def get_topology(self, mesh):
+        mesh = self.meshes[mesh]
+        return topology.get_topology(mesh.face_counts, mesh.face_vertices)
+
+    def get_points(self, mesh, world=False):
+        mesh = self.meshes[mesh]
+        return mesh.world_points() if world else mesh.points
+
+    def set_points(self, mesh, points, indices=None):
+        if indices is None:
+            self.meshes[mesh].points = np.array(points, dtype=np.float64)
+        else:
+            self.meshes[mesh].points[indices] = points[indices]
+
+    def get_uvs(self, mesh, uv_set=None):
+        mesh = self.meshes[mesh]
+
+        if mesh.uvs is None:
+            return np.empty((0, 2)), np.full(len(mesh.face_vertices), -1, dtype=np.int64)
+
+        return mesh.uvs, mesh.uv_ids
+
+    def colour_faces(self, mesh, indices, rgb):
+        mesh = self.meshes[mesh]
+        mesh.colours[indices], mesh.coloured[indices] = rgb, True
+
+    def decolour_faces(self, mesh, indices):
+        self.meshes[mesh].coloured[indices] = False
+
+    def select_faces(self, mesh, indices):
+        self.selection = {mesh: np.asarray(indices, dtype=np.int64)}
+
+
+def grid_mesh(rows, columns, size=1.0):
+    """Builds a flat grid of quads on the XZ plane, centred on the origin, thus
+    symmetric across X. Used to synthesize meshes of any size.
+
+    Args:
+    - rows (int): The number of rows of quads.
+    - columns (int): The number of columns of quads.
+    - size (float): The size of a quad.
+
+    Returns:
+    - NumpyMesh: The grid, with rows * columns faces, laid out over the whole
+    UV square."""
+
+    x, z = np.meshgrid(np.arange(columns + 1) - columns / 2, np.arange(rows + 1) - rows / 2)
+    points = np.stack([x.ravel(), np.zeros(x.size), z.ravel()], axis=1) * size
+
+    corners = (np.arange(rows)[:, None] * (columns + 1) + np.arange(columns)[None, :]).ravel()
+    face_vertices = np.stack([corners, corners + columns + 1, corners + columns + 2, corners + 1], axis=1).ravel()
+
+    u, v = np.meshgrid(np.linspace(0, 1, columns + 1), np.linspace(0, 1, rows + 1))
+    uvs = np.stack([u.ravel(), v.ravel()], axis=1)
+
+    face_vertices = face_vertices.astype(np.int64)
+    return NumpyMesh(np.full(rows * columns, 4, dtype=np.int64), face_vertices, points, uvs=uvs, uv_ids=face_vertices.copy())
+
+
+def sphere_mesh(rows, columns, radius=1.0):
+    """Builds a UV sphere centred on the origin: quads between the rings of
+    points and triangle fans around the poles. Used to synthesize closed meshes.
+
+    Args:
+    - rows (int): The number of rows of faces, at least 2.
+    - columns (int): The number of faces around every row.
+    - radius (float): The radius.
+
+    Returns:
+    - NumpyMesh: The sphere, with rows * columns faces and no UVs."""
+
+    theta, phi = np.meshgrid(np.linspace(0, np.pi, rows + 1)[1:-1], np.linspace(0, 2 * np.pi, columns, endpoint=False), indexing="ij")
+    rings = np.stack([np.sin(theta) * np.cos(phi), np.cos(theta), np.sin(theta) * np.sin(phi)], axis=-1).reshape(-1, 3)
+    points = np.concatenate([[[0, 1, 0]], rings, [[0, -1, 0]]]) * radius
+
+    # -- Ring points start at 1, the bottom pole is the last point.
+    ring_indices = 1 + np.arange((rows - 1) * columns).reshape(rows - 1, columns)
+    following = np.roll(ring_indices, -1, axis=1)
+    bottom = len(points) - 1
+
+    top_fan = np.stack([np.zeros(columns, dtype=np.int64), following[0], ring_indices[0]], axis=1)
+    quads = np.stack([ring_indices[:-1], following[:-1], following[1:], ring_indices[1:]], axis=-1).reshape(-1, 4)
+    bottom_fan = np.stack([ring_indices[-1], following[-1], np.full(columns, bottom)], axis=1)
+
+    face_counts = np.repeat([3, 4, 3], [columns, len(quads), columns]).astype(np.int64)
+    face_vertices = np.concatenate([top_fan.ravel(), quads.ravel(), bottom_fan.ravel()]).astype(np.int64)
+
+    return NumpyMesh(face_counts, face_vertices, points)
+
+def read_obj(filepath):
+    """Reads the polygons, points and UVs of a Wavefront OBJ file, all groups as
+    one mesh. Maya's OBJ export keeps the point and face order, so the .paint
+    documents of the exported mesh apply as is.
+
+    Args:
+    - filepath (Path/str): The filepath.
+
+    Returns:
+    - NumpyMesh: The mesh, with its UVs if the file has some."""
+
+    points, uvs, face_counts, face_vertices, uv_ids = [], [], [], [], []
+
+    for line in Path(filepath).read_text().splitlines():
+        kind, _, rest = line.strip().partition(" ")
+
+        if kind == "v":
+            points.append(rest.split()[:3])
+        elif kind == "vt":
+            uvs.append(rest.split()[:2])
+        elif kind == "f":
+            corners = [corner.split("/") for corner in rest.split()]
+            face_counts.append(len(corners))
+
+            # -- Indices start at 1, negative ones count back from the last element.
+            for corner in corners:
+                face_vertices.append(int(corner[0]) - 1 if int(corner[0]) > 0 else len(points) + int(corner[0]))
+                uv_ids.append((int(corner[1]) - 1 if int(corner[1]) > 0 else len(uvs) + int(corner[1])) if len(corner) > 1 and corner[1] else -1)
+
+    mesh = NumpyMesh(np.array(face_counts, dtype=np.int64), np.array(face_vertices, dtype=np.int64), np.array(points, dtype=np.float64).reshape(-1, 3))
+
+    if uvs:
+        mesh.uvs, mesh.uv_ids = np.array(uvs, dtype=np.float64).reshape(-1, 2), np.array(uv_ids, dtype=np.int64)
+
+    return mesh
@@ -0,0 +1,184 @@
+from pathlib import Path
+import json, os
+
+import numpy as np
+
+from warpaint.core import hashing, instrumentation
+
+
+OBJECTS_DIRNAME = ".objects"  # -- The store of a library, in its root directory.
+REFERRERS_DIRNAME = "referrers"  # -- The manifests written to a store, one file each.
+MANIFEST_FORMAT, VERSION = "warpaint.manifest", 1
+INDEX_DTYPE = np.dtype("<i4")
+
+
+class ObjectStore:
+    """A content-addressed store of blocks: every block is a file named after the
+    hash of its content, under a directory named after the first two characters
+    of the hash. Identical blocks are thus stored once, whichever document they
+    belong to, and never change once written. Every manifest written to the store
+    is recorded as a referrer, so blocks are only pruned knowing all their users,
+    whichever library they belong to."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def path(self, key):
+        return self.directory.joinpath(key[:2], key[2:])
+
+    def put(self, content):
+        """Stores a block, unless already stored.
+
+        Args:
+        - content (bytes): The content of the block.
+
+        Returns:
+        - str: The key of the block, the hash of its content."""
+
+        key = hashing.hash_bytes(content)
+        path = self.path(key)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # -- Written aside then renamed, so a block is either whole or missing.
+            temporary_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            temporary_path.write_bytes(content)
+            os.replace(temporary_path, path)
+
+        return key
+
+    def get(self, key):
+        return self.path(key).read_bytes()
+
+    def map(self, key, dtype=INDEX_DTYPE):
+        """Maps a block of numbers into memory, read only, without reading it.
+
+        Returns:
+        - np.ndarray: The numbers."""
+
+        path = self.path(key)
+
+        if not path.stat().st_size:
+            return np.empty(0, dtype=dtype)
+
+        return np.memmap(path, dtype=dtype, mode="r")
+
+    def keys(self):
+        return {path.parent.name + path.name for path in self.directory.glob("??/*") if not path.name.endswith(".tmp")}
+
+    def add_referrer(self, filepath):
+        """Records a manifest written to the store, in a file of its own, so that
+        concurrent writers never overwrite each other's records."""
+
+        path = self._referrer_path(filepath)
+
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(_absolute_path(filepath))
+
+    def remove_referrer(self, filepath):
+        self._referrer_path(filepath).unlink(missing_ok=True)
+
+    def referrers(self):
+        """The absolute filepaths of the manifests recorded as written to the store.
+
+        Returns:
+        - set[str]: The filepaths, including manifests since deleted or rewritten."""
+
+        return {path.read_text() for path in self.directory.joinpath(REFERRERS_DIRNAME).glob("*")}
+
+    def _referrer_path(self, filepath):
+        return self.directory.joinpath(REFERRERS_DIRNAME, hashing.hash_str(_absolute_path(filepath)))
+
+    def prune(self, keys):
+        """Deletes the blocks not among the given keys, e.g. those of no manifest.
+
+        Returns:
+        - int: The number of blocks deleted."""
+
+        unused = self.keys() - set(keys)
+
+        for key in unused:
+            self.path(key).unlink()
+
+        return len(unused)
+
+
+# • ───────────────────────────
+# • ──── Manifests. ────
+
+
+def is_manifest(content):
+    return isinstance(content, dict) and content.get("format") == MANIFEST_FORMAT
+
+
+@instrumentation.traced("objects.write_manifest")
+def write_manifest(filepath, document, store):
+    """Writes a .paint document as a manifest: the indices of every stroke and
+    the topology are stored as blocks in the object store, the manifest only
+    keeps their keys and the rest of the document.
+
+    Args:
+    - filepath (Path/str): The .paint filepath.
+    - document (dict): The .paint document.
+    - store (ObjectStore): The object store, referred to relatively to the
+    manifest when possible, so a library can be moved along with its store."""
+
+    filepath = Path(filepath)
+    manifest = {"format": MANIFEST_FORMAT, "version": VERSION, "objects": _relative_path(store.directory, filepath.parent)}
+    manifest.update({key: value for key, value in document.items() if key not in ["topology", "strokes"]}, strokes={})
+
+    if "topology" in document:
+        manifest["topology"] = {"block": store.put(json.dumps(document["topology"]).encode("utf-8"))}
+
+    for name, values in document["strokes"].items():
+        indices = np.asarray(values["indices"], dtype=INDEX_DTYPE)
+        manifest["strokes"][name] = dict(values, indices={"block": store.put(indices.tobytes()), "count": len(indices)})
+
+    filepath.write_text(json.dumps(manifest, indent=4))
+    store.add_referrer(filepath)
+
+
+@instrumentation.traced("objects.read_manifest")
+def read_manifest(filepath, manifest):
+    """Resolves a manifest into its .paint document. The indices of the strokes
+    are memory-mapped from their blocks, thus read lazily.
+
+    Args:
+    - filepath (Path/str): The .paint filepath, which the store is relative to.
+    - manifest (dict): The manifest.
+
+    Returns:
+    - dict: The document, with read-only arrays of indices."""
+
+    store = manifest_store(filepath, manifest)
+    document = {key: value for key, value in manifest.items() if key not in ["format", "version", "objects", "topology", "strokes"]}
+
+    if "topology" in manifest:
+        document["topology"] = json.loads(store.get(manifest["topology"]["block"]))
+
+    document["strokes"] = {name: dict(values, indices=store.map(values["indices"]["block"])) for name, values in manifest["strokes"].items()}
+    return document
+
+
+def manifest_store(filepath, manifest):
+    return ObjectStore(Path(filepath).parent.joinpath(manifest["objects"]))
+
+
+def manifest_keys(manifest):
+    """The keys of all the blocks a manifest refers to."""
+
+    keys = [values["indices"]["block"] for values in manifest["strokes"].values()]
+    return keys + ([manifest["topology"]["block"]] if "topology" in manifest else [])
+
+
+def _absolute_path(path):
+    return Path(path).resolve().as_posix()
+
+
+def _relative_path(path, start):
+    try:
+        return Path(os.path.relpath(path, start)).as_posix()
+    except ValueError:  # -- On another drive.
+        return Path(path).resolve().as_posix()
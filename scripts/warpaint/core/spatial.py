@@ -0,0 +1,355 @@
+from collections import OrderedDict
+import hashlib, itertools
+
+import numpy as np
+
+
+CACHE_SIZE = 8
+POINTS_PER_CELL = 1
+MAX_RING = 2  # -- Rings searched per grid, farther queries go to a coarser grid.
+COARSENING = 2
+AGREEMENT_REACH = 4  # -- How much farther than the nearest face an agreeing face is looked for.
+CHUNK_SIZE = 1 << 20
+MAX_DENSE_CELLS = 1 << 24
+
+CORNER_OFFSETS = np.array(list(itertools.product((0, 1), repeat=3)), dtype=np.int64)
+
+AXES = {"x": 0, "y": 1, "z": 2}
+
+_CACHE = OrderedDict()
+
+
+def points_fingerprint(points):
+    """Computes the MD5 hash of an array of points."""
+
+    hasher = hashlib.md5()
+    hasher.update(np.ascontiguousarray(points, dtype=np.float64).tobytes())
+    return hasher.hexdigest()
+
+
+def cached(key, build):
+    """Retrieves a value from the spatial cache or builds and stores it.
+
+    Args:
+    - key (Hashable): The cache key, usually including the topology fingerprint.
+    - build (Callable): Builds the value on a cache miss.
+
+    Returns:
+    - Any: The (cached) value."""
+
+    if key in _CACHE:
+        _CACHE.move_to_end(key)
+        return _CACHE[key]
+
+    value = _CACHE[key] = build()
+
+    while len(_CACHE) > CACHE_SIZE:
+        _CACHE.popitem(last=False)
+
+    return value
+
+
+def clear_cache():
+    _CACHE.clear()
+
+
+class UniformGrid:
+    """A uniform grid over a set of points answering nearest neighbour queries
+    in bulk. The points are sorted by cell, so the content of a cell is a range
+    found through a dense table of cell starts (or a binary search on very large
+    grids), and all the queries are resolved at once: first within the block of
+    cells closest to each query, then within rings of cells. The few queries
+    farther from every point are resolved by a coarser grid over the same points,
+    and so on up to a single cell holding them all, thus every query is matched.
+
+    The cell size is estimated from the two largest extents of the bounding box,
+    as the points usually lie on a surface rather than filling a volume."""
+
+    def __init__(self, points, cell_size=None):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.axes = np.ascontiguousarray(self.points.T)  # -- Gathered per axis, much faster than per point.
+        self.minimum = self.points.min(axis=0) if len(self.points) else np.zeros(3)
+
+        extents = np.sort(np.ptp(self.points, axis=0)) if len(self.points) else np.zeros(3)
+        area = max(extents[1] * extents[2], 1e-12)
+        self.cell_size = cell_size or max(np.sqrt(area * POINTS_PER_CELL / max(len(self.points), 1)), 1e-6)
+
+        cells = self._to_cells(self.points)
+        self.dimensions = cells.max(axis=0) + 1 if len(cells) else np.ones(3, dtype=np.int64)
+
+        keys = self._to_keys(cells)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+        # -- A dense table of cell starts turns lookups into plain indexing.
+        self.cell_count = int(np.prod(self.dimensions))
+        self.cell_starts = np.searchsorted(self.keys, np.arange(self.cell_count + 1)) if self.cell_count <= MAX_DENSE_CELLS else None
+
+        filled_cells = np.count_nonzero(np.diff(self.keys)) + 1 if len(self.keys) else 1
+        self.points_per_cell = max(len(self.points) / filled_cells, 1)
+        self._coarser = None
+
+    def _to_cells(self, points):
+        return np.floor((points - self.minimum) / self.cell_size).astype(np.int64)
+
+    def _to_keys(self, cells):
+        return (cells[..., 0] * self.dimensions[1] + cells[..., 1]) * self.dimensions[2] + cells[..., 2]
+
+    def _cell_ranges(self, keys):
+        """Retrieves the (start, count) of the sorted points within each cell."""
+
+        if self.cell_starts is not None:
+            starts = self.cell_starts[keys]
+            return starts, self.cell_starts[keys + 1] - starts
+
+        starts = np.searchsorted(self.keys, keys, side="left")
+        return starts, np.searchsorted(self.keys, keys, side="right") - starts
+
+    def coarser(self):
+        """The grid over the same points with larger cells, built once."""
+
+        if self._coarser is None:
+            self._coarser = UniformGrid(self.points, self.cell_size * COARSENING)
+
+        return self._coarser
+
+    # • ───────────────────────────
+    # • ──── Queries. ────
+
+    def nearest(self, queries, max_distance=np.inf, accept=None):
+        """Finds the nearest point for every query.
+
+        Args:
+        - queries (np.ndarray): The (N, 3) query positions.
+        - max_distance (float/np.ndarray): Queries farther than this from every
+        point are unmatched, one distance for all or one per query.
+        - accept (Callable, optional): Filters candidate matches, receives arrays of
+        (query indices, point indices) and returns a boolean mask of the valid pairs.
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray]: The index of the nearest point (-1 when
+        unmatched) and the distance to it (inf when unmatched)."""
+
+        queries = np.asarray(queries, dtype=np.float64)
+        indices = np.full(len(queries), -1, dtype=np.int64)
+        distances = np.full(len(queries), np.inf)
+
+        if len(self.points) and len(queries):
+            self._resolve(queries, indices, distances, max_distance, accept)
+
+        return self._unmatched(indices, distances, max_distance)
+
+    def _resolve(self, queries, indices, distances, max_distance, accept=None):
+        """Updates the nearest indices and distances of the queries in place, the
+        distances found so far bounding the search."""
+
+        max_distance = np.broadcast_to(max_distance, len(queries))
+        query_axes = np.ascontiguousarray(queries.T)
+
+        if self.cell_count == 1:  # -- The coarsest grid, every query searches every point.
+            for chunk in self._chunks(np.arange(len(queries)), 1):
+                self._search(query_axes, np.zeros((len(queries), 3), dtype=np.int64), chunk, np.zeros((1, 3), dtype=np.int64), indices, distances, accept)
+
+            return
+
+        # -- First pass: the 2x2x2 block of cells closest to each query, which
+        # -- resolves it when the match is nearer than the block's closest side.
+        fractions = (queries - self.minimum) / self.cell_size
+        fractions -= np.floor(fractions)
+        margins = np.maximum(fractions, 1 - fractions).min(axis=1) * self.cell_size
+        directions = np.where(fractions < 0.5, -1, 1)
+
+        query_cells = self._to_cells(queries)
+
+        for chunk in self._chunks(np.arange(len(queries)), len(CORNER_OFFSETS)):
+            self._search(query_axes, query_cells, chunk, CORNER_OFFSETS[None, :, :] * directions[chunk, None, :], indices, distances, accept)
+
+        pending = np.flatnonzero((distances > margins) & (margins < max_distance))
+
+        # -- Then rings of cells: within ring * cell_size the match is guaranteed.
+        # -- Beyond the first ring, only around the queries whose match is known
+        # -- to be within the rings, the others are left to a coarser grid.
+        reach = MAX_RING * self.cell_size
+
+        for ring in range(1, MAX_RING + 1):
+            searched = pending if ring == 1 else pending[np.minimum(distances[pending], max_distance[pending]) <= reach]
+
+            if not len(searched):
+                break
+
+            offsets = np.array(list(itertools.product(range(-ring, ring + 1), repeat=3)), dtype=np.int64)
+            offsets = offsets[np.abs(offsets).max(axis=1) == ring]  # -- Inner rings were searched already.
+
+            for chunk in self._chunks(searched, len(offsets)):
+                self._search(query_axes, query_cells, chunk, offsets, indices, distances, accept)
+
+            resolved = (distances <= ring * self.cell_size) | (ring * self.cell_size >= max_distance)
+            pending = pending[~resolved[pending]]
+
+        # -- The queries farther away, e.g. off a scaled or offset surface, are
+        # -- resolved by the coarser grids, whose rings reach further.
+        if len(pending):
+            pending_indices, pending_distances = indices[pending], distances[pending]
+            coarse_accept = None if accept is None else lambda owners, candidates: accept(pending[owners], candidates)
+
+            self.coarser()._resolve(queries[pending], pending_indices, pending_distances, max_distance[pending], coarse_accept)
+            indices[pending], distances[pending] = pending_indices, pending_distances
+
+    @staticmethod
+    def _unmatched(indices, distances, max_distance):
+        unmatched = distances > max_distance
+        indices[unmatched], distances[unmatched] = -1, np.inf
+
+        return indices, distances
+
+    def _chunks(self, subset, cells_per_query):
+        return np.array_split(subset, max(1, int(len(subset) * cells_per_query * self.points_per_cell) // CHUNK_SIZE))
+
+    def _search(self, query_axes, query_cells, subset, offsets, indices, distances, accept=None):
+        """Searches the cells around each query of the subset and updates the
+        nearest indices and distances in place.
+
+        Args:
+        - query_axes (np.ndarray): The (3, N) query positions.
+        - query_cells (np.ndarray): The (N, 3) cells of the queries.
+        - subset (np.ndarray): The indices of the queries searched.
+        - offsets (np.ndarray): The (K, 3) offsets of the cells searched, or the
+        (len(subset), K, 3) offsets of every query."""
+
+        if not len(subset):
+            return
+
+        # -- Keys are linear in the cells, so the keys around a query are offsets
+        # -- of its key. Cells outside the grid alias cells inside it, and are
+        # -- only told apart once the empty cells are discarded.
+        offset_count = offsets.shape[-2]
+        keys = (self._to_keys(query_cells[subset])[:, None] + self._to_keys(offsets)).ravel()
+
+        entries = np.flatnonzero((keys >= 0) & (keys < self.cell_count))
+        starts, counts = self._cell_ranges(keys[entries])
+
+        filled = counts > 0
+        entries, starts, counts = entries[filled], starts[filled], counts[filled]
+        owners = subset[entries // offset_count]
+
+        cells = query_cells[owners] + (offsets[entries % offset_count] if offsets.ndim == 2 else offsets.reshape(-1, 3)[entries])
+        inside = ((cells >= 0) & (cells < self.dimensions)).all(axis=1)
+        cells, starts, counts, owners = cells[inside], starts[inside], counts[inside], owners[inside]
+
+        # -- Cells farther than the nearest point found so far are skipped.
+        gaps = np.zeros(len(cells))
+
+        for cell_axis, minimum, query_axis in zip(cells.T, self.minimum, query_axes):
+            positions = query_axis[owners] - minimum - cell_axis * self.cell_size
+            gap = np.maximum(-positions, 0) + np.maximum(positions - self.cell_size, 0)
+            gaps += gap * gap
+
+        near = gaps < distances[owners] ** 2
+        starts, counts, owners = starts[near], counts[near], owners[near]
+
+        if not len(owners):
+            return
+
+        entries = np.arange(counts.sum()) + np.repeat(starts - (np.cumsum(counts) - counts), counts)
+        candidates, owners = self.order[entries], np.repeat(owners, counts)
+
+        if accept is not None:
+            accepted = accept(owners, candidates)
+            candidates, owners = candidates[accepted], owners[accepted]
+
+            if not len(owners):
+                return
+
+        candidate_distances = np.zeros(len(candidates))
+
+        for axis, query_axis in zip(self.axes, query_axes):
+            differences = axis[candidates] - query_axis[owners]
+            candidate_distances += differences * differences
+
+        # -- Candidates are grouped per query, so the closest is found without sorting.
+        group_starts = np.flatnonzero(np.concatenate([[True], owners[1:] != owners[:-1]]))
+        group_sizes = np.diff(np.append(group_starts, len(owners)))
+
+        closest = np.minimum.reduceat(candidate_distances, group_starts)
+        first = np.flatnonzero(candidate_distances == np.repeat(closest, group_sizes))
+        first = first[np.searchsorted(first, group_starts)]  # -- First closest per group (ties).
+
+        owners, candidates, candidate_distances = owners[first], candidates[first], np.sqrt(candidate_distances[first])
+        closer = candidate_distances < distances[owners]
+
+        indices[owners[closer]] = candidates[closer]
+        distances[owners[closer]] = candidate_distances[closer]
+
+
+def mirror_map(centroids, axis="x", tolerance=None, grid=None):
+    """Maps every face to its counterpart across the plane perpendicular to the
+    axis and passing through the origin, by looking up the face whose centroid
+    is nearest to the mirrored centroid.
+
+    Args:
+    - centroids (np.ndarray): The (N, 3) face centroids.
+    - axis (str): The mirror axis, one of "x", "y" or "z".
+    - tolerance (float, optional): The maximum distance for a match, defaults to
+    the grid's cell size.
+    - grid (UniformGrid, optional): A prebuilt grid over the centroids.
+
+    Returns:
+    - np.ndarray: The counterpart of every face, -1 where there is none."""
+
+    grid = grid or UniformGrid(centroids)
+
+    mirrored = np.array(centroids, dtype=np.float64)
+    mirrored[:, AXES[axis]] *= -1
+
+    indices, _ = grid.nearest(mirrored, max_distance=tolerance or grid.cell_size)
+    return indices
+
+
+def transfer_map(source_centroids, target_centroids, source_normals=None, target_normals=None, min_dot=None, grid=None):
+    """Maps every target face onto the source face it lies on, by looking up the
+    source face whose centroid is nearest to the target face centroid. Matches
+    can be restricted to faces whose normals agree, which avoids snapping onto
+    nearby but opposite surfaces such as lips or eyelids: the agreeing face is
+    looked for up to AGREEMENT_REACH times farther than the nearest face, and
+    the nearest face is kept when none is found there.
+
+    Args:
+    - source_centroids (np.ndarray): The (S, 3) source face centroids.
+    - target_centroids (np.ndarray): The (T, 3) target face centroids.
+    - source_normals (np.ndarray, optional): The (S, 3) unit source face normals.
+    - target_normals (np.ndarray, optional): The (T, 3) unit target face normals.
+    - min_dot (float, optional): The minimum dot product between matched normals.
+    - grid (UniformGrid, optional): A prebuilt grid over the source centroids.
+
+    Returns:
+    - np.ndarray: The source face index of every target face, -1 only when the
+    source has no face."""
+
+    grid = grid or UniformGrid(source_centroids)
+    indices, distances = grid.nearest(target_centroids)
+
+    if min_dot is None or source_normals is None or target_normals is None:
+        return indices
+
+    source_axes, target_axes = np.ascontiguousarray(np.asarray(source_normals).T), np.ascontiguousarray(np.asarray(target_normals).T)
+
+    def accept(queries, candidates):
+        dots = np.zeros(len(queries))
+
+        for source_axis, target_axis in zip(source_axes, target_axes):
+            dots += source_axis[candidates] * target_axis[queries]
+
+        return dots >= min_dot
+
+    # -- Only the faces whose nearest face disagrees are looked up again.
+    matched = np.flatnonzero(indices >= 0)
+    disagreeing = matched[~accept(matched, indices[matched])]
+
+    def accept_disagreeing(queries, candidates):
+        return accept(disagreeing[queries], candidates)
+
+    max_distance = distances[disagreeing] * AGREEMENT_REACH + grid.cell_size
+    agreeing, _ = grid.nearest(target_centroids[disagreeing], max_distance, accept_disagreeing)
+
+    indices[disagreeing[agreeing >= 0]] = agreeing[agreeing >= 0]
+    return indices
@@ -0,0 +1,279 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from warpaint.core import instrumentation
+from warpaint.core.backend import get_backend
+
+
+APPEND, REPLACE, REMOVE = "append", "replace", "remove"
+SIDE_PREFIXES = {"L_": "R_", "R_": "L_"}
+
+
+def counterpart_name(name):
+    """Retrieves the name of the stroke on the opposite side, e.g. R_eye for
+    L_eye, or None if the name has no side prefix."""
+
+    for prefix, other_prefix in SIDE_PREFIXES.items():
+        if name.startswith(prefix):
+            return f"{other_prefix}{name[len(prefix):]}"
+
+    return None
+
+
+# • ───────────────────────────
+# • ──── Set Operations. ────
+
+
+def to_faces(indices):
+    """Converts face indices into a sorted, unique array, as strokes are stored."""
+
+    return np.unique(np.asarray(indices, dtype=np.int64))
+
+
+def no_faces():
+    return np.empty(0, dtype=np.int64)
+
+
+def union(faces, other):
+    return np.union1d(faces, other)
+
+
+def difference(faces, other):
+    return np.setdiff1d(faces, other, assume_unique=True)
+
+
+def intersection(faces, other):
+    return np.intersect1d(faces, other, assume_unique=True)
+
+
+# • ───────────────────────────
+# • ──── Store. ────
+
+
+@dataclass
+class StrokeRecord:
+    """A stroke of the store. The tool's strokes (model/strokes.py) have the same
+    attributes, along with their colour and settings, and are stored as is."""
+
+    name: str
+    region: str
+    colour_name: str = ""
+    faces: np.ndarray = field(default_factory=no_faces)
+    is_highlighted: bool = True
+    is_deleted: bool = False
+
+    def data(self):
+        return self.name, {"colour_name": self.colour_name, "indices": self.faces.tolist(), "region": self.region}
+
+
+class StrokeStore:
+    """The strokes painted on a mesh, as sorted arrays of face indices, together
+    with their regions. Every paint operation goes through the store, which keeps
+    a face in one stroke at most, displays the changes through the backend and
+    hands them to the recorder, e.g. to make them undoable. Strokes are told apart
+    by identity, as their names may be empty or duplicated while being edited.
+
+    Args:
+    - mesh (str, optional): The name of the painted mesh, set once known.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+    - palette (Callable, optional): Resolves the RGB colour of a stroke, given the
+    stroke, e.g. after its highlight state. Nothing is displayed without one.
+    - recorder (Callable, optional): Called with the store, the stroke, and the
+    faces added to and removed from it, for every change."""
+
+    def __init__(self, mesh=None, backend=None, palette=None, recorder=None):
+        self.mesh = mesh
+        self.backend = backend or get_backend()
+        self.palette = palette
+        self.recorder = recorder
+        self.strokes = []
+
+    # • ───────────────────────────
+    # • ──── Strokes. ────
+
+    def add_stroke(self, stroke):
+        """Adds a stroke and displays its faces, taken as they are.
+
+        Returns:
+        - StrokeRecord: The stroke."""
+
+        stroke.faces, stroke.is_deleted = to_faces(stroke.faces), False
+        self.strokes.append(stroke)
+        self._colour(stroke, stroke.faces)
+
+        return stroke
+
+    def remove_stroke(self, stroke, decolour=True):
+        self.strokes.remove(stroke)
+        stroke.is_deleted = True
+
+        if decolour:
+            self._decolour(stroke.faces)
+
+    def all_strokes(self, region=None):
+        return [stroke for stroke in self.strokes if region is None or stroke.region == region]  # None == All.
+
+    def clear(self, decolour=True):
+        for stroke in list(self.strokes):
+            self.remove_stroke(stroke, decolour)
+
+    # • ───────────────────────────
+    # • ──── Regions. ────
+
+    def regions(self):
+        return list(dict.fromkeys(stroke.region for stroke in self.strokes))
+
+    def rename_region(self, prev_region, new_region):
+        for stroke in self.all_strokes(prev_region):
+            stroke.region = new_region
+
+    def delete_region(self, region):
+        for stroke in self.all_strokes(region):
+            self.remove_stroke(stroke)
+
+    def set_region(self, region):
+        """Highlights the strokes of the region and fades the others, all strokes
+        are highlighted for None."""
+
+        for stroke in self.strokes:
+            stroke.is_highlighted = not region or stroke.region == region
+            self._colour(stroke, stroke.faces)
+
+    # • ───────────────────────────
+    # • ──── Paint. ────
+
+    @instrumentation.traced("store.paint")
+    def paint(self, stroke, faces, mode=APPEND):
+        """Paints faces onto a stroke, removing them from every other stroke.
+
+        Args:
+        - stroke (StrokeRecord): The stroke, ignored when removing.
+        - faces (Sequence[int]): The face indices.
+        - mode (str): APPEND adds the faces to the stroke, REPLACE substitutes
+        them for its faces and REMOVE removes them from all the strokes."""
+
+        faces = to_faces(faces)
+        changes = []
+
+        for other in self.strokes:
+            if other is not stroke or mode == REMOVE:
+                changes.append((other, no_faces(), intersection(other.faces, faces)))
+
+        if mode == REPLACE:
+            changes.append((stroke, difference(faces, stroke.faces), difference(stroke.faces, faces)))
+        elif mode == APPEND:
+            changes.append((stroke, difference(faces, stroke.faces), no_faces()))
+
+        self.apply(changes)
+
+    def remove_faces(self, stroke, faces):
+        """Removes faces from a single stroke, leaving them unpainted."""
+
+        self.apply([(stroke, no_faces(), intersection(stroke.faces, to_faces(faces)))])
+
+    def apply(self, changes, mesh=None, record=True):
+        """Applies membership changes, e.g. when undoing them: colours the faces
+        every stroke gained and decolours those left without a stroke.
+
+        Args:
+        - changes (list[tuple]): The stroke, its added and its removed faces,
+        sorted arrays applied in order.
+        - mesh (str, optional): The mesh of the changes, the store's by default.
+        - record (bool): Whether to hand the changes to the recorder."""
+
+        gained, lost = [], []
+
+        for stroke, added, removed in changes:
+            if not len(added) and not len(removed):
+                continue
+
+            stroke.faces = union(difference(stroke.faces, removed), added)
+
+            if record and self.recorder:
+                self.recorder(self, stroke, added, removed)
+
+            if not stroke.is_deleted:
+                self._colour(stroke, added, mesh)
+
+            gained.append(added)
+            lost.append(removed)
+
+        if lost:
+            self._decolour(difference(to_faces(np.concatenate(lost)), to_faces(np.concatenate(gained))), mesh)
+
+    # • ───────────────────────────
+    # • ──── Queries. ────
+
+    def painted_faces(self, exclude=None):
+        faces = [stroke.faces for stroke in self.strokes if stroke is not exclude]
+        return np.concatenate(faces) if faces else no_faces()
+
+    def vertices(self, stroke):
+        """Retrieves the sorted vertex indices of a stroke's faces."""
+
+        return self.backend.get_topology(self.mesh).face_vertex_indices(stroke.faces)
+
+    def labels(self):
+        """Labels every face with the index of its stroke, in order, -1 for none.
+
+        Returns:
+        - np.ndarray: The label of every face."""
+
+        labels = np.full(self.backend.get_topology(self.mesh).face_count, -1, dtype=np.int64)
+
+        for label, stroke in enumerate(self.strokes):
+            labels[stroke.faces] = label
+
+        return labels
+
+    # • ───────────────────────────
+    # • ──── Display. ────
+
+    def repaint(self, stroke=None):
+        for stroke in [stroke] if stroke else self.strokes:
+            self._colour(stroke, stroke.faces)
+
+    def decolour(self, stroke):
+        self._decolour(stroke.faces)
+
+    def select(self, stroke):
+        self.backend.select_faces(self.mesh, stroke.faces)
+
+    def _colour(self, stroke, faces, mesh=None):
+        mesh = mesh or self.mesh
+
+        if self.palette and mesh and len(faces):
+            self.backend.colour_faces(mesh, faces, self.palette(stroke))
+
+    def _decolour(self, faces, mesh=None):
+        mesh = mesh or self.mesh
+
+        if self.palette and mesh and len(faces):
+            self.backend.decolour_faces(mesh, faces)
+
+    # • ───────────────────────────
+    # • ──── IO. ────
+
+    def data(self):
+        return dict(stroke.data() for stroke in self.strokes)
+
+    @classmethod
+    def from_data(cls, mesh, strokes_data, backend=None, palette=None):
+        """Creates a store from the strokes of a .paint document.
+
+        Args:
+        - mesh (str): The name of the painted mesh.
+        - strokes_data (dict): The strokes data, as exported by the PainterUI.
+        - backend (MeshBackend, optional): The backend, the active one by default.
+        - palette (Callable, optional): Resolves the RGB colour of a stroke.
+
+        Returns:
+        - StrokeStore: The store, with its strokes displayed."""
+
+        store = cls(mesh, backend, palette)
+
+        for name, values in strokes_data.items():
+            store.add_stroke(StrokeRecord(name, values["region"], values.get("colour_name", ""), values["indices"]))
+
+        return store
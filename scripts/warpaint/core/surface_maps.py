@@ -0,0 +1,336 @@
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+
+import numpy as np
+
+from warpaint.core import instrumentation, spatial, topology
+from warpaint.core.backend import get_backend
+
+
+CACHE_DIR = Path.home().joinpath(".warpaint", "surface_maps")
+FILE_EXTENSION = ".npz"
+VERSION = 2  # -- Part of the cache key, so maps built by earlier versions are rebuilt.
+
+
+@dataclass
+class SurfaceMap:
+    """A dense correspondence from the vertices of a target mesh onto the surface
+    of a source mesh: the source triangle every vertex lies on and its
+    barycentric coordinates within it. Any per-vertex data of the source, e.g.
+    skin weights, blendshape deltas or deformer maps, is carried over with
+    SurfaceMap.interpolate."""
+
+    vertices: np.ndarray  # -- The matched target vertices.
+    triangles: np.ndarray  # -- (N, 3) source vertex indices.
+    barycentrics: np.ndarray  # -- (N, 3)
+    constrained: np.ndarray  # -- Whether the vertex was matched within its stroke.
+
+    def interpolate(self, values):
+        """Interpolates per-vertex values of the source, one barycentric corner
+        at a time.
+
+        Args:
+        - values (np.ndarray): The (V, ...) values of the source vertices.
+
+        Returns:
+        - np.ndarray: The (N, ...) values of the matched target vertices."""
+
+        values = np.asarray(values, dtype=np.float64)
+        shape = (-1,) + (1,) * (values.ndim - 1)
+
+        result = values[self.triangles[:, 0]] * self.barycentrics[:, 0].reshape(shape)
+
+        for corner in (1, 2):
+            result += values[self.triangles[:, corner]] * self.barycentrics[:, corner].reshape(shape)
+
+        return result
+
+    def save(self, filepath):
+        np.savez_compressed(
+            filepath,
+            version=VERSION,
+            vertices=self.vertices.astype(np.int32),
+            triangles=self.triangles.astype(np.int32),
+            barycentrics=self.barycentrics.astype(np.float32),
+            constrained=self.constrained,
+        )
+
+    @classmethod
+    def load(cls, filepath):
+        with np.load(filepath) as content:
+            if int(content["version"]) > VERSION:
+                raise ValueError(f"Unsupported surface map version: {int(content['version'])}.")
+
+            triangles, barycentrics = content["triangles"].astype(np.int64), content["barycentrics"].astype(np.float64)
+            return cls(content["vertices"].astype(np.int64), triangles, barycentrics, content["constrained"])
+
+
+# • ───────────────────────────
+# • ──── Building. ────
+
+
+@instrumentation.traced("surface_maps.get")
+def get_surface_map(source_mesh, target_mesh, source_strokes, target_strokes, directory=None, backend=None):
+    """Retrieves the surface map between two meshes, from memory, then from the
+    cache directory, building and storing it otherwise. Maps are keyed by the
+    topology and points of both meshes and by their matching strokes, thus any
+    edit invalidates them.
+
+    Args:
+    - source_mesh (str): The name of the source mesh.
+    - target_mesh (str): The name of the target mesh.
+    - source_strokes (dict): The strokes data of the source mesh.
+    - target_strokes (dict): The strokes data of the target mesh, matched by name.
+    - directory (Path/str, optional): The cache directory, CACHE_DIR by default.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - SurfaceMap: The map."""
+
+    backend = backend or get_backend()
+    key = map_key(source_mesh, target_mesh, source_strokes, target_strokes, backend)
+    filepath = Path(directory or CACHE_DIR).joinpath(f"{key}{FILE_EXTENSION}")
+
+    def build():
+        if filepath.exists():
+            return SurfaceMap.load(filepath)
+
+        surface_map = build_surface_map(source_mesh, target_mesh, source_strokes, target_strokes, backend)
+
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        surface_map.save(filepath)
+
+        return surface_map
+
+    return spatial.cached(("surface_map", key), build)
+
+
+def map_key(source_mesh, target_mesh, source_strokes, target_strokes, backend=None):
+    """Computes the MD5 hash identifying the surface map between two meshes.
+
+    Args:
+    - source_mesh (str): The name of the source mesh.
+    - target_mesh (str): The name of the target mesh.
+    - source_strokes (dict): The strokes data of the source mesh.
+    - target_strokes (dict): The strokes data of the target mesh.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - str: The key."""
+
+    backend = backend or get_backend()
+    hasher = hashlib.md5(str(VERSION).encode("utf-8"))
+
+    for mesh in (source_mesh, target_mesh):
+        hasher.update(backend.get_topology(mesh).fingerprint.encode("utf-8"))
+        hasher.update(spatial.points_fingerprint(backend.get_points(mesh, world=True)).encode("utf-8"))
+
+    for name in matching_strokes(source_strokes, target_strokes):
+        hasher.update(name.encode("utf-8"))
+        hasher.update(np.asarray(source_strokes[name]["indices"], dtype=np.int32).tobytes())
+        hasher.update(np.asarray(target_strokes[name]["indices"], dtype=np.int32).tobytes())
+
+    return hasher.hexdigest()
+
+
+def matching_strokes(source_strokes, target_strokes):
+    """The names of the strokes painted on both meshes, in the source's order."""
+
+    return [name for name, values in source_strokes.items() if len(values["indices"]) and len(target_strokes.get(name, {}).get("indices", []))]
+
+
+@instrumentation.traced("surface_maps.build")
+def build_surface_map(source_mesh, target_mesh, source_strokes, target_strokes, backend=None):
+    """Maps the vertices of the target mesh onto the surface of the source mesh,
+    treating matching strokes as matched patches: the vertices of a target
+    stroke are carried into the bounding box of the source stroke with the same
+    name, then only look up its triangles, so that nothing bleeds across
+    strokes, e.g. from the upper lip onto the lower one, even when the
+    proportions differ. Vertices outside of any matching stroke look up the
+    whole source mesh in world space. Every lookup is vectorized: the triangle
+    whose centroid is nearest, then the closest point within it. Every vertex is
+    mapped, however far it is from the source: a ValueError is raised otherwise,
+    i.e. when the source has no face, and nothing is cached.
+
+    Args:
+    - source_mesh (str): The name of the source mesh.
+    - target_mesh (str): The name of the target mesh.
+    - source_strokes (dict): The strokes data of the source mesh.
+    - target_strokes (dict): The strokes data of the target mesh, matched by name.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - SurfaceMap: The map."""
+
+    backend = backend or get_backend()
+
+    source_topology, source_points = backend.get_topology(source_mesh), backend.get_points(source_mesh, world=True)
+    target_topology, target_points = backend.get_topology(target_mesh), backend.get_points(target_mesh, world=True)
+
+    names = matching_strokes(source_strokes, target_strokes)
+    source_labels = face_labels(source_topology.face_count, [source_strokes[name]["indices"] for name in names])
+    target_labels = vertex_labels(target_topology, [target_strokes[name]["indices"] for name in names])
+
+    triangle_faces, triangles = source_topology.triangles()
+    triangle_labels = source_labels[triangle_faces]
+    centroids = source_points[triangles].mean(axis=1)
+
+    nearest = np.full(target_topology.vertex_count, -1, dtype=np.int64)
+    queries = target_points.copy()
+    label_triangles = topology.split_labels(triangle_labels, len(names))
+
+    for label, vertices in enumerate(topology.split_labels(target_labels, len(names))):
+        candidates = label_triangles[label]
+
+        if not len(vertices) or not len(candidates):
+            continue
+
+        # -- Bounded by all the vertices of the stroke's faces, on both sides.
+        bounds = _bounds(target_points[target_topology.face_vertex_indices(target_strokes[names[label]]["indices"])])
+        source_bounds = _bounds(source_points[source_topology.face_vertex_indices(source_strokes[names[label]]["indices"])])
+
+        queries[vertices] = fit_points(target_points[vertices], bounds, source_bounds)
+        indices, _ = spatial.UniformGrid(centroids[candidates]).nearest(queries[vertices])
+
+        found = indices >= 0
+        nearest[vertices[found]] = candidates[indices[found]]
+
+    constrained = nearest >= 0
+    free = np.flatnonzero(~constrained)
+
+    if len(free):
+        queries[free] = target_points[free]
+        nearest[free], _ = spatial.UniformGrid(centroids).nearest(queries[free])
+
+    unmapped = np.count_nonzero(nearest < 0)
+
+    if unmapped:
+        raise ValueError(f"{unmapped} of the {len(nearest)} vertices of '{target_mesh}' cannot be mapped onto '{source_mesh}'.")
+
+    vertices = np.arange(len(nearest))
+    corners = triangles[nearest]
+    barycentrics = closest_barycentrics(queries[vertices], *(source_points[corners[:, corner]] for corner in range(3)))
+
+    return SurfaceMap(vertices, corners, barycentrics, constrained[vertices])
+
+
+def fit_points(points, bounds, reference_bounds):
+    """Carries points from a bounding box into another, axis by axis. Axes along
+    which the box is flat are only translated.
+
+    Args:
+    - points (np.ndarray): The (N, 3) points to carry.
+    - bounds (tuple[np.ndarray, np.ndarray]): The (low, high) corners of their box.
+    - reference_bounds (tuple[np.ndarray, np.ndarray]): The corners of the box to fit.
+
+    Returns:
+    - np.ndarray: The (N, 3) fitted points."""
+
+    (low, high), (reference_low, reference_high) = bounds, reference_bounds
+
+    sizes, reference_sizes = high - low, reference_high - reference_low
+    is_flat = sizes <= 1e-6 * max(sizes.max(), 1e-12)
+    scales = np.where(is_flat, 1, reference_sizes / np.where(is_flat, 1, sizes))
+
+    centres, reference_centres = (low + high) / 2, (reference_low + reference_high) / 2
+    return reference_centres + (points - centres) * scales
+
+
+def _bounds(points):
+    return points.min(axis=0), points.max(axis=0)
+
+
+# • ───────────────────────────
+# • ──── Utils. ────
+
+
+def face_labels(face_count, groups):
+    """Labels every face with the index of the group it belongs to.
+
+    Args:
+    - face_count (int): The number of faces.
+    - groups (list[Sequence[int]]): The face indices of every group.
+
+    Returns:
+    - np.ndarray: The label of every face, -1 for none."""
+
+    labels = np.full(face_count, -1, dtype=np.int64)
+
+    for label, faces in enumerate(groups):
+        labels[np.asarray(faces, dtype=np.int64)] = label
+
+    return labels
+
+
+def vertex_labels(mesh_topology, groups):
+    """Labels every vertex with the group of the faces around it, the highest
+    one for vertices on the border between groups.
+
+    Args:
+    - mesh_topology (topology.Topology): The topology of the mesh.
+    - groups (list[Sequence[int]]): The face indices of every group.
+
+    Returns:
+    - np.ndarray: The label of every vertex, -1 for none."""
+
+    corner_labels = np.repeat(face_labels(mesh_topology.face_count, groups), mesh_topology.face_counts)
+
+    labels = np.full(mesh_topology.vertex_count, -1, dtype=np.int64)
+    np.maximum.at(labels, mesh_topology.face_vertices, corner_labels)
+
+    return labels
+
+
+def closest_barycentrics(points, a, b, c):
+    """Computes the barycentric coordinates of the closest point of every
+    triangle to every point, all at once: the projection onto the plane of the
+    triangle when it falls inside, the closest point of its edges otherwise.
+
+    Args:
+    - points (np.ndarray): The (N, 3) points.
+    - a, b, c (np.ndarray): The (N, 3) corners of the triangles.
+
+    Returns:
+    - np.ndarray: The (N, 3) barycentric coordinates, along a, b and c."""
+
+    ab, ac, ap = b - a, c - a, points - a
+    d00, d01, d11 = (ab * ab).sum(axis=1), (ab * ac).sum(axis=1), (ac * ac).sum(axis=1)
+    d20, d21 = (ap * ab).sum(axis=1), (ap * ac).sum(axis=1)
+
+    denominators = d00 * d11 - d01 * d01
+    safe = np.where(np.abs(denominators) > 1e-20, denominators, 1)
+
+    v, w = (d11 * d20 - d01 * d21) / safe, (d00 * d21 - d01 * d20) / safe
+    barycentrics = np.stack([1 - v - w, v, w], axis=1)
+
+    outside = np.flatnonzero((barycentrics < 0).any(axis=1) | (np.abs(denominators) <= 1e-20))
+
+    if not len(outside):
+        return barycentrics
+
+    # -- The closest point of each edge, then the closest of the three edges.
+    corners = np.stack([a[outside], b[outside], c[outside]], axis=1)
+    edges = [(0, 1), (1, 2), (2, 0)]
+
+    edge_distances, edge_parameters = np.empty((len(outside), 3)), np.empty((len(outside), 3))
+
+    for edge, (start, end) in enumerate(edges):
+        direction = corners[:, end] - corners[:, start]
+        lengths = (direction * direction).sum(axis=1)
+
+        parameters = ((points[outside] - corners[:, start]) * direction).sum(axis=1) / np.where(lengths > 0, lengths, 1)
+        parameters = np.clip(parameters, 0, 1)
+
+        closest = corners[:, start] + direction * parameters[:, None]
+        edge_distances[:, edge], edge_parameters[:, edge] = ((points[outside] - closest) ** 2).sum(axis=1), parameters
+
+    best = edge_distances.argmin(axis=1)
+    parameters = edge_parameters[np.arange(len(outside)), best]
+    starts, ends = np.array(edges)[best].T
+
+    barycentrics[outside] = 0
+    barycentrics[outside, starts] = 1 - parameters
+    barycentrics[outside, ends] = parameters
+
+    return barycentrics
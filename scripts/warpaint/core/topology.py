@@ -0,0 +1,651 @@
+from collections import OrderedDict
+import base64, hashlib, zlib
+
+import numpy as np
+
+
+CACHE_SIZE = 4
+MASK_RATIO = 4  # -- Unique values are found through a mask past size / MASK_RATIO values, by sorting otherwise.
+
+_TOPOLOGIES = OrderedDict()
+
+
+def fingerprint(face_counts, face_vertices):
+    """Computes a fingerprint of the mesh topology, namely the number of vertices
+    per face and the face-vertex connections, in the order they are stored.
+
+    Args:
+    - face_counts (np.ndarray): The number of vertices of each face.
+    - face_vertices (np.ndarray): The flattened vertex indices of all faces.
+
+    Returns:
+    - str: The MD5 hash of the topology."""
+
+    hasher = hashlib.md5()
+    hasher.update(np.ascontiguousarray(face_counts, dtype=np.int32).tobytes())
+    hasher.update(np.ascontiguousarray(face_vertices, dtype=np.int32).tobytes())
+    return hasher.hexdigest()
+
+
+def get_topology(face_counts, face_vertices):
+    """Retrieves the Topology for the given face-vertex connections. Topologies
+    are cached per fingerprint, so the adjacency structures are only built once
+    for every mesh, regardless of how many operations are run on it.
+
+    Args:
+    - face_counts (Sequence[int]): The number of vertices of each face.
+    - face_vertices (Sequence[int]): The flattened vertex indices of all faces.
+
+    Returns:
+    - Topology: The (cached) topology."""
+
+    face_counts = np.asarray(face_counts, dtype=np.int64)
+    face_vertices = np.asarray(face_vertices, dtype=np.int64)
+    key = fingerprint(face_counts, face_vertices)
+
+    if key in _TOPOLOGIES:
+        _TOPOLOGIES.move_to_end(key)
+        return _TOPOLOGIES[key]
+
+    topology = Topology(face_counts, face_vertices, key)
+    _TOPOLOGIES[key] = topology
+
+    while len(_TOPOLOGIES) > CACHE_SIZE:
+        _TOPOLOGIES.popitem(last=False)
+
+    return topology
+
+
+def clear_cache():
+    _TOPOLOGIES.clear()
+
+
+class Topology:
+    """Face-vertex connections of a mesh together with lazily built adjacency
+    structures, stored in CSR form (offsets, indices): the neighbours of face i
+    are indices[offsets[i]:offsets[i + 1]]. All the operations work on integer
+    arrays of face indices and are vectorized over the whole mesh."""
+
+    def __init__(self, face_counts, face_vertices, key=None):
+        self.face_counts = face_counts
+        self.face_vertices = face_vertices
+        self.face_offsets = np.concatenate([[0], np.cumsum(face_counts)])
+        self.vertex_count = int(face_vertices.max()) + 1 if len(face_vertices) else 0
+        self.fingerprint = key or fingerprint(face_counts, face_vertices)
+
+        self._face_adjacency = None
+        self._face_rows = None
+        self._half_edge_twins = None
+        self._vertex_adjacency = None
+        self._vertex_faces = None
+
+    @property
+    def face_count(self):
+        return len(self.face_counts)
+
+    # • ───────────────────────────
+    # • ──── Adjacency. ────
+
+    @property
+    def face_adjacency(self):
+        """The faces sharing an edge with each face, as (offsets, indices)."""
+
+        if self._face_adjacency is None:
+            self._face_adjacency = self._build_face_adjacency()
+
+        return self._face_adjacency
+
+    def _build_face_adjacency(self):
+        face_ids, edge_keys = self._face_edges()
+
+        order = np.argsort(edge_keys, kind="stable")
+        sorted_keys, sorted_faces = edge_keys[order], face_ids[order]
+
+        # -- Pair every face of an edge with the first face on that edge and with
+        # -- its predecessor, which covers manifold and non-manifold edges alike.
+        is_start = np.concatenate([[True], sorted_keys[1:] != sorted_keys[:-1]])
+        group_start = np.maximum.accumulate(np.where(is_start, np.arange(len(sorted_keys)), 0))
+
+        source = np.concatenate([sorted_faces[group_start], sorted_faces[:-1][~is_start[1:]]])
+        target = np.concatenate([sorted_faces, sorted_faces[1:][~is_start[1:]]])
+
+        return _to_csr(source, target, self.face_count)
+
+    def _face_edges(self):
+        """Retrieves every face edge as (face index, undirected edge key)."""
+
+        start, end = self.face_vertices, self.face_vertices[self._next_corners()]
+        low, high = np.minimum(start, end), np.maximum(start, end)
+
+        face_ids = np.repeat(np.arange(self.face_count), self.face_counts)
+        return face_ids, low * self.vertex_count + high
+
+    @property
+    def vertex_adjacency(self):
+        """The vertices sharing an edge with each vertex, as (offsets, indices)."""
+
+        if self._vertex_adjacency is None:
+            _, edge_keys = self._face_edges()
+            edge_keys = _unique(edge_keys)
+            self._vertex_adjacency = _to_csr(edge_keys // self.vertex_count, edge_keys % self.vertex_count, self.vertex_count)
+
+        return self._vertex_adjacency
+
+    @property
+    def vertex_faces(self):
+        """The faces around each vertex, as (offsets, indices): the transpose of
+        the face-vertex connections (face_offsets, face_vertices)."""
+
+        if self._vertex_faces is None:
+            offsets = np.zeros(self.vertex_count + 1, dtype=np.int64)
+            np.cumsum(np.bincount(self.face_vertices, minlength=self.vertex_count), out=offsets[1:])
+
+            order = np.argsort(self.face_vertices, kind="stable")
+            self._vertex_faces = offsets, self.corner_faces[order]
+
+        return self._vertex_faces
+
+    def vertex_neighbours(self, vertices):
+        """Retrieves the neighbours of every given vertex, one pair per edge.
+
+        Args:
+        - vertices (np.ndarray): The vertex indices, duplicates allowed.
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray]: The position in vertices and the
+        neighbouring vertex of every pair."""
+
+        offsets, indices = self.vertex_adjacency
+        vertices = np.asarray(vertices, dtype=np.int64)
+
+        owners = np.repeat(np.arange(len(vertices)), offsets[vertices + 1] - offsets[vertices])
+        return owners, indices[_expand_ranges(offsets, vertices)]
+
+    @property
+    def face_rows(self):
+        """The source face of every entry of the face adjacency indices."""
+
+        if self._face_rows is None:
+            offsets, _ = self.face_adjacency
+            self._face_rows = np.repeat(np.arange(self.face_count), np.diff(offsets))
+
+        return self._face_rows
+
+    @property
+    def corner_faces(self):
+        """The face of every face-vertex (corner), i.e. of every half-edge."""
+
+        return np.repeat(np.arange(self.face_count), self.face_counts)
+
+    @property
+    def half_edge_twins(self):
+        """The opposite half-edge of every half-edge, -1 on the border. Half-edge
+        i goes from face_vertices[i] to the next vertex of the same face."""
+
+        if self._half_edge_twins is None:
+            start, end = self.face_vertices, self.face_vertices[self._next_corners()]
+            keys, twin_keys = start * self.vertex_count + end, end * self.vertex_count + start
+
+            order = np.argsort(keys, kind="stable")
+            positions = np.minimum(np.searchsorted(keys[order], twin_keys), len(keys) - 1)
+
+            found = keys[order][positions] == twin_keys
+            self._half_edge_twins = np.where(found, order[positions], -1)
+
+        return self._half_edge_twins
+
+    def _next_corners(self):
+        next_corners = np.arange(1, len(self.face_vertices) + 1)
+        next_corners[self.face_offsets[1:] - 1] = self.face_offsets[:-1]
+        return next_corners
+
+    def neighbours(self, faces):
+        """Retrieves the unique faces sharing an edge with any of the given faces.
+
+        Args:
+        - faces (np.ndarray): The face indices.
+
+        Returns:
+        - np.ndarray: The neighbouring face indices (may include the given faces)."""
+
+        offsets, indices = self.face_adjacency
+        return _unique(indices[_expand_ranges(offsets, faces)])
+
+    def face_centroids(self, points):
+        """Computes the centroid of every face as the average of its vertices.
+
+        Args:
+        - points (np.ndarray): The (V, 3) vertex positions.
+
+        Returns:
+        - np.ndarray: The (F, 3) face centroids."""
+
+        sums = np.add.reduceat(np.asarray(points)[self.face_vertices], self.face_offsets[:-1], axis=0)
+        return sums / self.face_counts[:, None]
+
+    def newell_vectors(self, points):
+        """Computes the Newell vector of every face, the sum of the cross products
+        of its consecutive vertices: its direction is the face normal, robust for
+        non-planar n-gons, and its length twice the face area. Computed one axis
+        at a time on contiguous arrays, which is much faster than np.cross.
+
+        Args:
+        - points (np.ndarray): The (V, 3) vertex positions.
+
+        Returns:
+        - np.ndarray: The (F, 3) Newell vectors."""
+
+        points = np.asarray(points, dtype=np.float64)
+        next_corners = self._next_corners()
+
+        x, y, z = (points[:, axis][self.face_vertices] for axis in range(3))
+        next_x, next_y, next_z = x[next_corners], y[next_corners], z[next_corners]
+
+        crosses = [y * next_z - z * next_y, z * next_x - x * next_z, x * next_y - y * next_x]
+        return np.stack([np.add.reduceat(cross, self.face_offsets[:-1]) for cross in crosses], axis=1)
+
+    def face_normals(self, points, newell_vectors=None):
+        """Computes the unit normal of every face with Newell's method.
+
+        Args:
+        - points (np.ndarray): The (V, 3) vertex positions.
+        - newell_vectors (np.ndarray, optional): The Newell vectors, if already computed.
+
+        Returns:
+        - np.ndarray: The (F, 3) unit face normals."""
+
+        normals = self.newell_vectors(points) if newell_vectors is None else newell_vectors
+        lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+        return normals / np.where(lengths > 0, lengths, 1)
+
+    def face_areas(self, points, newell_vectors=None):
+        """Computes the area of every face, half the length of its Newell vector.
+
+        Args:
+        - points (np.ndarray): The (V, 3) vertex positions.
+        - newell_vectors (np.ndarray, optional): The Newell vectors, if already computed.
+
+        Returns:
+        - np.ndarray: The (F,) face areas."""
+
+        normals = self.newell_vectors(points) if newell_vectors is None else newell_vectors
+        return np.linalg.norm(normals, axis=1) / 2
+
+    def face_corners(self, faces):
+        """Retrieves the corners (positions in face_vertices) of the given faces.
+
+        Args:
+        - faces (np.ndarray): The face indices.
+
+        Returns:
+        - np.ndarray: The corners, face after face."""
+
+        return _expand_ranges(self.face_offsets, faces)
+
+    def face_vertex_indices(self, faces):
+        """Retrieves the unique vertices of the given faces.
+
+        Args:
+        - faces (np.ndarray): The face indices.
+
+        Returns:
+        - np.ndarray: The sorted vertex indices."""
+
+        return _unique_within(self.face_vertices[self.face_corners(faces)], self.vertex_count)
+
+    def vertex_face_indices(self, vertices):
+        """Retrieves the unique faces around the given vertices.
+
+        Args:
+        - vertices (np.ndarray): The vertex indices.
+
+        Returns:
+        - np.ndarray: The sorted face indices."""
+
+        offsets, indices = self.vertex_faces
+        return _unique_within(indices[_expand_ranges(offsets, vertices)], self.face_count)
+
+    def triangles(self, faces=None):
+        """Fans the given faces into triangles around their first vertex.
+
+        Args:
+        - faces (np.ndarray, optional): The face indices, all of them by default.
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray]: The face of every triangle and the (T, 3)
+        vertex indices of the triangles."""
+
+        triangle_faces, corners = self.triangle_corners(faces)
+        return triangle_faces, self.face_vertices[corners]
+
+    def triangle_corners(self, faces=None):
+        """Fans the given faces into triangles, as corners rather than vertices,
+        so that per-corner data such as UVs can be looked up (see triangles).
+
+        Returns:
+        - tuple[np.ndarray, np.ndarray]: The face of every triangle and the (T, 3)
+        corners of the triangles."""
+
+        faces = np.arange(self.face_count) if faces is None else np.asarray(faces, dtype=np.int64)
+        fan_counts = np.maximum(self.face_counts[faces] - 2, 0)
+
+        triangle_faces = np.repeat(faces, fan_counts)
+        fan_indices = np.arange(fan_counts.sum()) - np.repeat(np.cumsum(fan_counts) - fan_counts, fan_counts)
+
+        first = self.face_offsets[triangle_faces]
+        return triangle_faces, np.stack([first, first + fan_indices + 1, first + fan_indices + 2], axis=1)
+
+    # • ───────────────────────────
+    # • ──── Operations. ────
+
+    def grow(self, faces, steps=1, blocked=None):
+        """Grows the faces by a number of rings.
+
+        Args:
+        - faces (np.ndarray): The face indices to grow.
+        - steps (int): The number of rings to grow by.
+        - blocked (np.ndarray, optional): Face indices the growth cannot enter.
+
+        Returns:
+        - np.ndarray: The sorted face indices of the grown set."""
+
+        mask = self.to_mask(faces)
+        blocked_mask = self.to_mask(blocked)
+        frontier = np.flatnonzero(mask)
+
+        for _ in range(steps):
+            candidates = self.neighbours(frontier)
+            frontier = candidates[~mask[candidates] & ~blocked_mask[candidates]]
+
+            if not len(frontier):
+                break
+
+            mask[frontier] = True
+
+        return np.flatnonzero(mask)
+
+    def shrink(self, faces, steps=1):
+        """Shrinks the faces by a number of rings, removing those on the border.
+
+        Args:
+        - faces (np.ndarray): The face indices to shrink.
+        - steps (int): The number of rings to shrink by.
+
+        Returns:
+        - np.ndarray: The sorted face indices of the shrunk set."""
+
+        mask = self.to_mask(faces)
+
+        for _ in range(steps):
+            border = self.border(np.flatnonzero(mask))
+
+            if not len(border):
+                break
+
+            mask[border] = False
+
+        return np.flatnonzero(mask)
+
+    def border(self, faces):
+        """Retrieves the inner border ring, i.e. the given faces that share an edge
+        with a face outside of the set.
+
+        Args:
+        - faces (np.ndarray): The face indices.
+
+        Returns:
+        - np.ndarray: The sorted face indices of the border ring."""
+
+        offsets, indices = self.face_adjacency
+        mask = self.to_mask(faces)
+        faces = np.flatnonzero(mask)
+
+        entries = _expand_ranges(offsets, faces)
+        rows = np.repeat(faces, np.diff(offsets)[faces])
+
+        return _unique(rows[~mask[indices[entries]]])
+
+    def boundary_loops(self, faces):
+        """Retrieves the boundary of a set of faces as loops of vertices, ordered
+        along the winding of the faces: the half-edges of the set whose twin lies
+        outside of it, or on the border of the mesh, chained end to start. A
+        vertex pinched between two boundary loops ends up in only one of them.
+
+        Args:
+        - faces (np.ndarray): The face indices.
+
+        Returns:
+        - list[np.ndarray]: The vertex indices of every loop, longest first."""
+
+        mask = self.to_mask(faces)
+        corners = self.face_corners(np.flatnonzero(mask))
+        twins = self.half_edge_twins[corners]
+
+        is_boundary = twins < 0
+        twin_faces = np.searchsorted(self.face_offsets, twins[~is_boundary], side="right") - 1
+        is_boundary[~is_boundary] = ~mask[twin_faces]
+
+        corners = corners[is_boundary]
+        corner_faces = np.searchsorted(self.face_offsets, corners, side="right") - 1
+        next_corners = np.where(corners + 1 == self.face_offsets[corner_faces + 1], self.face_offsets[corner_faces], corners + 1)
+
+        following = dict(zip(self.face_vertices[corners].tolist(), self.face_vertices[next_corners].tolist()))
+        loops = []
+
+        while following:
+            start = next(iter(following))
+            loop, vertex = [start], following.pop(start)
+
+            while vertex != start and vertex in following:
+                loop.append(vertex)
+                vertex = following.pop(vertex)
+
+            loops.append(np.array(loop, dtype=np.int64))
+
+        return sorted(loops, key=len, reverse=True)
+
+    def flood_fill(self, seeds, blocked=None):
+        """Floods the mesh from the seeds until it reaches the blocked faces, e.g.
+        the painted boundary, or the end of the shell.
+
+        Args:
+        - seeds (np.ndarray): The face indices to start from.
+        - blocked (np.ndarray, optional): Face indices acting as boundary.
+
+        Returns:
+        - np.ndarray: The sorted face indices of the filled area (blocked excluded)."""
+
+        blocked_mask = self.to_mask(blocked)
+        seeds = np.asarray(seeds, dtype=np.int64)
+        seeds = seeds[~blocked_mask[seeds]]
+
+        return self.grow(seeds, steps=self.face_count, blocked=blocked)
+
+    # • ───────────────────────────
+    # • ──── Islands. ────
+
+    def components(self, labels):
+        """Labels the connected components of faces sharing the same label, e.g.
+        the index of the stroke they belong to, all labels in one pass. Uses a
+        vectorized union-find: roots are hooked onto the smaller root across
+        every edge, followed by pointer jumping, until no edge spans two roots.
+
+        Args:
+        - labels (np.ndarray): The label of every face, negative for none.
+
+        Returns:
+        - np.ndarray: The component root of every face (itself if unlabelled)."""
+
+        _, indices = self.face_adjacency
+        rows = self.face_rows
+
+        keep = (labels[rows] == labels[indices]) & (labels[rows] >= 0) & (rows < indices)
+        source, target = rows[keep], indices[keep]
+        roots = np.arange(self.face_count)
+
+        while True:
+            source_roots, target_roots = roots[source], roots[target]
+            spanning = source_roots != target_roots
+
+            if not spanning.any():
+                break
+
+            source, target = source[spanning], target[spanning]
+            source_roots, target_roots = source_roots[spanning], target_roots[spanning]
+
+            low, high = np.minimum(source_roots, target_roots), np.maximum(source_roots, target_roots)
+            np.minimum.at(roots, high, low)
+
+            while True:
+                jumped = roots[roots]
+
+                if np.array_equal(jumped, roots):
+                    break
+
+                roots = jumped
+
+        return roots
+
+    def islands(self, labels):
+        """Retrieves the islands of every label, largest first.
+
+        Args:
+        - labels (np.ndarray): The label of every face, negative for none.
+
+        Returns:
+        - dict[int, list[np.ndarray]]: The face indices of each island per label."""
+
+        roots = self.components(labels)
+        faces = np.flatnonzero(labels >= 0)
+
+        order = np.lexsort((roots[faces], labels[faces]))
+        faces = faces[order]
+
+        face_labels, face_roots = labels[faces], roots[faces]
+        splits = np.flatnonzero((face_labels[1:] != face_labels[:-1]) | (face_roots[1:] != face_roots[:-1])) + 1
+
+        islands = {}
+
+        for island in np.split(faces, splits) if len(faces) else []:
+            islands.setdefault(int(labels[island[0]]), []).append(island)
+
+        for label_islands in islands.values():
+            label_islands.sort(key=len, reverse=True)
+
+        return islands
+
+    # • ───────────────────────────
+    # • ──── IO. ────
+
+    def data(self):
+        """Serializes the face-vertex connections into a compact, JSON friendly
+        form: delta encoded, deflated and base64 encoded int32 arrays."""
+
+        return {"face_counts": _encode(self.face_counts), "face_vertices": _encode(self.face_vertices)}
+
+    # • ───────────────────────────
+    # • ──── Utils. ────
+
+    def to_labels(self, groups):
+        """Converts groups of face indices into a per-face label array, where
+        faces of the n-th group are labelled n and the rest -1."""
+
+        labels = np.full(self.face_count, -1, dtype=np.int64)
+
+        for label, faces in enumerate(groups):
+            labels[np.asarray(faces, dtype=np.int64)] = label
+
+        return labels
+
+    def to_mask(self, faces=None):
+        mask = np.zeros(self.face_count, dtype=bool)
+
+        if faces is not None and len(faces):
+            mask[np.asarray(faces, dtype=np.int64)] = True
+
+        return mask
+
+
+def from_data(data):
+    """Deserializes a Topology from Topology.data().
+
+    Args:
+    - data (dict): The serialized face-vertex connections.
+
+    Returns:
+    - Topology: The (cached) topology."""
+
+    return get_topology(_decode(data["face_counts"]), _decode(data["face_vertices"]))
+
+
+def _encode(values):
+    deltas = np.diff(np.asarray(values, dtype=np.int64), prepend=0).astype(np.int32)
+    return base64.b64encode(zlib.compress(deltas.tobytes())).decode("ascii")
+
+
+def _decode(text):
+    deltas = np.frombuffer(zlib.decompress(base64.b64decode(text)), dtype=np.int32)
+    return np.cumsum(deltas, dtype=np.int64)
+
+
+def split_labels(labels, count):
+    """Splits a per-face label array into the sorted face indices of every label.
+
+    Args:
+    - labels (np.ndarray): The label of every face, negative for none.
+    - count (int): The number of labels.
+
+    Returns:
+    - list[np.ndarray]: The face indices of labels 0 to count - 1."""
+
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(count + 1))
+
+    return [order[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def _unique(values):
+    """Sort based np.unique, which is considerably faster on large integer arrays."""
+
+    values = np.sort(values)
+    return values[np.concatenate([[True], values[1:] != values[:-1]])] if len(values) else values
+
+
+def _unique_within(values, size):
+    """Unique values from 0 to size - 1, through a mask when there are many of
+    them, which is linear rather than sorting."""
+
+    if len(values) * MASK_RATIO < size:
+        return _unique(values)
+
+    mask = np.zeros(size, dtype=bool)
+    mask[values] = True
+
+    return np.flatnonzero(mask)
+
+
+def _expand_ranges(offsets, rows):
+    """Retrieves the positions of all CSR entries belonging to the given rows, as
+    one flat array without a Python loop over the rows."""
+
+    rows = np.asarray(rows, dtype=np.int64)
+    starts, counts = offsets[rows], offsets[rows + 1] - offsets[rows]
+
+    total = counts.sum()
+    shifts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+    return np.arange(total) + shifts
+
+
+def _to_csr(source, target, size):
+    """Builds a symmetric, deduplicated CSR adjacency from (source, target) pairs."""
+
+    source, target = np.concatenate([source, target]), np.concatenate([target, source])
+    valid = source != target
+
+    pairs = _unique(source[valid] * size + target[valid])
+    rows, indices = pairs // size, pairs % size
+
+    offsets = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=size), out=offsets[1:])
+
+    return offsets, indices
@@ -0,0 +1,42 @@
+import numpy as np
+
+from warpaint.core import instrumentation, surface_maps
+
+
+class WeightMap(surface_maps.SurfaceMap):
+    """A surface map carrying weights: interpolated rows are renormalized."""
+
+    def apply(self, weights):
+        """Interpolates per-vertex weights, e.g. skin weights, from the source
+        vertices. Rows are renormalized so that they sum to 1, unless they are
+        all zero.
+
+        Args:
+        - weights (np.ndarray): The (V, I) weights of the source vertices.
+
+        Returns:
+        - np.ndarray: The (N, I) weights of the matched target vertices."""
+
+        result = self.interpolate(weights)
+        sums = result.sum(axis=1, keepdims=True)
+
+        return np.divide(result, sums, out=result, where=sums > 0)
+
+
+@instrumentation.traced("weights.build_map")
+def build_weight_map(source_mesh, target_mesh, source_strokes, target_strokes, backend=None):
+    """Maps the vertices of the target mesh onto the surface of the source mesh,
+    stroke by stroke (see surface_maps.build_surface_map). The map is cached.
+
+    Args:
+    - source_mesh (str): The name of the source mesh.
+    - target_mesh (str): The name of the target mesh.
+    - source_strokes (dict): The strokes data of the source mesh.
+    - target_strokes (dict): The strokes data of the target mesh, matched by name.
+    - backend (MeshBackend, optional): The backend, the active one by default.
+
+    Returns:
+    - WeightMap: The map, see WeightMap.apply."""
+
+    surface_map = surface_maps.get_surface_map(source_mesh, target_mesh, source_strokes, target_strokes, backend=backend)
+    return WeightMap(surface_map.vertices, surface_map.triangles, surface_map.barycentrics, surface_map.constrained)
@@ -1,9 +1,21 @@
 from maya import cmds
 from maya.api import OpenMaya as om2
+from maya.api import OpenMayaUI as omui2
+import numpy as np
 import re
 
+from warpaint.core import backend, instrumentation, topology
+
 
 INDEX_PATTERN = r"(.*)\[(\d+)\]"
+MAX_RAY_PARAM = 1e6
+COLOUR_SET = "warPaintColours"
+TAG_ATTRIBUTE = "warPaint"
+
+_COLOUR_TARGETS = {}  # -- Mesh: (shape, colour target), for every mesh War Paint coloured.
+_COLOUR_NODES = {}  # -- Mesh: the polyColorPerVertex nodes War Paint created in its history.
+_DISPLAY_COLOURS = {}  # -- Shape: its displayColors before War Paint coloured it.
+_POINT_ARRAYS = {}  # -- Mesh: the MPointArray last written by set_points with indices, updated in place.
 
 
 def get_node(item):
@@ -28,6 +40,31 @@ def get_index(item):
     raise ValueError(f"Invalid index pattern: {item}")
 
 
+def get_indices(items):
+    """Retrieves the indices of many items such as vertices or faces at once.
+
+    Args:
+    - items (Iterable[str]): the items as strings.
+
+    Returns:
+    - np.ndarray: the stripped indices, in the order of the items."""
+
+    return np.fromiter((get_index(item) for item in items), dtype=np.int64)
+
+
+def to_polygons(mesh, indices):
+    """Converts face indices back into the polygon strings used by the strokes.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - indices (Iterable[int]): The face indices.
+
+    Returns:
+    - set[str]: The polygons, e.g. {"mesh.f[0]", "mesh.f[1]"}."""
+
+    return {f"{mesh}.f[{index}]" for index in indices}
+
+
 def get_dependency_node(node):
     """Retrieves the corresponding MObject representing the node's dependency node.
     This MObject can then be used with other OpenMaya API functions to manipulate
@@ -61,12 +98,62 @@ def get_DAG_path(node):
     return selection.getDagPath(0)
 
 
+def get_mesh_fn(mesh):
+    """Retrieves a MFnMesh function set attached to the mesh's DAG path, so that
+    queries such as intersections can be performed in world space.
+
+    Args:
+    - mesh (str): The name of the mesh (transform or shape).
+
+    Returns:
+    - OpenMaya.MFnMesh: The mesh function set."""
+
+    return instrumentation.counting(om2.MFnMesh(get_DAG_path(mesh)))
+
+
+def get_view_ray(x, y):
+    """Converts a point in the active viewport into a world space ray.
+
+    Args:
+    - x (float): The horizontal screen coordinate.
+    - y (float): The vertical screen coordinate.
+
+    Returns:
+    - tuple[OpenMaya.MFloatPoint, OpenMaya.MFloatVector]: The ray's source and direction."""
+
+    view = instrumentation.counting(omui2.M3dView.active3dView())
+    source, direction = view.viewToWorld(int(x), int(y))
+
+    return om2.MFloatPoint(source), om2.MFloatVector(direction)
+
+
+def intersect_face(mesh_fn, source, direction, accel_params=None):
+    """Casts a ray against the mesh and retrieves the index of the closest face
+    hit. Passing the same accel_params across calls lets Maya reuse its cached
+    intersection grid instead of rebuilding it for every ray.
+
+    Args:
+    - mesh_fn (OpenMaya.MFnMesh): The mesh function set (see get_mesh_fn).
+    - source (OpenMaya.MFloatPoint): The ray's source.
+    - direction (OpenMaya.MFloatVector): The ray's direction.
+    - accel_params (OpenMaya.MMeshIsectAccelParams, optional): The acceleration parameters.
+
+    Returns:
+    - int/None: The index of the face hit, None if the ray missed the mesh."""
+
+    hit = mesh_fn.closestIntersection(source, direction, om2.MSpace.kWorld, MAX_RAY_PARAM, False, accelParams=accel_params)
+
+    if not hit or hit[2] < 0:
+        return None
+
+    return hit[2]
+
+
 def get_face_normal(face):
     mesh, face = face.split(".")
     face_index = get_index(face)
 
-    DAG_path = get_DAG_path(mesh)
-    mesh_polygon_fn = om2.MFnMesh(DAG_path)
+    mesh_polygon_fn = get_mesh_fn(mesh)
 
     normal = mesh_polygon_fn.getPolygonNormal(face_index)
     return normal.x, normal.y, normal.z
@@ -84,7 +171,7 @@ def get_point_order(mesh):
 
     shape = cmds.listRelatives(mesh, shapes=True)[0]
     dependency_node = get_dependency_node(shape)
-    mesh_fn = om2.MFnMesh(dependency_node)
+    mesh_fn = instrumentation.counting(om2.MFnMesh(dependency_node))
 
     _, vertex_list = mesh_fn.getVertices()
 
@@ -92,25 +179,368 @@ def get_point_order(mesh):
         yield vertex_index
 
 
+def to_array(maya_array, dtype=np.int64):
+    return np.fromiter(maya_array, dtype=dtype, count=len(maya_array))
+
+
+def get_topology(mesh):
+    """Retrieves the topology (face-vertex connections and adjacency) of the mesh.
+    The topology is cached per fingerprint, thus only the connections are read
+    from Maya on subsequent calls.
+
+    Args:
+    - mesh (str): The name of the mesh.
+
+    Returns:
+    - topology.Topology: The topology of the mesh."""
+
+    face_counts, face_vertices = get_mesh_fn(mesh).getVertices()
+    return topology.get_topology(to_array(face_counts), to_array(face_vertices))
+
+
+def get_points(mesh, space=om2.MSpace.kObject):
+    """Retrieves the positions of all vertices of the mesh in bulk.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - space (OpenMaya.MSpace): The space of the positions, object space by default.
+
+    Returns:
+    - np.ndarray: The (V, 3) vertex positions."""
+
+    points = get_mesh_fn(mesh).getPoints(space)
+    return np.array(points, dtype=np.float64).reshape(-1, 4)[:, :3]
+
+
+def get_face_uvs(mesh, indices, uv_set=None):
+    """Retrieves the UV centre of faces, the average UV of their corners, from
+    the UV arrays of the mesh read in bulk.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - indices (Sequence[int]): The face indices.
+    - uv_set (str, optional): The UV set, the current one by default.
+
+    Returns:
+    - np.ndarray: The (N, 2) UVs, NaN for faces without UVs."""
+
+    mesh_fn = get_mesh_fn(mesh)
+    uv_set = uv_set or mesh_fn.currentUVSetName()
+
+    us, vs = mesh_fn.getUVs(uv_set)
+    uv_counts, uv_ids = (to_array(array) for array in mesh_fn.getAssignedUVs(uv_set))
+    uvs = np.stack([to_array(us, np.float64), to_array(vs, np.float64)], axis=1)
+
+    indices = np.asarray(indices, dtype=np.int64)
+    offsets, counts = np.concatenate([[0], np.cumsum(uv_counts)]), uv_counts[indices]
+
+    corners = np.repeat(offsets[indices] - (np.cumsum(counts) - counts), counts) + np.arange(counts.sum())
+    labels = np.repeat(np.arange(len(indices)), counts)
+    sums = np.stack([np.bincount(labels, uvs[uv_ids[corners], axis], len(indices)) for axis in range(2)], axis=1)
+
+    with np.errstate(invalid="ignore"):
+        return sums / counts[:, None]
+
+
+def get_uvs(mesh, uv_set=None):
+    """Retrieves the UVs of the mesh and the UV of every face corner in bulk.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - uv_set (str, optional): The UV set, the current one by default.
+
+    Returns:
+    - tuple[np.ndarray, np.ndarray]: The (U, 2) UVs and the UV index of every
+    face corner, -1 for corners of faces without UVs."""
+
+    mesh_fn = get_mesh_fn(mesh)
+    uv_set = uv_set or mesh_fn.currentUVSetName()
+
+    us, vs = mesh_fn.getUVs(uv_set)
+    uv_counts, uv_ids = (to_array(array) for array in mesh_fn.getAssignedUVs(uv_set))
+    face_counts = to_array(mesh_fn.getVertices()[0])
+
+    # -- Faces without UVs have no entry in uv_ids.
+    corner_uv_ids = np.full(face_counts.sum(), -1, dtype=np.int64)
+    corner_uv_ids[np.repeat(uv_counts > 0, face_counts)] = uv_ids
+
+    return np.stack([to_array(us, np.float64), to_array(vs, np.float64)], axis=1), corner_uv_ids
+
+
+def set_points(mesh, points, space=om2.MSpace.kObject, indices=None):
+    """Moves all vertices of the mesh with a single MFnMesh.setPoints. Given the
+    only vertices that moved, the MPointArray of the previous call is reused and
+    only those vertices are updated in it, rather than converting every point
+    into a new array, e.g. at every tick of a blend preview.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - points (np.ndarray): The (V, 3) vertex positions.
+    - space (OpenMaya.MSpace): The space of the positions, object space by default.
+    - indices (np.ndarray, optional): The vertices moved since the previous call,
+    all of them by default."""
+
+    points = np.asarray(points, dtype=np.float64)
+    point_array = _POINT_ARRAYS.pop(mesh, None)
+
+    # -- Updating most of the points one by one is slower than converting them all.
+    if point_array is None or indices is None or len(point_array) != len(points) or 2 * len(indices) > len(points):
+        point_array = om2.MPointArray(points.tolist())
+    else:
+        for index, point in zip(indices.tolist(), points[indices].tolist()):
+            point_array[index] = om2.MPoint(point)
+
+    mesh_fn = get_mesh_fn(mesh)
+    mesh_fn.setPoints(point_array, space)
+    mesh_fn.updateSurface()
+
+    # -- Writing all the points ends the reuse, e.g. when restoring a preview.
+    if indices is not None:
+        _POINT_ARRAYS[mesh] = point_array
+
+
+def group_polygons(polygons):
+    """Groups polygons by mesh.
+
+    Args:
+    - polygons (Iterable[str]): The polygons, e.g. ["mesh.f[0]", "other.f[3]"].
+
+    Returns:
+    - dict[str, np.ndarray]: The face indices of every mesh."""
+
+    groups = {}
+
+    for polygon in polygons:
+        groups.setdefault(get_node(polygon), []).append(get_index(polygon))
+
+    return {mesh: np.array(indices, dtype=np.int64) for mesh, indices in groups.items()}
+
+
+def get_colour_target(mesh):
+    """Finds the shape War Paint writes its colours to. Without history, it is the
+    mesh's shape. Behind deformers only (e.g. a skinCluster), it is the original
+    intermediate shape, whose colour set flows down to the deformed shape. Behind
+    topology edits, there is none and colours go through history instead. The
+    result is cached per mesh.
+
+    Args:
+    - mesh (str): The name of the mesh.
+
+    Returns:
+    - tuple[str, str/None]: The visible shape and the shape to colour."""
+
+    if mesh in _COLOUR_TARGETS:
+        return _COLOUR_TARGETS[mesh]
+
+    shape = (cmds.listRelatives(mesh, shapes=True, noIntermediate=True, fullPath=True) or [mesh])[0]
+    history = cmds.listHistory(shape, pruneDagObjects=True) or []
+    target = shape
+
+    if cmds.ls(history, type="polyBase"):
+        target = None
+    elif history:
+        original_shapes = cmds.ls(cmds.listHistory(shape) or [], type="mesh", intermediateObjects=True, long=True)
+        target = original_shapes[-1] if original_shapes else shape
+
+    _COLOUR_TARGETS[mesh] = shape, target
+    _DISPLAY_COLOURS.setdefault(shape, cmds.getAttr(f"{shape}.displayColors"))
+
+    return shape, target
+
+
+def get_colour_fn(mesh):
+    """Retrieves a MFnMesh on the colour target of the mesh, with the War Paint
+    colour set created and current.
+
+    Args:
+    - mesh (str): The name of the mesh.
+
+    Returns:
+    - OpenMaya.MFnMesh/None: The function set, None if colours must go through history."""
+
+    shape, target = get_colour_target(mesh)
+
+    if target is None:
+        return None
+
+    mesh_fn = get_mesh_fn(target)
+
+    if COLOUR_SET not in mesh_fn.getColorSetNames():
+        mesh_fn.createColorSet(COLOUR_SET, False)
+        mesh_fn.setCurrentColorSetName(COLOUR_SET)
+
+        if target != shape:
+            cmds.polyColorSet(shape, currentColorSet=True, colorSet=COLOUR_SET)
+
+        cmds.setAttr(f"{shape}.displayColors", True)
+
+    elif mesh_fn.currentColorSetName() != COLOUR_SET:
+        mesh_fn.setCurrentColorSetName(COLOUR_SET)
+
+    return mesh_fn
+
+
+def colour_faces(mesh, indices, rgb):
+    """Colours faces in the War Paint colour set, straight through the API: no
+    polyColorPerVertex node is created and nothing enters the undo queue (see
+    transactions.py for undo).
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - indices (Sequence[int]): The face indices.
+    - rgb (tuple[int, int, int]): The colour, from 0 to 255."""
+
+    if not len(indices):
+        return
+
+    mesh_fn = get_colour_fn(mesh)
+    red, green, blue = (value / 255 for value in rgb)
+
+    if mesh_fn is None:
+        colour_history(mesh, indices, colorRGB=[red, green, blue], alpha=1, notUndoable=True, colorDisplayOption=True)
+        return
+
+    colours = om2.MColorArray(len(indices), om2.MColor([red, green, blue, 1]))
+    mesh_fn.setFaceColors(colours, om2.MIntArray(np.asarray(indices).tolist()))
+
+
+def decolour_faces(mesh, indices):
+    if not len(indices):
+        return
+
+    mesh_fn = get_colour_fn(mesh)
+
+    if mesh_fn is None:
+        colour_history(mesh, indices, remove=True)
+        return
+
+    mesh_fn.removeFaceColors(om2.MIntArray(np.asarray(indices).tolist()))
+
+
+def colour_history(mesh, indices, **kwargs):
+    """Colours faces through a polyColorPerVertex node, for meshes whose history
+    edits the topology. The nodes created are tagged and tracked per mesh, so that
+    cleaning up removes them and only them.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - indices (Sequence[int]): The face indices.
+    - kwargs: The flags of cmds.polyColorPerVertex."""
+
+    shape, _ = get_colour_target(mesh)
+    existing_nodes = set(get_colour_nodes(shape))
+
+    cmds.polyColorPerVertex(list(to_polygons(mesh, indices)), **kwargs)
+
+    for node in get_colour_nodes(shape):
+        if node not in existing_nodes:
+            cmds.addAttr(node, longName=TAG_ATTRIBUTE, attributeType="bool", defaultValue=True)
+            _COLOUR_NODES.setdefault(mesh, []).append(node)
+
+
+def get_colour_nodes(shape, tagged_only=False):
+    """Retrieves the polyColorPerVertex nodes in the history of a shape.
+
+    Args:
+    - shape (str): The name of the shape.
+    - tagged_only (bool): Whether to keep only the nodes War Paint created.
+
+    Returns:
+    - list[str]: The nodes."""
+
+    nodes = cmds.ls(cmds.listHistory(shape) or [], type="polyColorPerVertex") or []
+
+    if tagged_only:
+        return [node for node in nodes if cmds.attributeQuery(TAG_ATTRIBUTE, node=node, exists=True)]
+
+    return nodes
+
+
 def colour_polygons(red, green, blue, polygons):
-    if polygons:
-        cmds.polyColorPerVertex(polygons, colorRGB=[red / 255, green / 255, blue / 255], alpha=1, notUndoable=True, colorDisplayOption=True)
+    for mesh, indices in group_polygons(polygons or []).items():
+        colour_faces(mesh, indices, (red, green, blue))
 
 
 def decolour_polygons(polygons):
     if polygons:
         try:
-            cmds.polyColorPerVertex(list(polygons), remove=True)
+            for mesh, indices in group_polygons(polygons).items():
+                decolour_faces(mesh, indices)
         except Exception as err:
             print(f"Failed to decolourize polygon(s): {err}")
 
 
-def remove_all_colours(meshes=None):
-    vertex_colours = cmds.ls(type="polyColorPerVertex") or []
+def remove_colours(meshes=None):
+    """Removes the display data War Paint created, and nothing else: its colour
+    set on the colour targets and its tagged polyColorPerVertex nodes, which are
+    deleted in one go. The displayColors of the shapes is restored.
+
+    Args:
+    - meshes (Iterable[str], optional): The meshes to clean up, every mesh War
+    Paint coloured by default. Untracked meshes (e.g. coloured before the scene
+    was reopened) are searched for tagged nodes in their own history only."""
+
+    meshes = list(_COLOUR_TARGETS) if meshes is None else list(meshes)
+    colour_nodes = []
+
+    for mesh in meshes:
+        is_tracked = mesh in _COLOUR_TARGETS
+
+        if not is_tracked and not cmds.objExists(mesh):
+            continue
+
+        shape, target = get_colour_target(mesh)
+        display_colours = _DISPLAY_COLOURS.pop(shape, False)
+        del _COLOUR_TARGETS[mesh]
+
+        if is_tracked:
+            colour_nodes.extend(_COLOUR_NODES.pop(mesh, []))
+        else:
+            colour_nodes.extend(get_colour_nodes(shape, tagged_only=True))
+
+        if target and cmds.objExists(target):
+            mesh_fn = get_mesh_fn(target)
+
+            if COLOUR_SET in mesh_fn.getColorSetNames():
+                mesh_fn.deleteColorSet(COLOUR_SET)
+
+        if is_tracked and cmds.objExists(shape):
+            cmds.setAttr(f"{shape}.displayColors", bool(display_colours))
+
+    colour_nodes = cmds.ls(colour_nodes) or []
+
+    if colour_nodes:
+        cmds.delete(colour_nodes)
+
+
+# • ───────────────────────────
+# • ──── Backend. ────
+
+
+class MayaBackend(backend.MeshBackend):
+    """The mesh backend of the core, running on the scene's meshes."""
+
+    def get_topology(self, mesh):
+        return get_topology(mesh)
+
+    def get_points(self, mesh, world=False):
+        return get_points(mesh, om2.MSpace.kWorld if world else om2.MSpace.kObject)
+
+    def set_points(self, mesh, points, indices=None):
+        set_points(mesh, points, indices=indices)
+
+    def get_uvs(self, mesh, uv_set=None):
+        return get_uvs(mesh, uv_set)
+
+    def colour_faces(self, mesh, indices, rgb):
+        colour_faces(mesh, indices, rgb)
+
+    def decolour_faces(self, mesh, indices):
+        decolour_faces(mesh, indices)
+
+    def select_faces(self, mesh, indices):
+        cmds.select(list(to_polygons(mesh, indices)))
 
-    if vertex_colours:
-        cmds.delete(vertex_colours)
 
-    for mesh in meshes or []:
-        for color_set in cmds.polyColorSet(mesh, query=True, allColorSets=True) or []:
-            cmds.polyColorSet(mesh, colorSet=color_set, delete=True)
+backend.set_backend(MayaBackend())
+instrumentation.register(__name__, exclude=["get_node", "get_index", "to_array", "get_colour_target", "get_colour_nodes"])
@@ -0,0 +1,151 @@
+from contextlib import contextmanager
+from itertools import groupby
+
+from maya import cmds
+import numpy as np
+
+from warpaint import ROOT_DIR
+
+
+PLUGIN_FILEPATH = ROOT_DIR.joinpath("plugins", "warpaint_transactions.py")
+COMMAND_NAME = "warPaintTransaction"
+
+_ACTIVE = None  # -- Recording.
+_PENDING = None  # -- Handed over to the command.
+_IS_OPEN = False  # -- Whether the active transaction stays open across blocks, until end.
+
+
+class Transaction:
+    """The stroke membership changes of one paint operation, as face index deltas.
+    Colours are not stored: every face is coloured after the stroke owning it, so
+    undoing and redoing replays the deltas through the store of the strokes (see
+    store.StrokeStore.apply), which recolours the affected faces. Memory is thus
+    proportional to the number of faces changed."""
+
+    def __init__(self, name):
+        self.name = name
+        self.changes = []  # -- (stroke store, stroke, mesh, added indices, removed indices)
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def record(self, stroke_store, stroke, added, removed):
+        self.changes.append((stroke_store, stroke, stroke_store.mesh, added.astype(np.int32), removed.astype(np.int32)))
+
+    def nbytes(self):
+        return sum(added.nbytes + removed.nbytes for *_, added, removed in self.changes)
+
+    # • ───────────────────────────
+    # • ──── Undo/Redo. ────
+
+    def undo(self):
+        self._replay([(stroke_store, stroke, mesh, removed, added) for stroke_store, stroke, mesh, added, removed in reversed(self.changes)])
+
+    def redo(self):
+        self._replay(self.changes)
+
+    def _replay(self, changes):
+        """Applies the changes in order, in one go per store and mesh, so that
+        faces moving between strokes are recoloured once."""
+
+        for (stroke_store, mesh), group in groupby(changes, key=lambda change: (change[0], change[2])):
+            stroke_store.apply([(stroke, added, removed) for _, stroke, _, added, removed in group], mesh, record=False)
+
+
+# • ───────────────────────────
+# • ──── Recording. ────
+
+
+def record(stroke_store, stroke, added, removed):
+    """Records a membership change of a stroke on the active transaction, if any,
+    as the recorder of the stores (see store.StrokeStore).
+
+    Args:
+    - stroke_store (store.StrokeStore): The store of the stroke.
+    - stroke (strokes.Stroke): The stroke.
+    - added (np.ndarray): The faces added to the stroke.
+    - removed (np.ndarray): The faces removed from the stroke."""
+
+    if _ACTIVE is not None:
+        _ACTIVE.record(stroke_store, stroke, added, removed)
+
+
+@contextmanager
+def transaction(name):
+    """Records the stroke changes made within the block as a single undo step.
+    The changes are applied as they are made; once the block exits, the
+    transaction is handed to the registered command, which only keeps it for
+    undo and redo. Nested blocks join the outer transaction, as do the blocks
+    run between begin and end.
+
+    Args:
+    - name (str): The name of the operation."""
+
+    global _ACTIVE
+
+    if _ACTIVE is not None:
+        yield _ACTIVE
+        return
+
+    _ACTIVE = Transaction(name)
+
+    try:
+        yield _ACTIVE
+    finally:
+        current, _ACTIVE = _ACTIVE, None
+
+        if current:
+            commit(current)
+
+
+def begin(name):
+    """Opens a transaction that the following blocks join until end, e.g. for
+    the flushes of one drag, so that the whole drag is a single undo step. It is
+    only put on the undo queue once ended, thus never extended afterwards."""
+
+    global _ACTIVE, _IS_OPEN
+
+    end()
+    _ACTIVE, _IS_OPEN = Transaction(name), True
+
+
+def end():
+    """Commits the transaction opened by begin, if any and not empty."""
+
+    global _ACTIVE, _IS_OPEN
+
+    if not _IS_OPEN:
+        return
+
+    current, _ACTIVE, _IS_OPEN = _ACTIVE, None, False
+
+    if current:
+        commit(current)
+
+
+def commit(current):
+    global _PENDING
+
+    if load_plugin():
+        _PENDING = current
+        getattr(cmds, COMMAND_NAME)()
+
+
+def take_pending():
+    global _PENDING
+
+    current, _PENDING = _PENDING, None
+    return current
+
+
+def load_plugin():
+    plugin_name = PLUGIN_FILEPATH.stem
+
+    if not cmds.pluginInfo(plugin_name, query=True, loaded=True):
+        try:
+            cmds.loadPlugin(PLUGIN_FILEPATH.as_posix(), quiet=True)
+        except RuntimeError as err:
+            print(f"Failed to load {plugin_name}, painting is not undoable: {err}")
+            return False
+
+    return True
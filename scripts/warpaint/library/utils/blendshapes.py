@@ -1,4 +1,5 @@
 from maya import cmds
+import numpy as np
 
 
 def delete_blendshape(morph_mesh, blendshape):
@@ -17,44 +18,68 @@ def create_blendshape(base_mesh, morph_mesh, name, alias):
     return blendshape
 
 
-def create_centered_follicle(face, name):
-    """Create a centered follicle on a given face.
+def create_follicles(meshes, uvs, names, parent=None):
+    """Creates a follicle at every UV, on the mesh of each, all in one pass: the
+    UVs are computed in bulk beforehand (see api.get_face_uvs), thus no node is
+    created to query them, and the follicles are parented at once.
 
     Args:
-        face (str): the face to create the centered follicle on.
-        name (str): the name of give the follicle.
+        meshes (list[str]): the mesh to attach every follicle to.
+        uvs (np.ndarray): the (N, 2) UVs of the follicles.
+        names (list[str]): the names of the follicles.
+        parent (str, optional): the node to parent the follicles under.
 
     Returns:
-        str: the follicle transform node string."""
+        list[str]: the follicle transform node strings."""
 
-    vertex_indices = cmds.filterExpand(cmds.polyListComponentConversion(face, fromFace=True, toVertex=True), selectionMask=31)
-    vertex_count, vertex_positions = len(vertex_indices), [cmds.pointPosition(index, world=True) for index in vertex_indices]
-    face_center = [sum(coord) / vertex_count for coord in zip(*vertex_positions)]
+    if not names:
+        return []
 
-    face_shape = cmds.listRelatives(face, shapes=True, parent=True)[0]
-    closest_point = cmds.createNode("closestPointOnMesh", skipSelect=True)
+    shapes = {mesh: cmds.listRelatives(mesh, shapes=True, noIntermediate=True, fullPath=True)[0] for mesh in dict.fromkeys(meshes)}
+    follicle_shapes = [cmds.createNode("follicle", skipSelect=True, name=f"{name}Shape") for name in names]
+    follicles = cmds.listRelatives(follicle_shapes, parent=True)
 
-    # -- Connect Closest Point to Face.
-    cmds.connectAttr(f"{face_shape}.outMesh", f"{closest_point}.inMesh")
-    cmds.connectAttr(f"{face_shape}.worldMatrix[0]", f"{closest_point}.inputMatrix")
-    cmds.setAttr(f"{closest_point}.inPosition", *face_center, type="double3")
+    for follicle, follicle_shape, mesh, (u, v) in zip(follicles, follicle_shapes, meshes, uvs):
+        cmds.connectAttr(f"{follicle_shape}.outTranslate", f"{follicle}.translate")
+        cmds.connectAttr(f"{follicle_shape}.outRotate", f"{follicle}.rotate")
 
-    # -- Create Follicle.
-    follicle_shape = cmds.createNode("follicle", skipSelect=True, name=f"{name}Shape")
-    follicle = cmds.listRelatives(follicle_shape, parent=True)[0]
+        # -- Connect Follicle to Mesh.
+        cmds.connectAttr(f"{shapes[mesh]}.outMesh", f"{follicle_shape}.inputMesh")
+        cmds.connectAttr(f"{shapes[mesh]}.worldMatrix[0]", f"{follicle_shape}.inputWorldMatrix")
 
-    cmds.connectAttr(f"{follicle_shape}.outTranslate", f"{follicle}.translate")
-    cmds.connectAttr(f"{follicle_shape}.outRotate", f"{follicle}.rotate")
+        cmds.setAttr(f"{follicle_shape}.parameterU", float(u))
+        cmds.setAttr(f"{follicle_shape}.parameterV", float(v))
 
-    # -- Connect Follicle to Face.
-    cmds.connectAttr(f"{face_shape}.outMesh", f"{follicle_shape}.inputMesh")
-    cmds.connectAttr(f"{face_shape}.worldMatrix[0]", f"{follicle_shape}.inputWorldMatrix")
+    if parent:
+        follicles = cmds.parent(follicles, parent)
 
-    # -- Set Follicle Position.
-    cmds.setAttr(f"{follicle_shape}.parameterU", cmds.getAttr(f"{closest_point}.parameterU"))
-    cmds.setAttr(f"{follicle_shape}.parameterV", cmds.getAttr(f"{closest_point}.parameterV"))
+    return follicles
 
-    # -- Clean-Up.
-    cmds.delete(closest_point)
 
-    return follicle
+def create_tracking_cameras(follicles, matrices, names, parent=None):
+    """Creates a camera following every follicle, the groups of the cameras are
+    parented at once.
+
+    Args:
+        follicles (list[str]): the follicles to follow.
+        matrices (np.ndarray): the (N, 4, 4) world matrices of the cameras.
+        names (list[str]): the names of the cameras.
+        parent (str, optional): the node to parent the cameras' groups under.
+
+    Returns:
+        list[str]: the camera transform node strings."""
+
+    if not names:
+        return []
+
+    cameras = [cmds.camera(name=name)[0] for name in names]
+    camera_groups = [cmds.group(camera, name=f"{name}Group") for camera, name in zip(cameras, names)]
+
+    if parent:
+        camera_groups = cmds.parent(camera_groups, parent)
+
+    for follicle, camera, camera_group, matrix in zip(follicles, cameras, camera_groups, matrices):
+        cmds.xform(camera, matrix=np.asarray(matrix).ravel().tolist(), worldSpace=True)
+        cmds.pointConstraint(follicle, camera_group, maintainOffset=True)
+
+    return cameras
@@ -0,0 +1,54 @@
+from maya import cmds
+import numpy as np
+
+
+def get_geometry_index(deformer, mesh):
+    """Retrieves the index of the mesh among the geometries of the deformer.
+
+    Args:
+    - deformer (str): The deformer, e.g. a cluster or a softMod.
+    - mesh (str): The name of the deformed mesh.
+
+    Returns:
+    - int/None: The index of its weightList entry, None if it is not deformed."""
+
+    shapes = cmds.ls(cmds.deformer(deformer, query=True, geometry=True) or [], long=True)
+    indices = cmds.deformer(deformer, query=True, geometryIndices=True) or []
+    shape = cmds.ls(cmds.listRelatives(mesh, shapes=True, noIntermediate=True, fullPath=True) or [mesh], long=True)[0]
+
+    return dict(zip(shapes, indices)).get(shape)
+
+
+def set_weights(deformer, mesh, weights):
+    """Writes the weights of all vertices of the mesh with a single setAttr on
+    the deformer's weight list.
+
+    Args:
+    - deformer (str): The deformer.
+    - mesh (str): The name of the deformed mesh.
+    - weights (np.ndarray): The weight of every vertex."""
+
+    index = get_geometry_index(deformer, mesh)
+
+    if index is None:
+        raise ValueError(f"'{deformer}' does not deform '{mesh}'.")
+
+    weights = np.asarray(weights, dtype=np.float64)
+    cmds.setAttr(f"{deformer}.weightList[{index}].weights[0:{len(weights) - 1}]", *weights.tolist(), size=len(weights))
+
+
+def create_cluster(mesh, name, weights):
+    """Creates a cluster deforming the mesh with the given weights.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - name (str): The name of the cluster.
+    - weights (np.ndarray): The weight of every vertex.
+
+    Returns:
+    - tuple[str, str]: The cluster and its handle."""
+
+    cluster, handle = cmds.cluster(mesh, name=name)
+    set_weights(cluster, mesh, weights)
+
+    return cluster, handle
@@ -0,0 +1,134 @@
+from maya import cmds
+from warpaint.qt import QtCore
+
+from warpaint.core import instrumentation
+from warpaint.library import api
+
+
+CONTEXT_NAME = "warPaintDragContext"
+FRAME_INTERVAL = 1000 // 60  # ms, flush at most once per frame.
+ERASE_MODIFIER = "ctrl"
+
+
+class DragPaintContext(QtCore.QObject):
+    """A Maya dragger context that collects the faces under the cursor while the
+    artist drags over the mesh. Hits are accumulated and handed over to the
+    callback at most once per frame, to keep the number of colour updates low
+    on dense meshes. The intersection accelerator is built once per mesh and
+    reused for every ray.
+
+    The callback receives (faces, erase, is_first), where erase is True while
+    the erase modifier is held and is_first flags the first flush of a drag. A
+    drag starts and ends with the pressed and released signals."""
+
+    pressed = QtCore.Signal()
+    released = QtCore.Signal()
+    finished = QtCore.Signal()
+
+    def __init__(self, on_flush, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_flush = on_flush
+
+        self.mesh = None
+        self.mesh_fn, self.accel_params = None, None
+
+        self.pending, self.last_face = set(), None
+        self.erase, self.is_first = False, True
+
+        self.timer = QtCore.QTimer(self, singleShot=True, interval=FRAME_INTERVAL)
+        self.timer.timeout.connect(self.flush)
+
+    # • ───────────────────────────
+    # • ──── Tool. ────
+
+    def enter(self, mesh):
+        self.set_mesh(mesh)
+
+        commands = dict(pressCommand=self.on_press, dragCommand=self.on_drag, releaseCommand=self.on_release, finalize=self.on_finalize)
+
+        if cmds.draggerContext(CONTEXT_NAME, exists=True):
+            cmds.draggerContext(CONTEXT_NAME, edit=True, **commands)
+        else:
+            cmds.draggerContext(CONTEXT_NAME, cursor="crossHair", space="screen", undoMode="step", **commands)
+
+        cmds.setToolTo(CONTEXT_NAME)
+
+    def exit(self):
+        if cmds.currentCtx() == CONTEXT_NAME:
+            cmds.setToolTo("selectSuperContext")  # -- Triggers on_finalize.
+        else:
+            self.on_finalize()
+
+    def set_mesh(self, mesh):
+        if mesh == self.mesh:
+            return
+
+        self.free_intersector()
+
+        self.mesh = mesh
+        self.mesh_fn = api.get_mesh_fn(mesh)
+        self.accel_params = self.mesh_fn.autoUniformGridParams()
+
+    def free_intersector(self):
+        if self.mesh_fn:
+            self.mesh_fn.freeCachedIntersectionAccelerator()
+
+        self.mesh_fn, self.accel_params = None, None
+
+    # • ───────────────────────────
+    # • ──── Events. ────
+
+    def on_press(self):
+        modifier = cmds.draggerContext(CONTEXT_NAME, query=True, modifier=True)
+
+        self.erase = modifier == ERASE_MODIFIER
+        self.is_first, self.last_face = True, None
+        self.pressed.emit()
+        self.sample()
+
+    def on_drag(self):
+        self.sample()
+
+    def on_release(self):
+        self.flush()
+        self.released.emit()
+
+    def on_finalize(self):
+        self.flush()
+        self.free_intersector()
+
+        self.mesh = None
+        self.finished.emit()
+
+    # • ───────────────────────────
+    # • ──── Hits. ────
+
+    def sample(self):
+        if not self.mesh_fn:
+            return
+
+        x, y, _ = cmds.draggerContext(CONTEXT_NAME, query=True, dragPoint=True)
+        source, direction = api.get_view_ray(x, y)
+        face_index = api.intersect_face(self.mesh_fn, source, direction, self.accel_params)
+
+        if face_index is None or face_index == self.last_face:
+            return
+
+        self.last_face = face_index
+        self.pending.add(face_index)
+
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        self.timer.stop()
+
+        if not self.pending:
+            return
+
+        faces, self.pending = self.pending, set()
+        self.on_flush(faces, self.erase, self.is_first)
+        self.is_first = False
+
+
+instrumentation.register(__name__, functions=False)
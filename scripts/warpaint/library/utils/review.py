@@ -0,0 +1,61 @@
+from maya import cmds
+import numpy as np
+
+from warpaint.core import framing
+
+
+CAMERA_NAME = "warPaintReviewCamera"
+FRAME_MARGIN = 1.25  # -- Of the bounding radius, kept around the stroke.
+
+
+class StrokeReview:
+    """Steps a single camera through groups of faces, e.g. strokes. The
+    framings and camera matrices of all the groups are computed up front in one
+    pass, thus every step only moves the camera: no node is created or deleted
+    until the review stops. Empty groups are skipped."""
+
+    def __init__(self, mesh, groups):
+        self.framings = framing.frame_groups(mesh, groups)
+        self.index = -1
+
+        self.previous_camera = cmds.lookThru(query=True) or "persp"
+        self.camera = cmds.camera(name=CAMERA_NAME)[0]
+
+        field_of_view = np.radians(cmds.camera(self.camera, query=True, verticalFieldOfView=True))
+        radii = np.array([item.radius for item in self.framings]) * FRAME_MARGIN
+        distances = radii / np.tan(field_of_view / 2)
+
+        centroids, normals = [item.centroid for item in self.framings], [item.normal for item in self.framings]
+        self.matrices = framing.look_at_matrices(centroids, normals, distances) if self.framings else np.zeros((0, 4, 4))
+
+        cmds.lookThru(self.camera)
+
+    @property
+    def names(self):
+        return [item.name for item in self.framings]
+
+    def step(self, offset=1):
+        """Frames the next group, or the previous one with a negative offset.
+
+        Args:
+        - offset (int): The number of groups to step by, wrapping around.
+
+        Returns:
+        - str/None: The name of the framed group, None if there is none."""
+
+        if not self.framings:
+            return None
+
+        return self.go_to((self.index + offset) % len(self.framings))
+
+    def go_to(self, index):
+        self.index = index
+        cmds.xform(self.camera, matrix=self.matrices[index].ravel().tolist(), worldSpace=True)
+
+        return self.framings[index].name
+
+    def stop(self):
+        cmds.lookThru(self.previous_camera if cmds.objExists(self.previous_camera) else "persp")
+
+        if cmds.objExists(self.camera):
+            cmds.delete(self.camera)
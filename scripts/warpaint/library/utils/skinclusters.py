@@ -0,0 +1,153 @@
+from maya import cmds
+from maya.api import OpenMaya as om2
+from maya.api import OpenMayaAnim as oma2
+import numpy as np
+
+from warpaint.core import instrumentation, weights
+from warpaint.library import api
+
+
+def get_skin_cluster(mesh):
+    """Retrieves the skinCluster deforming the mesh.
+
+    Args:
+    - mesh (str): The name of the mesh.
+
+    Returns:
+    - str/None: The skinCluster, None if the mesh is not skinned."""
+
+    skin_clusters = cmds.ls(cmds.listHistory(mesh, pruneDagObjects=True) or [], type="skinCluster")
+    return skin_clusters[0] if skin_clusters else None
+
+
+def get_influences(skin_cluster):
+    return [path.partialPathName() for path in _skin_fn(skin_cluster).influenceObjects()]
+
+
+def get_weights(skin_cluster, mesh):
+    """Reads the weights of all vertices with a single MFnSkinCluster.getWeights.
+
+    Args:
+    - skin_cluster (str): The skinCluster.
+    - mesh (str): The name of the skinned mesh.
+
+    Returns:
+    - np.ndarray: The (V, I) weights, one column per influence (see get_influences)."""
+
+    shape = _shape_path(mesh)
+    values, influence_count = _skin_fn(skin_cluster).getWeights(shape, _vertex_component(om2.MFnMesh(shape).numVertices))
+
+    return api.to_array(values, np.float64).reshape(-1, influence_count)
+
+
+def set_weights(skin_cluster, mesh, vertices, values):
+    """Writes the weights of the vertices with a single MFnSkinCluster.setWeights.
+
+    Args:
+    - skin_cluster (str): The skinCluster.
+    - mesh (str): The name of the skinned mesh.
+    - vertices (np.ndarray): The vertex indices.
+    - values (np.ndarray): The (N, I) weights, one column per influence."""
+
+    influence_indices = om2.MIntArray(list(range(values.shape[1])))
+    component = _vertex_component(vertices=vertices)
+
+    _skin_fn(skin_cluster).setWeights(_shape_path(mesh), component, influence_indices, om2.MDoubleArray(values.ravel().tolist()), normalize=False)
+
+
+def bind(mesh, influences, skin_cluster=None):
+    """Binds the mesh to the influences, adding those its skinCluster lacks.
+
+    Args:
+    - mesh (str): The name of the mesh.
+    - influences (list[str]): The influences, e.g. joints.
+    - skin_cluster (str, optional): The skinCluster of the mesh, a new one by default.
+
+    Returns:
+    - str: The skinCluster."""
+
+    if not skin_cluster:
+        return cmds.skinCluster(influences, mesh, toSelectedBones=True, skinMethod=0, normalizeWeights=1)[0]
+
+    current = set(get_influences(skin_cluster))
+    missing = [influence for influence in influences if influence not in current]
+
+    if missing:
+        cmds.skinCluster(skin_cluster, edit=True, addInfluence=missing, weight=0.0)
+
+    return skin_cluster
+
+
+@instrumentation.traced("skinclusters.transfer")
+def transfer_weights(source_mesh, target_mesh, source_strokes, target_strokes):
+    """Transfers the skin weights of the source mesh onto the target mesh,
+    constrained by matching strokes (see weights.build_weight_map). The weights
+    are read and written in bulk, the target is bound to the missing influences
+    first. Raises a ValueError when any target vertex is left unmapped, as it
+    would silently keep its current weights.
+
+    Note:
+    - MFnSkinCluster.setWeights is not undoable.
+
+    Args:
+    - source_mesh (str): The name of the skinned mesh.
+    - target_mesh (str): The name of the mesh to transfer onto.
+    - source_strokes (dict): The strokes data of the source mesh.
+    - target_strokes (dict): The strokes data of the target mesh, matched by name.
+
+    Returns:
+    - tuple[str, weights.WeightMap]: The skinCluster of the target and the map."""
+
+    source_skin_cluster = get_skin_cluster(source_mesh)
+
+    if not source_skin_cluster:
+        raise ValueError(f"'{source_mesh}' is not skinned.")
+
+    source_influences = get_influences(source_skin_cluster)
+    source_weights = get_weights(source_skin_cluster, source_mesh)
+
+    weight_map = weights.build_weight_map(source_mesh, target_mesh, source_strokes, target_strokes)
+    vertex_count = om2.MFnMesh(_shape_path(target_mesh)).numVertices
+
+    if len(weight_map.vertices) != vertex_count:
+        raise ValueError(f"{vertex_count - len(weight_map.vertices)} vertices of '{target_mesh}' are not mapped onto '{source_mesh}'.")
+
+    target_skin_cluster = bind(target_mesh, source_influences, get_skin_cluster(target_mesh))
+    target_influences = get_influences(target_skin_cluster)
+
+    # -- Influences the source lacks keep no weight on the transferred vertices.
+    target_weights = np.zeros((len(weight_map.vertices), len(target_influences)))
+    target_weights[:, [target_influences.index(influence) for influence in source_influences]] = weight_map.apply(source_weights)
+
+    set_weights(target_skin_cluster, target_mesh, weight_map.vertices, target_weights)
+    return target_skin_cluster, weight_map
+
+
+def _skin_fn(skin_cluster):
+    return instrumentation.counting(oma2.MFnSkinCluster(api.get_dependency_node(skin_cluster)))
+
+
+def _shape_path(mesh):
+    path = api.get_DAG_path(mesh)
+
+    if path.apiType() == om2.MFn.kTransform:
+        path.extendToShape()
+
+    return path
+
+
+def _vertex_component(count=None, vertices=None):
+    """A vertex component of the first count vertices, or of the given ones."""
+
+    component_fn = om2.MFnSingleIndexedComponent()
+    component = component_fn.create(om2.MFn.kMeshVertComponent)
+
+    if vertices is None:
+        component_fn.setCompleteData(count)
+    else:
+        component_fn.addElements(om2.MIntArray(np.asarray(vertices).tolist()))
+
+    return component
+
+
+instrumentation.register(__name__, functions=False)
@@ -0,0 +1,94 @@
+"""Compares and merges .paint documents painted on the same mesh, e.g. by two
+artists working on different regions of a character in parallel.
+
+Usage:
+    python -m warpaint.merge diff base.paint hero.paint
+    python -m warpaint.merge merge base.paint ours.paint theirs.paint --output merged.paint --policy theirs
+
+As a git merge driver, resolving conflicts in favour of the current branch:
+    git config merge.paint.driver "python -m warpaint.merge merge %O %A %B --output %A"
+    echo "*.paint merge=paint" >> .gitattributes
+
+Faces given to different strokes on each side are conflicts, resolved by the
+policy: ours, theirs, or base to keep them as they were."""
+
+from pathlib import Path
+import argparse, json, sys
+
+from warpaint.core import documents, merging
+
+
+# • ───────────────────────────
+# • ──── Commands. ────
+
+
+def run_diff(args):
+    document_diff = merging.diff_documents(documents.read_document(args.document), documents.read_document(args.other))
+
+    if args.json:
+        print(json.dumps(document_diff.data(), indent=4))
+        return 1 if document_diff else 0
+
+    for name in document_diff.added:
+        print(f"+ {name}")
+
+    for name in document_diff.removed:
+        print(f"- {name}")
+
+    for stroke_diff in document_diff.changed:
+        changes = "".join(f"  {key}: {old} -> {new}" for key, (old, new) in stroke_diff.changes.items())
+        print(f"~ {stroke_diff.name}  +{len(stroke_diff.added)} -{len(stroke_diff.removed)} face(s){changes}")
+
+    return 1 if document_diff else 0
+
+
+def run_merge(args):
+    (ours, store), base, theirs = documents.open_document(args.ours), documents.read_document(args.base), documents.read_document(args.theirs)
+    result = merging.merge_documents(base, ours, theirs, args.policy)
+
+    # -- Kept in our object store if ours is a manifest.
+    documents.write_document(args.output or args.ours, result.document, store)
+
+    for name in result.stroke_conflicts:
+        state = "kept" if name in result.document["strokes"] else "deleted"
+        print(f"Stroke '{name}' deleted on one side and modified on the other, {state} by the {args.policy} policy.")
+
+    if len(result.conflicts):
+        print(f"{len(result.conflicts)} face(s) painted into different strokes on each side, resolved by the {args.policy} policy.")
+
+    return 1 if args.strict and (len(result.conflicts) or result.stroke_conflicts) else 0
+
+
+# • ───────────────────────────
+# • ──── CLI. ────
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="warpaint.merge", description="Diff and merge .paint files.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    diff_parser = subparsers.add_parser("diff", help="List the strokes and faces changed between two .paint files.")
+    diff_parser.add_argument("document", help="The original .paint file.")
+    diff_parser.add_argument("other", help="The modified .paint file.")
+    diff_parser.add_argument("--json", action="store_true", help="Print the full diff, face indices included, as JSON.")
+    diff_parser.set_defaults(run=run_diff)
+
+    merge_parser = subparsers.add_parser("merge", help="Merge two .paint files painted from a common one.")
+    merge_parser.add_argument("base", help="The common ancestor .paint file.")
+    merge_parser.add_argument("ours", help="Our .paint file, overwritten unless --output is given.")
+    merge_parser.add_argument("theirs", help="Their .paint file.")
+    merge_parser.add_argument("--output", help="Where to write the merged .paint file.")
+    merge_parser.add_argument("--policy", default=merging.OURS, choices=merging.POLICIES, help="Which side keeps the conflicting faces.")
+    merge_parser.add_argument("--strict", action="store_true", help="Exit with 1 when there were conflicts, even resolved.")
+    merge_parser.set_defaults(run=run_merge)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -92,6 +92,11 @@ def get_random_colour():
     return random.choice(filtered_colours or [MISSING_COLOUR])
 
 
+def get_colour_by_name(name):
+    colours_map = {colour.name: colour for colour in COLOURS}
+    return colours_map.get(name, None) or MISSING_COLOUR
+
+
 def get_colour_by_index(index):
     colours = get_colours(only_active=True)
 
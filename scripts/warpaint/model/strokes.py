@@ -1,64 +1,49 @@
-import maya.cmds as cmds
 from dataclasses import dataclass, field
+import numpy as np
 
-from warpaint.library import api
+from warpaint.core import store
 from warpaint.model import colours
 from warpaint.model.settings import Settings
 
 
 @dataclass
 class Stroke:
+    """A stroke of the PainterUI. Its faces are painted and displayed through the
+    core store (see store.StrokeStore), which takes it as a record."""
+
     name: str
     region: str
-    polygons: set = field(default_factory=set)
+    faces: np.ndarray = field(default_factory=store.no_faces)
     colour: colours.Colour = field(default_factory=colours.get_random_colour)
     settings: Settings = field(default_factory=Settings)
     is_highlighted: bool = True
+    is_deleted: bool = False
 
-    # • ───────────────────────────
-    # • ──── Polygons. ────
-
-    def select_polygons(self):
-        cmds.select(list(self.polygons))
-
-    def set_polygons(self, polygons):
-        self.remove_polygons(self.polygons.copy())
-        self.add_polygons(polygons)
+    @classmethod
+    def from_data(cls, name, values, **kwargs):
+        """Creates a stroke from its exported data (see Stroke.data).
 
-    def add_polygons(self, polygons):
-        self.polygons.update(polygons)
-        self.repaint(polygons)
+        Args:
+        - name (str): The name of the stroke.
+        - values (dict): The stroke values: colour_name, indices and region.
 
-    def remove_polygons(self, polygons):
-        self.polygons.difference_update(polygons)
-        api.decolour_polygons(polygons)
+        Returns:
+        - Stroke: The stroke, not added to a store yet."""
 
-    # • ───────────────────────────
-    # • ──── Colour. ────
-
-    def repaint(self, polygons=None):
-        if self.is_highlighted:
-            self.to_highlight(polygons)
-        else:
-            self.to_fade(polygons)
+        colour = colours.get_colour_by_name(values["colour_name"])
+        return cls(name, region=values["region"], faces=store.to_faces(values["indices"]), colour=colour, **kwargs)
 
-    def decolourize(self):
-        api.decolour_polygons(self.polygons)
-
-    # • ───────────────────────────
-    # • ──── Highlight/Fade ────
+    @property
+    def colour_name(self):
+        return self.colour.name
 
-    def to_highlight(self, polygons=None):
-        self.is_highlighted = True
-        api.colour_polygons(*self.colour.highlight_RGB(), polygons=polygons or list(self.polygons))
+    def rgb(self):
+        """The colour the stroke is displayed with, the palette of its store."""
 
-    def to_fade(self, polygons=None):
-        self.is_highlighted = False
-        api.colour_polygons(*self.colour.fade_RGB(), polygons=polygons or list(self.polygons))
+        return self.colour.highlight_RGB() if self.is_highlighted else self.colour.fade_RGB()
 
     # • ───────────────────────────
     # • ──── IO. ────
 
     def data(self):
-        indices = [api.get_index(polygon) for polygon in self.polygons]
-        return self.name, {"colour_name": self.colour.name, "indices": indices, "region": self.region}
+        return self.name, {"colour_name": self.colour.name, "indices": self.faces.tolist(), "region": self.region}
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+
+from pathlib import Path
+
+from warpaint.qt import QtWidgets, QtCore, QtGui
+
+from warpaint.core import instrumentation
+from warpaint.library.components import layouts, responses
+
+
+COLUMNS = ["Operation", "ms", "Maya Calls", "Components"]
+
+
+class InstrumentationUI(QtWidgets.QWidget):
+    def __init__(self, settings, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.settings = settings
+
+        self.setup_widgets()
+        self.setup_layouts()
+        self.bind_connections()
+
+    # • ───────────────────────────
+    # • ──── UI. ────
+
+    def setup_widgets(self):
+        self.enabled_checkbox = QtWidgets.QCheckBox("Record Operations")
+        self.enabled_checkbox.setToolTip("Time the paint, import and export operations and count their Maya calls.")
+
+        self.operations_tree = QtWidgets.QTreeWidget(columnCount=len(COLUMNS), rootIsDecorated=False)
+        self.operations_tree.setHeaderLabels(COLUMNS)
+        self.operations_tree.setMinimumHeight(120)
+
+        self.refresh_button = QtWidgets.QPushButton(icon=QtGui.QIcon("icons:revert.svg"), toolTip="Refresh")
+        self.clear_button = QtWidgets.QPushButton(icon=QtGui.QIcon("icons:delete.svg"), toolTip="Clear")
+        self.export_button = QtWidgets.QPushButton("Export Trace", icon=QtGui.QIcon("icons:save.svg"))
+        self.export_button.setToolTip("Export the recorded spans, loadable in chrome://tracing.")
+
+    def setup_layouts(self):
+        main_layout = QtWidgets.QVBoxLayout(self, contentsMargins=QtCore.QMargins(0, 0, 0, 0), spacing=6)
+
+        instrumentation_layout = QtWidgets.QVBoxLayout(spacing=6)
+        instrumentation_layout.addWidget(self.enabled_checkbox)
+        instrumentation_layout.addWidget(self.operations_tree)
+
+        buttons_layout = QtWidgets.QHBoxLayout(spacing=6)
+        buttons_layout.addWidget(self.export_button)
+        buttons_layout.addWidget(layouts.horizontal_divider(expand=True))
+        buttons_layout.addWidget(self.refresh_button)
+        buttons_layout.addWidget(self.clear_button)
+        instrumentation_layout.addLayout(buttons_layout)
+
+        main_layout.addWidget(layouts.to_group(instrumentation_layout, "Instrumentation"))
+
+    # • ———————————————————————————
+    # • ———— Populate. ————
+
+    def populate(self):
+        is_enabled = self.settings["instrumentation"] in [True, "true"]
+
+        self.enabled_checkbox.setChecked(is_enabled)
+        instrumentation.enable(is_enabled)
+
+        self.refresh()
+
+    def refresh(self):
+        self.operations_tree.clear()
+
+        for span in reversed(instrumentation.OPERATIONS):
+            data = span.data()
+            values = [data["name"], f"{data['ms']:.1f}", str(data["maya_calls"]), str(data["components"])]
+            self.operations_tree.addTopLevelItem(QtWidgets.QTreeWidgetItem(values))
+
+    # • ———————————————————————————
+    # • ———— Connections. ————
+
+    def bind_connections(self):
+        self.refresh_button.clicked.connect(self.refresh)
+        self.clear_button.clicked.connect(self.on_clear)
+        self.export_button.clicked.connect(self.on_export)
+
+    def on_clear(self):
+        instrumentation.clear()
+        self.refresh()
+
+    def on_export(self):
+        if not instrumentation.EVENTS:
+            responses.modal(self, False, "Nothing to Export", "Enable Record Operations and save the preferences first.")
+            return
+
+        default_path = Path(self.settings["root_dir"] or Path.home()).joinpath("warpaint_trace.json")
+        filepath, _ = QtWidgets.QFileDialog.getSaveFileName(self, "Export Trace", default_path.as_posix(), "Trace (*.json)")
+
+        if filepath:
+            instrumentation.export_trace(filepath)
+            responses.modal(self, True, "Success", f"Exported to: {filepath}")
+
+    # • ———————————————————————————
+    # • ———— Utils. ————
+
+    def save(self):
+        is_enabled = self.enabled_checkbox.isChecked()
+
+        self.settings["instrumentation"] = str(is_enabled).lower()
+        instrumentation.enable(is_enabled)
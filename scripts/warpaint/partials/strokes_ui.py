@@ -1,6 +1,8 @@
 from functools import partial
 from warpaint.qt import QtWidgets, QtCore, QtGui
 
+from warpaint.core import store
+from warpaint.library import transactions
 from warpaint.library.components import layouts, buttons, tiles, lineedits, responses
 from warpaint.model import strokes, colours
 
@@ -11,6 +13,9 @@ class StrokesGroup(QtWidgets.QWidget):
         self.regions = regions
         self.settings = settings
 
+        # -- Paints, displays and records the changes of the strokes, in the order of the widgets.
+        self.stroke_store = store.StrokeStore(palette=strokes.Stroke.rgb, recorder=transactions.record)
+
         self.setup_widgets()
         self.setup_layouts()
         self.bind_connections()
@@ -66,7 +71,7 @@ class StrokesGroup(QtWidgets.QWidget):
         if not stroke_edit:
             return
 
-        if len(stroke_edit.model.polygons) > 0:
+        if len(stroke_edit.model.faces) > 0:
             if not responses.question(self, "Remove Stroke", "This stroke has polygons selected. Are you sure you want to remove it?"):
                 return
 
@@ -82,17 +87,13 @@ class StrokesGroup(QtWidgets.QWidget):
         layouts.clear_radio_group(self.group)
         self.add_button.setEnabled(bool(region))
 
+        self.stroke_store.set_region(region)
+
         for stroke_edit in self.all_strokes():
-            if not region or stroke_edit.model.region == region:  # None/"" == All.
-                stroke_edit.model.to_highlight()
-                stroke_edit.setVisible(True)
-            else:
-                stroke_edit.model.to_fade()
-                stroke_edit.setVisible(False)
+            stroke_edit.setVisible(stroke_edit.model.is_highlighted)
 
     def on_region_renamed(self, prev_region, new_region):
-        for stroke_edit in self.all_strokes(prev_region):
-            stroke_edit.model.region = new_region
+        self.stroke_store.rename_region(prev_region, new_region)
 
     def on_region_deleted(self, region):
         for stroke_edit in self.all_strokes(region):
@@ -105,9 +106,13 @@ class StrokesGroup(QtWidgets.QWidget):
     # • ───────────────────────────
     # • ──── Utils. ────
 
-    def append_stroke(self, name, colour, region, polygons=None):
-        stroke = strokes.Stroke(name, colour=colour, region=region, polygons=polygons or set(), settings=self.settings)
-        stroke_edit = StrokeEdit(stroke, self.regions)
+    def append_stroke(self, name, colour, region):
+        stroke = strokes.Stroke(name, colour=colour, region=region, settings=self.settings)
+        return self.add_stroke(stroke)
+
+    def add_stroke(self, stroke):
+        self.stroke_store.add_stroke(stroke)
+        stroke_edit = StrokeEdit(stroke, self.regions, self.stroke_store)
 
         self.group.addButton(stroke_edit.radio_button)
         self.container.addWidget(stroke_edit)
@@ -116,9 +121,9 @@ class StrokesGroup(QtWidgets.QWidget):
     def scroll_to_bottom(self):
         QtCore.QTimer.singleShot(0, partial(layouts.scroll_to_bottom, self.scroll_area))
 
-    def clear(self):
+    def clear(self, decolourize=True):
         for stroke_edit in list(self.all_strokes()):
-            stroke_edit.delete()
+            stroke_edit.delete(decolourize)
 
     def current_stroke(self):
         active_radio = self.group.checkedButton()
@@ -138,15 +143,12 @@ class StrokesGroup(QtWidgets.QWidget):
 
     def import_data(self, mesh, data):
         self.clear()
+        self.stroke_store.mesh = mesh
 
         stroke_edit = None
-        colours_map = {colour.name: colour for colour in colours.COLOURS}
-
-        for stroke, values in data.items():
-            colour = colours_map.get(values["colour_name"], None) or colours.MISSING_COLOUR
-            polygons = set([f"{mesh}.f[{index}]" for index in values["indices"]])
 
-            stroke_edit = self.append_stroke(stroke, colour=colour, region=values["region"], polygons=polygons)
+        for name, values in data.items():
+            stroke_edit = self.add_stroke(strokes.Stroke.from_data(name, values, settings=self.settings))
 
         if stroke_edit:
             stroke_edit.focus()
@@ -154,10 +156,11 @@ class StrokesGroup(QtWidgets.QWidget):
 
 
 class StrokeEdit(QtWidgets.QWidget):
-    def __init__(self, stroke, regions, *args, **kwargs):
+    def __init__(self, stroke, regions, stroke_store, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._stroke = stroke
         self.regions = regions
+        self.stroke_store = stroke_store
 
         self.setup_widgets()
         self.setup_layouts()
@@ -208,7 +211,7 @@ class StrokeEdit(QtWidgets.QWidget):
 
     def populate(self):
         self.name_edit.setText(self.model.name)
-        self.set_colour()
+        self.show_colour()  # -- Displayed by the store when added.
 
     # • ———————————————————————————
     # • ———— Connections. ————
@@ -222,7 +225,7 @@ class StrokeEdit(QtWidgets.QWidget):
         self.region_menu.aboutToShow.connect(self.generate_region_menu)
 
         self.select_button.aboutToShow.connect(self.set_tooltip)
-        self.select_button.clicked.connect(lambda: self.model.select_polygons())
+        self.select_button.clicked.connect(lambda: self.stroke_store.select(self.model))
 
     def set_name(self, name):
         self.model.name = name
@@ -249,12 +252,15 @@ class StrokeEdit(QtWidgets.QWidget):
         if colour:
             self.model.colour = colour
 
+        self.show_colour()
+        self.stroke_store.repaint(self.model)
+
+    def show_colour(self):
         colour_icon = tiles.ColourTile.icon(colour=self.model.colour.highlight_RGB())
 
         self.colour_button.setIcon(colour_icon)
         self.colour_button.setToolTip(self.model.colour.description)
         self.set_placeholder()
-        self.model.repaint()
 
     def set_placeholder(self):
         self.name_edit.setPlaceholderText(f"{self.model.colour.alias or self.model.colour.name} Area Stroke Name")
@@ -264,7 +270,7 @@ class StrokeEdit(QtWidgets.QWidget):
         self.set_colour(random_colour)
 
     def set_tooltip(self):
-        count = len(self.model.polygons)
+        count = len(self.model.faces)
         self.select_button.setToolTip(f"Select {count} polygon(s).")
 
     def on_region_change(self, region):
@@ -282,8 +288,8 @@ class StrokeEdit(QtWidgets.QWidget):
         self.name_edit.setFocus()
         self.radio_button.click()
 
-    def delete(self):
-        self.model.decolourize()
+    def delete(self, decolourize=True):
+        self.stroke_store.remove_stroke(self.model, decolourize)
 
         self.setParent(None)
         self.deleteLater()
@@ -0,0 +1,40 @@
+from maya.api import OpenMaya as om2
+
+from warpaint.library import transactions
+
+
+def maya_useNewAPI():
+    """Tells Maya the plugin uses the Python API 2.0."""
+
+
+class TransactionCommand(om2.MPxCommand):
+    """Puts a War Paint transaction on the undo queue. The changes are applied by
+    the tool before the command runs, so doIt only takes the transaction over;
+    undoIt and redoIt replay its index deltas. Runs with no arguments and does
+    nothing when there is no pending transaction."""
+
+    def __init__(self):
+        super().__init__()
+        self.transaction = None
+
+    def doIt(self, args):
+        self.transaction = transactions.take_pending()
+
+    def undoIt(self):
+        self.transaction.undo()
+
+    def redoIt(self):
+        self.transaction.redo()
+
+    def isUndoable(self):
+        return self.transaction is not None
+
+
+def initializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin, "Black Swan Effect", "1.0")
+    plugin_fn.registerCommand(transactions.COMMAND_NAME, TransactionCommand)
+
+
+def uninitializePlugin(plugin):
+    plugin_fn = om2.MFnPlugin(plugin)
+    plugin_fn.deregisterCommand(transactions.COMMAND_NAME)
@@ -0,0 +1,157 @@
+"""Checks every .paint file of an asset library and writes a single QA report:
+coverage, unpainted islands, per-stroke face counts, areas and islands, empty
+strokes, names missing from or extra to a template, and L_/R_ symmetry. Files
+are inspected in parallel, without Maya.
+
+Usage:
+    python -m warpaint.qa assets/ --template template.paint --report qa.json
+    python -m warpaint.qa assets/hero.paint assets/villain.paint --mesh-dir exports --jobs 8
+
+The mesh of every .paint file is read from the OBJ file of the same name, next
+to it or in --mesh-dir. Without one, the topology stored in the document is
+checked, without areas nor symmetry."""
+
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+import argparse, json, os, sys
+
+import numpy as np
+
+from warpaint.core import documents, inspection, topology
+from warpaint.core.numpy_backend import NumpyBackend, NumpyMesh, read_obj
+
+
+MESH = "mesh"
+STORED, FAILED = "stored", "failed"
+MESH_EXTENSION = ".obj"
+
+
+# • ───────────────────────────
+# • ──── Inspection. ────
+
+
+def inspect_file(paint_path, template=None, axis=inspection.MIRROR_AXIS, mesh_dir=None):
+    """Inspects a .paint file against its mesh (see inspection.inspect_strokes).
+
+    Args:
+    - paint_path (str): The .paint file.
+    - template (list[str], optional): The required stroke names.
+    - axis (str): The mirror axis.
+    - mesh_dir (str, optional): Where to look for the OBJ files, next to the
+    .paint file by default.
+
+    Returns:
+    - dict: The report, with the paint, the mesh and the match status."""
+
+    paint_path = Path(paint_path)
+    mesh_path = Path(mesh_dir or paint_path.parent).joinpath(f"{paint_path.stem}{MESH_EXTENSION}")
+
+    document, backend = documents.read_document(paint_path), NumpyBackend()
+    result = {"paint": paint_path.as_posix(), "mesh": None}
+
+    if mesh_path.exists():
+        backend.add_mesh(MESH, read_obj(mesh_path))
+        document, status = documents.match_document(MESH, document, backend)
+
+        if status == documents.MISMATCHED:
+            return dict(result, mesh=mesh_path.as_posix(), status=FAILED, error="The mesh does not match the paint.")
+
+        result.update(mesh=mesh_path.as_posix(), status=status)
+
+    elif "topology" in document:
+        stored_topology = topology.from_data(document["topology"])
+        backend.add_mesh(MESH, NumpyMesh(stored_topology.face_counts, stored_topology.face_vertices, np.zeros((stored_topology.vertex_count, 3))))
+        result["status"] = STORED
+
+    else:
+        return dict(result, status=FAILED, error=f"No {MESH_EXTENSION} mesh nor stored topology.")
+
+    report = inspection.inspect_strokes(MESH, document["strokes"], template, axis, geometry=result["status"] != STORED, backend=backend)
+    return dict(result, **report.data())
+
+
+def _inspect(template, axis, mesh_dir, paint_path):
+    try:
+        return inspect_file(paint_path, template, axis, mesh_dir)
+    except Exception as err:
+        return {"paint": paint_path, "status": FAILED, "error": str(err)}
+
+
+def run_qa(paint_paths, template=None, axis=inspection.MIRROR_AXIS, mesh_dir=None, workers=1):
+    """Inspects the .paint files over a process pool.
+
+    Returns:
+    - dict: The summary and the report of every file, in order."""
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(partial(_inspect, template, axis, mesh_dir), paint_paths))
+
+    inspected = [result for result in results if result["status"] != FAILED]
+    summary = {
+        "files": len(results),
+        "failed": len(results) - len(inspected),
+        "with_issues": sum(1 for result in inspected if result["issues"]),
+        "coverage": float(np.mean([result["coverage"] for result in inspected])) if inspected else None,
+    }
+
+    return {"summary": summary, "files": results}
+
+
+def collect_paint_files(paths):
+    """Expands directories into the .paint files they hold, recursively."""
+
+    paint_paths = []
+
+    for path in map(Path, paths):
+        paint_paths.extend(sorted(path.rglob(f"*{documents.FILE_EXTENSION}")) if path.is_dir() else [path])
+
+    return [path.resolve().as_posix() for path in paint_paths]
+
+
+def read_template(filepath):
+    """Reads the required stroke names, from a .paint file or a JSON list."""
+
+    content = json.loads(Path(filepath).read_text())
+    return list(content["strokes"]) if isinstance(content, dict) else list(content)
+
+
+# • ───────────────────────────
+# • ──── CLI. ────
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="warpaint.qa", description="Check the paint coverage, strokes and symmetry of many .paint files.")
+
+    parser.add_argument("paths", nargs="+", help="The .paint files, or directories to search for them.")
+    parser.add_argument("--template", help="A .paint file or a JSON list of the required stroke names.")
+    parser.add_argument("--mesh-dir", help=f"Where the {MESH_EXTENSION} meshes are, next to the .paint files by default.")
+    parser.add_argument("--axis", default=inspection.MIRROR_AXIS, choices=["x", "y", "z"], help="The mirror axis of the L_/R_ strokes.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="The number of worker processes.")
+    parser.add_argument("--report", help="Write the report to this JSON file.")
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    template = read_template(args.template) if args.template else None
+    report = run_qa(collect_paint_files(args.paths), template, args.axis, args.mesh_dir, max(1, args.jobs))
+
+    for result in report["files"]:
+        if result["status"] == FAILED:
+            print(f"{FAILED:<12} {result['paint']}  {result['error']}")
+            continue
+
+        issues = ", ".join(f"{len(result[key])} {key}" for key in ["empty", "missing", "extra", "unpaired", "asymmetric"] if result[key])
+        print(f"{result['status']:<12} {result['paint']}  {result['coverage']:.1%} painted, {result['unpainted_islands']} unpainted island(s)  {issues}")
+
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=4))
+
+    return 1 if report["summary"]["failed"] or report["summary"]["with_issues"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,14 +15,21 @@ if binding == "PySide6":
     import shiboken6 as shiboken  # type: ignore
 
     from PySide6 import QtCore, QtGui, QtWidgets, QtSvg  # type: ignore
-    from PySide6 import QtSvgWidgets, QtWebEngineWidgets, QtWebEngineCore  # type: ignore
+    from PySide6 import QtSvgWidgets  # type: ignore
 
     # QtGui.QAction -> PySide6 Syntax.
     # QtGui.QShortcut -> PySide6 Syntax.
+    # QtGui.QActionGroup -> PySide6 Syntax.
 
     QSvgWidget = QtSvgWidgets.QSvgWidget
-    QWebEngineView = QtWebEngineWidgets.QWebEngineView
-    QWebEnginePage = QtWebEngineCore.QWebEnginePage
+
+    try:  # -- A separate wheel outside Maya, e.g. for the benchmarks.
+        from PySide6 import QtWebEngineWidgets, QtWebEngineCore  # type: ignore
+
+        QWebEngineView = QtWebEngineWidgets.QWebEngineView
+        QWebEnginePage = QtWebEngineCore.QWebEnginePage
+    except ImportError:
+        QWebEngineView = QWebEnginePage = None
 
 
 elif binding == "PySide2":
@@ -32,6 +39,7 @@ elif binding == "PySide2":
 
     QtGui.QAction = QtWidgets.QAction  # PySide2 -> PySide6 Syntax.
     QtGui.QShortcut = QtWidgets.QShortcut  # PySide2 -> PySide6 Syntax.
+    QtGui.QActionGroup = QtWidgets.QActionGroup  # PySide2 -> PySide6 Syntax.
 
     QSvgWidget = QtSvg.QSvgWidget
     QWebEngineView = QtWebEngineWidgets.QWebEngineView
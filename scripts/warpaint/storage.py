@@ -0,0 +1,154 @@
+"""Converts the .paint files of a library to and from manifests in a shared
+object store, where every stroke and topology is stored once, however many
+files hold it.
+
+Usage:
+    python -m warpaint.storage pack assets/  # Into assets/.objects.
+    python -m warpaint.storage pack assets/hero.paint --objects /shared/objects
+    python -m warpaint.storage unpack assets/
+    python -m warpaint.storage prune assets/  # Count the blocks no manifest refers to.
+    python -m warpaint.storage prune assets/ shots/ --yes  # Delete them, from every library using the store.
+
+Manifests keep the .paint extension and are read transparently by the tool."""
+
+from pathlib import Path
+import argparse, json, sys
+
+from warpaint.core import documents, objects
+from warpaint.qa import collect_paint_files
+
+
+# • ───────────────────────────
+# • ──── Commands. ────
+
+
+def run_pack(args):
+    before, after = 0, 0
+
+    for path in map(Path, collect_paint_files(args.paths)):
+        document, store = documents.open_document(path)
+        before += path.stat().st_size
+
+        if not store:
+            store = objects.ObjectStore(args.objects or _library_root(args.paths, path).joinpath(objects.OBJECTS_DIRNAME))
+            documents.write_document(path, document, store)
+        else:
+            store.add_referrer(path)  # -- Manifests packed before referrers were recorded.
+
+        after += path.stat().st_size
+
+    print(f"Manifests: {_size(before)} -> {_size(after)}.")
+    return 0
+
+
+def run_unpack(args):
+    for path in collect_paint_files(args.paths):
+        document, store = documents.open_document(path)
+
+        if store:
+            documents.write_document(path, document)
+            store.remove_referrer(path)
+
+    return 0
+
+
+def run_prune(args):
+    """Deletes the blocks of the stores no manifest under the paths refers to, or
+    only counts them without --yes. As a store may be shared by several libraries,
+    it is skipped unless every manifest recorded as written to it is among the
+    paths."""
+
+    stores, manifests = {}, {}
+
+    for path in collect_paint_files(args.paths):
+        manifest = json.loads(Path(path).read_text())
+
+        if objects.is_manifest(manifest):
+            directory = objects.manifest_store(path, manifest).directory.resolve()
+            stores.setdefault(directory, set()).update(objects.manifest_keys(manifest))
+            manifests.setdefault(directory, set()).add(Path(path).resolve().as_posix())
+
+    status = 0
+
+    for directory, keys in stores.items():
+        store = objects.ObjectStore(directory)
+        referrers = store.referrers()
+        live_referrers = {referrer for referrer in referrers if _refers_to(referrer, directory)}
+
+        unrecorded, unknown = manifests[directory] - referrers, live_referrers - manifests[directory]
+
+        if unrecorded:
+            print(f"{directory.as_posix()}: skipped, {len(unrecorded)} manifest(s) not recorded in the store, e.g. {min(unrecorded)}. Pack every library using it first.")
+            status = 1
+        elif unknown:
+            print(f"{directory.as_posix()}: skipped, {len(unknown)} other manifest(s) use the store, e.g. {min(unknown)}. Prune them along.")
+            status = 1
+        elif not args.yes:
+            print(f"{directory.as_posix()}: {len(store.keys() - keys)} unused block(s), run with --yes to delete them.")
+        else:
+            for referrer in referrers - live_referrers:
+                store.remove_referrer(referrer)
+
+            print(f"{directory.as_posix()}: {store.prune(keys)} unused block(s) deleted.")
+
+    return status
+
+
+def _refers_to(filepath, directory):
+    """Whether the file is still a manifest of the store, e.g. neither deleted nor unpacked."""
+
+    filepath = Path(filepath)
+
+    if not filepath.exists():
+        return False
+
+    manifest = json.loads(filepath.read_text())
+    return objects.is_manifest(manifest) and objects.manifest_store(filepath, manifest).directory.resolve() == directory
+
+
+def _library_root(paths, path):
+    """The directory given on the command line which holds the file."""
+
+    for root in map(Path, paths):
+        if root.is_dir() and root.resolve() in path.resolve().parents:
+            return root
+
+    return path.parent
+
+
+def _size(size):
+    return f"{size / 1024 ** 2:.1f} MB"
+
+
+# • ───────────────────────────
+# • ──── CLI. ────
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="warpaint.storage", description="Store .paint files in a shared object store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = subparsers.add_parser("pack", help="Convert .paint files into manifests.")
+    pack_parser.add_argument("paths", nargs="+", help="The .paint files, or directories to search for them.")
+    pack_parser.add_argument("--objects", help=f"The object store, a '{objects.OBJECTS_DIRNAME}' folder in the given directory by default.")
+    pack_parser.set_defaults(run=run_pack)
+
+    unpack_parser = subparsers.add_parser("unpack", help="Convert manifests back into plain .paint files.")
+    unpack_parser.add_argument("paths", nargs="+", help="The .paint files, or directories to search for them.")
+    unpack_parser.set_defaults(run=run_unpack)
+
+    prune_parser = subparsers.add_parser("prune", help="Delete the blocks no manifest refers to.")
+    prune_parser.add_argument("paths", nargs="+", help="All the .paint files of the stores, or their directories.")
+    prune_parser.add_argument("--yes", action="store_true", help="Delete the unused blocks, only counted otherwise.")
+    prune_parser.set_defaults(run=run_prune)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,23 +1,35 @@
+from contextlib import contextmanager
+import re
+
 from maya import cmds
+import numpy as np
 from warpaint.qt import QtWidgets, QtCore, QtGui
 
 
+from warpaint.core import blending, deformation, framing
 from warpaint.library import api
-from warpaint.library.components import layouts
+from warpaint.library.components import layouts, responses
 from warpaint.library.utils import blendshapes
 
 
 FOLLICLE_NAME, BLENDSHAPE, ALIAS = "warPaintFollicle", "warPaint", "ShapeShift"
 CAMERA_NAME, GROUP_NAME = "warPaintCamera", "warPaintGroup"
+TRACKING_GROUP = "warPaintTracking"
 CAMERA_OFFSET = 42
+PREVIEW_INTERVAL = 16  # -- ms, about the frame rate of the viewport.
+STATS_COLUMNS = ["Stroke", "Mean", "Max", f"P{deformation.PERCENTILE}", "Area %", "Normal °"]
 
 
 class BlenderUI(QtWidgets.QWidget):
     colours_changed = QtCore.Signal()
 
-    def __init__(self, settings, *args, **kwargs):
+    def __init__(self, settings, painter, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.settings = settings
+        self.painter = painter
+        self.deformation = None
+        self.point_blend = None
+        self.previous_camera = None  # -- Looked through before tracking.
 
         self.setup_widgets()
         self.setup_layout()
@@ -42,13 +54,30 @@ class BlenderUI(QtWidgets.QWidget):
         self.unblend_button = QtWidgets.QPushButton(icon=QtGui.QIcon("icons:delete.svg"), toolTip="Remove BlendShape")
         self.unblend_button.setProperty("state", "error_hover")
 
+        self.direct_checkbox = QtWidgets.QCheckBox("Direct Preview")
+        self.direct_checkbox.setToolTip("Interpolate the points instead of creating a blendShape, smoother on heavy meshes.")
+
         self.blend_slider = QtWidgets.QSlider(QtCore.Qt.Horizontal, minimum=0, maximum=100)
+        self.preview_timer = QtCore.QTimer(self, singleShot=True, interval=PREVIEW_INTERVAL)
 
-        self.track_button = QtWidgets.QPushButton("Track Polygon")
+        self.track_button = QtWidgets.QPushButton("Track Polygons")
+        self.track_button.setToolTip("Create a follicle and a camera for every selected face.")
         self.track_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
+        self.track_strokes_button = QtWidgets.QPushButton("Track Strokes")
+        self.track_strokes_button.setToolTip("Create a follicle and a camera for every visible stroke.")
+        self.track_strokes_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
         self.untrack_button = QtWidgets.QPushButton(icon=QtGui.QIcon("icons:delete.svg"), toolTip="Untrack Polygon")
         self.untrack_button.setProperty("state", "error_hover")
 
+        self.compare_button = QtWidgets.QPushButton("Compare Strokes")
+        self.compare_button.setToolTip("Measure the displacement, area change and normal deviation of every stroke.")
+        self.compare_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
+        self.heatmap_checkbox = QtWidgets.QCheckBox("Heatmap", toolTip="Colour the base mesh by displacement.")
+
+        self.stats_tree = QtWidgets.QTreeWidget(columnCount=len(STATS_COLUMNS), rootIsDecorated=False)
+        self.stats_tree.setHeaderLabels(STATS_COLUMNS)
+        self.stats_tree.setMinimumHeight(120)
+
     def setup_layout(self):
         main_layout = QtWidgets.QVBoxLayout(self)
 
@@ -63,6 +92,7 @@ class BlenderUI(QtWidgets.QWidget):
 
         grid_layout.addWidget(self.blend_button, 2, 0, 1, 2)
         grid_layout.addWidget(self.unblend_button, 2, 2)
+        grid_layout.addWidget(self.direct_checkbox, 3, 0, 1, 3)
 
         main_layout.addWidget(layouts.to_group(grid_layout, "BlendShape Setup"))
         main_layout.addStretch()
@@ -73,9 +103,18 @@ class BlenderUI(QtWidgets.QWidget):
 
         track_layout = QtWidgets.QHBoxLayout(spacing=6)
         track_layout.addWidget(self.track_button)
+        track_layout.addWidget(self.track_strokes_button)
         track_layout.addWidget(self.untrack_button)
         main_layout.addWidget(layouts.to_group(track_layout, "Track Polygon"))
 
+        deformation_layout = QtWidgets.QVBoxLayout(spacing=6)
+        compare_layout = QtWidgets.QHBoxLayout(spacing=6)
+        compare_layout.addWidget(self.compare_button)
+        compare_layout.addWidget(self.heatmap_checkbox)
+        deformation_layout.addLayout(compare_layout)
+        deformation_layout.addWidget(self.stats_tree)
+        main_layout.addWidget(layouts.to_group(deformation_layout, "Deformation"))
+
     # • ———————————————————————————
     # • ———— Connections. ————
 
@@ -86,10 +125,15 @@ class BlenderUI(QtWidgets.QWidget):
         self.unblend_button.clicked.connect(self.remove_blendshape)
 
         self.blend_slider.valueChanged.connect(self.on_blend_change)
+        self.preview_timer.timeout.connect(self.apply_preview)
 
         self.track_button.clicked.connect(self.track_polygon)
+        self.track_strokes_button.clicked.connect(self.track_strokes)
         self.untrack_button.clicked.connect(self.untrack_polygon)
 
+        self.compare_button.clicked.connect(self.on_compare)
+        self.heatmap_checkbox.toggled.connect(self.on_heatmap_toggle)
+
     def add_base(self):
         selection = cmds.filterExpand(cmds.ls(selection=True), selectionMask=12)
         self.base_mesh.setText(selection[0] if selection else "")
@@ -99,6 +143,13 @@ class BlenderUI(QtWidgets.QWidget):
         self.morph_mesh.setText(selection[0] if selection else "")
 
     def on_blend_change(self, value):
+        if self.point_blend is not None:
+            # -- Coalesce the slider ticks: the latest value is written once per frame.
+            if not self.preview_timer.isActive():
+                self.preview_timer.start()
+
+            return
+
         blendshape = f"{BLENDSHAPE}.{ALIAS}"
 
         if cmds.objExists(blendshape):
@@ -117,51 +168,188 @@ class BlenderUI(QtWidgets.QWidget):
         if base_mesh == morph_mesh:
             return
 
+        self.stop_preview()
         blendshapes.delete_blendshape(morph_mesh, blendshape=BLENDSHAPE)
-        blendshapes.create_blendshape(base_mesh, morph_mesh, name=BLENDSHAPE, alias=ALIAS)
 
-        self.blend_button.setText("Blendshape created!")
+        if self.direct_checkbox.isChecked():
+            try:
+                self.point_blend = blending.PointBlend(base_mesh, morph_mesh)
+            except ValueError as err:
+                responses.modal(self, False, "Failed to Blend", str(err))
+                return
+
+            cmds.hide(morph_mesh)
+            self.apply_preview()
+        else:
+            blendshapes.create_blendshape(base_mesh, morph_mesh, name=BLENDSHAPE, alias=ALIAS)
+
+        self.blend_button.setText("Preview created!" if self.point_blend else "Blendshape created!")
         default_text = self.blend_button.property("default_text")
         QtCore.QTimer.singleShot(2000, lambda: self.blend_button.setText(default_text))
 
     def remove_blendshape(self):
+        self.stop_preview()
+
         morph_mesh = self.morph_mesh.text()
         blendshapes.delete_blendshape(morph_mesh, blendshape=BLENDSHAPE)
 
         self.base_mesh.clear()
         self.morph_mesh.clear()
 
+    def apply_preview(self):
+        if self.point_blend is not None:
+            self.point_blend.set_weight(self.blend_slider.value() / 100.0)
+
+    def stop_preview(self):
+        """Restores the base mesh's points, if previewing directly."""
+
+        self.preview_timer.stop()
+
+        if self.point_blend is not None and cmds.objExists(self.point_blend.base_mesh):
+            self.point_blend.restore()
+
+        self.point_blend = None
+
     def track_polygon(self):
-        self.untrack_polygon()
+        """Tracks every selected face with its own follicle and camera."""
 
-        selection = cmds.filterExpand(selectionMask=34)
-        selection = selection[0] if selection else None
+        selection = cmds.filterExpand(selectionMask=34) or []
+        self.track({mesh: framing.frame_faces(mesh, indices) for mesh, indices in api.group_polygons(selection).items()})
 
-        if not selection:
+    def track_strokes(self):
+        """Tracks every visible stroke of the Paint tab with its own follicle and
+        camera, attached to the face closest to the stroke's centroid."""
+
+        mesh = self.painter.mesh.text()
+
+        if not cmds.objExists(mesh):
             return
 
-        # -- Create Follicle.
-        follicle = blendshapes.create_centered_follicle(face=selection, name=FOLLICLE_NAME)
-        follicle_position = cmds.xform(follicle, query=True, translation=True)
+        # -- Keyed by position, as names may be empty or duplicated.
+        stroke_edits = self.painter.strokes_group.all_strokes(visible_only=True)
+        groups = {f"{index}_{edit.model.name}": edit.model.faces for index, edit in enumerate(stroke_edits)}
+
+        self.track({mesh: framing.frame_groups(mesh, groups)})
+
+    def track(self, mesh_framings):
+        """Creates the follicles and cameras of all the framings, of all the meshes
+        at once, under a single group, and looks through the first camera.
+
+        Args:
+        - mesh_framings (dict[str, list[framing.Framing]]): The framings of every mesh."""
+
+        self.untrack_polygon()
+        meshes, uvs, tracked = [], [], []
+
+        for mesh, framings in mesh_framings.items():
+            if not framings:
+                continue
+
+            mesh_uvs = api.get_face_uvs(mesh, [item.face for item in framings])
+
+            if np.isnan(mesh_uvs).any():
+                responses.modal(self, False, "Missing UVs", f"Follicles need UVs, some faces of {mesh} have none.")
+                continue
 
-        # -- Create Camera.
-        camera = cmds.camera(name=CAMERA_NAME)[0]
-        camera_group = cmds.group(camera, name=GROUP_NAME)
+            meshes += [mesh] * len(framings)
+            uvs.append(mesh_uvs)
+            tracked += framings
 
-        # -- Define Camera Position.
-        face_normal = api.get_face_normal(selection)
-        camera_position = [v + o for v, o in zip(follicle_position, face_normal * CAMERA_OFFSET)]
-        cmds.xform(camera, translation=camera_position)
+        if not tracked:
+            return
+
+        if not cmds.objExists(TRACKING_GROUP):
+            cmds.group(empty=True, name=TRACKING_GROUP)
 
-        # -- Constraint.
-        cmds.pointConstraint(follicle, camera_group, maintainOffset=True)
-        cmds.delete(cmds.aimConstraint(follicle, camera, aimVector=[0, 0, -1]))
+        labels = [re.sub(r"\W", "_", item.name) for item in tracked]
+        follicles = blendshapes.create_follicles(meshes, np.concatenate(uvs), [f"{FOLLICLE_NAME}_{label}" for label in labels], parent=TRACKING_GROUP)
 
-        cmds.lookThru(camera)
+        matrices = framing.look_at_matrices([item.centroid for item in tracked], [item.normal for item in tracked], CAMERA_OFFSET)
+        cameras = blendshapes.create_tracking_cameras(follicles, matrices, [f"{CAMERA_NAME}_{label}" for label in labels], parent=TRACKING_GROUP)
+
+        self.previous_camera = cmds.lookThru(query=True)
+        cmds.lookThru(cameras[0])
 
     def untrack_polygon(self):
-        for name in [FOLLICLE_NAME, CAMERA_NAME, GROUP_NAME]:
+        """Deletes the tracking nodes and looks through the camera used before
+        tracking again, if it still exists."""
+
+        if self.previous_camera and cmds.objExists(self.previous_camera):
+            cmds.lookThru(self.previous_camera)
+
+        self.previous_camera = None
+
+        for name in [TRACKING_GROUP, FOLLICLE_NAME, CAMERA_NAME, GROUP_NAME]:
             if cmds.objExists(name):
                 cmds.delete(name)
 
-        cmds.lookThru("persp")
+    def on_compare(self):
+        """Compares the morph against the base mesh, for the whole mesh and every
+        stroke of the Paint tab, whose faces are matched by index."""
+
+        base_mesh, morph_mesh = self.base_mesh.text(), self.morph_mesh.text()
+
+        if not all(mesh and cmds.objExists(mesh) for mesh in [base_mesh, morph_mesh]) or base_mesh == morph_mesh:
+            responses.modal(self, False, "Invalid Meshes", "Add a base and a morph mesh first.")
+            return
+
+        try:
+            with self.blend_disabled():
+                self.deformation = deformation.compare(base_mesh, morph_mesh)
+
+            stroke_edits = self.painter.strokes_group.all_strokes()
+            stats = [self.deformation.stats("All")]
+            stats += [self.deformation.stats(edit.model.name, edit.model.faces) for edit in stroke_edits]
+
+        except ValueError as err:
+            self.deformation = None
+            responses.modal(self, False, "Failed to Compare", str(err))
+            return
+
+        self.stats_tree.clear()
+
+        for stroke_stats in stats:
+            values = [stroke_stats.name, f"{stroke_stats.mean:.4f}", f"{stroke_stats.max:.4f}", f"{stroke_stats.percentile:.4f}"]
+            values += [f"{stroke_stats.area_change * 100:+.1f}", f"{stroke_stats.normal_deviation:.1f} / {stroke_stats.max_normal_deviation:.1f}"]
+            self.stats_tree.addTopLevelItem(QtWidgets.QTreeWidgetItem(values))
+
+        if self.heatmap_checkbox.isChecked():
+            deformation.show_heatmap(base_mesh, self.deformation)
+
+    def on_heatmap_toggle(self, checked):
+        base_mesh = self.base_mesh.text()
+
+        if checked:
+            if self.deformation is None:
+                self.on_compare()
+            elif cmds.objExists(base_mesh):
+                deformation.show_heatmap(base_mesh, self.deformation)
+
+        elif base_mesh:
+            api.remove_colours([base_mesh])
+            self.colours_changed.emit()
+
+    @contextmanager
+    def blend_disabled(self):
+        """Sets the blend to 0 while comparing, so that the base mesh's points
+        are not those of the morph."""
+
+        blendshape = f"{BLENDSHAPE}.{ALIAS}"
+        weight = cmds.getAttr(blendshape) if cmds.objExists(blendshape) else None
+
+        if weight:
+            cmds.setAttr(blendshape, 0)
+
+        preview_weight = self.point_blend.weight if self.point_blend else 0
+
+        if preview_weight:
+            self.point_blend.set_weight(0)
+
+        try:
+            yield
+        finally:
+            if weight:
+                cmds.setAttr(blendshape, weight)
+
+            if preview_weight:
+                self.point_blend.set_weight(preview_weight)
@@ -1,16 +1,16 @@
 from maya import cmds
 from pathlib import Path
-import json, collections
+import collections
 from functools import partial
 
 from warpaint.qt import QtWidgets, QtCore, QtGui
-from warpaint.library import api
 from warpaint.library.components import responses
-from warpaint.library.utils import hashing, explorer, clipboard
+from warpaint.core import documents, feathering, instrumentation, landmarks, masks, objects
+from warpaint.library.utils import explorer, clipboard, skinclusters
 
 
 EXTENSIONS = [".paint", ".tff"]
-FILE_EXTENSION = ".paint"
+FILE_EXTENSION = documents.FILE_EXTENSION
 
 
 class FilterProxyModel(QtCore.QSortFilterProxyModel):
@@ -97,6 +97,25 @@ class FilesUI(QtWidgets.QWidget):
 
         self.export_filename = QtWidgets.QLineEdit(placeholderText="Filename")
         self.export_button = QtWidgets.QPushButton("Export", icon=QtGui.QIcon("icons:folder_open.svg"))
+        self.landmarks_button = QtWidgets.QPushButton("Landmarks", icon=QtGui.QIcon("icons:save.svg"))
+        self.landmarks_button.setToolTip("Export the centroid, normal, bounding box, boundary and area of every stroke, as JSON and binary.")
+        self.weight_maps_button = QtWidgets.QPushButton("Weight Maps", icon=QtGui.QIcon("icons:save.svg"))
+        self.weight_maps_button.setToolTip("Export the feathered weight map of every stroke, as compressed arrays (.weights.npz).")
+        self.masks_button = QtWidgets.QPushButton("Masks", icon=QtGui.QIcon("icons:save.svg"))
+        self.masks_button.setToolTip("Export a UV mask of every stroke, as PNG images.")
+        self.object_store_checkbox = QtWidgets.QCheckBox("Object Store", checked=self.settings["object_store"] == "true")
+        self.object_store_checkbox.setToolTip(
+            f"Export .paint files as small manifests, their strokes stored once in the '{objects.OBJECTS_DIRNAME}' folder of the root directory and shared by all the files."
+        )
+
+        self.normals_checkbox = QtWidgets.QCheckBox("Match Normals", checked=True)
+        self.normals_checkbox.setToolTip("Only transfer onto faces facing the same way.")
+        self.transfer_button = QtWidgets.QPushButton("Transfer to Selected Mesh", icon=QtGui.QIcon("icons:open_in_new.svg"))
+        self.transfer_button.setToolTip("Project the current paint onto the selected mesh, regardless of its topology.")
+        self.weights_button = QtWidgets.QPushButton("Transfer Weights", icon=QtGui.QIcon("icons:open_in_new.svg"))
+        self.weights_button.setToolTip(
+            "Transfer the skin weights of the painted mesh onto the selected mesh, stroke by stroke. The strokes of the selected mesh are read from the selected .paint file, or projected from the current paint."
+        )
 
     def setup_layouts(self):
         main_layout = QtWidgets.QVBoxLayout(self)
@@ -112,9 +131,19 @@ class FilesUI(QtWidgets.QWidget):
 
         self.export_layout = QtWidgets.QHBoxLayout()
         self.export_layout.addWidget(self.export_filename)
+        self.export_layout.addWidget(self.object_store_checkbox)
         self.export_layout.addWidget(self.export_button)
+        self.export_layout.addWidget(self.landmarks_button)
+        self.export_layout.addWidget(self.weight_maps_button)
+        self.export_layout.addWidget(self.masks_button)
         main_layout.addLayout(self.export_layout)
 
+        transfer_layout = QtWidgets.QHBoxLayout()
+        transfer_layout.addWidget(self.normals_checkbox)
+        transfer_layout.addWidget(self.transfer_button)
+        transfer_layout.addWidget(self.weights_button)
+        main_layout.addLayout(transfer_layout)
+
     # • ———————————————————————————
     # • ———— Populate. ————
 
@@ -135,6 +164,12 @@ class FilesUI(QtWidgets.QWidget):
         self.file_system_tree.clicked.connect(self.on_populate_filename)
         self.file_system_tree.doubleClicked.connect(self.on_import)
         self.export_button.clicked.connect(self.on_export)
+        self.landmarks_button.clicked.connect(self.on_export_landmarks)
+        self.weight_maps_button.clicked.connect(self.on_export_weight_maps)
+        self.masks_button.clicked.connect(self.on_export_masks)
+        self.object_store_checkbox.toggled.connect(self.on_object_store_toggle)
+        self.transfer_button.clicked.connect(self.on_transfer)
+        self.weights_button.clicked.connect(self.on_transfer_weights)
 
     def on_select_directory(self):
         current_directory_str = self.directory_preview.text()
@@ -170,14 +205,13 @@ class FilesUI(QtWidgets.QWidget):
                 responses.modal(self, False, "Please select a mesh.")
                 return
 
-            data = json.loads(current_path.read_text())
-            data_hash = data.get("point_order_hash", None)
+            data, status = documents.match_document(selection, documents.read_document(current_path))
 
-            point_order = list(api.get_point_order(selection))
-            selection_hash = hashing.hash_str(str(point_order))
+            if status == documents.REMAPPED:
+                responses.modal(self, True, "Remapped", "The point order differs, the paint was remapped onto the mesh.")
 
-            if selection_hash != data_hash:
-                if not responses.question(self, "Warning", "The meshes do not match (different point order). Apply anyway?"):
+            elif status == documents.MISMATCHED:
+                if not responses.question(self, "Warning", "The meshes do not match (different point order). Apply anyway? To project onto a different topology, import on the original mesh and use Transfer instead."):
                     return
 
             self.paint.import_data(selection, data)
@@ -186,19 +220,12 @@ class FilesUI(QtWidgets.QWidget):
 
     def on_export(self):
         with self.loading():
-            filename = self.export_filename.text()
-            current_path = self.file_system_tree.get_path()
+            export_path = self._export_path()
 
-            if not filename:
-                responses.modal(self, False, "Warning", "Please enter a filename.")
+            if not export_path:
                 return
 
-            if not current_path:
-                responses.modal(self, False, "Warning", "Please select a directory.")
-                return
-
-            target_directory = current_path if current_path.is_dir() else current_path.parent
-            filepath = target_directory.joinpath(f"{filename}{FILE_EXTENSION}")
+            filepath = export_path.with_name(f"{export_path.name}{FILE_EXTENSION}")
 
             if filepath.exists():
                 if not responses.question(self, "Warning", f"File '{filepath.stem}' already exists. Overwrite?"):
@@ -207,9 +234,164 @@ class FilesUI(QtWidgets.QWidget):
             mesh, strokes_data = self.paint.export_data()
 
             if mesh and strokes_data:
-                point_order = list(api.get_point_order(mesh))
-                selection_hash = hashing.hash_str(str(point_order))
-                filepath.write_text(json.dumps({"point_order_hash": selection_hash, "strokes": strokes_data}, indent=4))
+                documents.write_document(filepath, documents.build_document(mesh, strokes_data), self._object_store())
+
+                responses.modal(self, True, "Success", f"Exported to: {filepath}")
+                return
+
+    def on_export_landmarks(self):
+        with self.loading():
+            export_path = self._export_path()
+
+            if not export_path:
+                return
+
+            mesh, strokes_data = self.paint.get_data()
+
+            if mesh and strokes_data:
+                json_path, _ = landmarks.write_landmarks(export_path, mesh, landmarks.extract_landmarks(mesh, strokes_data))
+                responses.modal(self, True, "Success", f"Exported to: {json_path.parent}")
+
+    def on_export_weight_maps(self):
+        with self.loading():
+            export_path = self._export_path()
+
+            if not export_path:
+                return
+
+            mesh, strokes_data = self.paint.get_data()
 
+            if mesh and strokes_data:
+                rings = int(self.settings["feather_rings"] or feathering.FEATHER_RINGS)
+                filepath = feathering.write_weight_maps(export_path, feathering.feather_strokes(mesh, strokes_data, rings=rings))
                 responses.modal(self, True, "Success", f"Exported to: {filepath}")
+
+    def on_export_masks(self):
+        resolution = int(self.settings["mask_resolution"] or masks.MASK_RESOLUTION)
+        resolution, is_accepted = QtWidgets.QInputDialog.getInt(self, "Masks", "Resolution, in pixels:", resolution, 16, 16384)
+
+        if not is_accepted:
+            return
+
+        self.settings["mask_resolution"] = str(resolution)
+
+        with self.loading():
+            export_path = self._export_path()
+
+            if not export_path:
                 return
+
+            mesh, strokes_data = self.paint.get_data()
+
+            if mesh and strokes_data:
+                filepaths = masks.write_masks(export_path, masks.rasterize_strokes(mesh, strokes_data, resolution=resolution, padding=2))
+                responses.modal(self, True, "Success", f"Exported {len(filepaths)} masks to: {export_path.parent}")
+
+    def on_object_store_toggle(self, checked):
+        self.settings["object_store"] = "true" if checked else "false"
+
+    def _object_store(self):
+        if not self.object_store_checkbox.isChecked():
+            return None
+
+        root_dir = Path(self.settings["root_dir"] or Path.home())
+        return objects.ObjectStore(root_dir.joinpath(objects.OBJECTS_DIRNAME))
+
+    def _export_path(self):
+        """The export filepath without extension, from the filename and the
+        selected directory."""
+
+        filename = self.export_filename.text()
+        current_path = self.file_system_tree.get_path()
+
+        if not filename:
+            responses.modal(self, False, "Warning", "Please enter a filename.")
+            return None
+
+        if not current_path:
+            responses.modal(self, False, "Warning", "Please select a directory.")
+            return None
+
+        target_directory = current_path if current_path.is_dir() else current_path.parent
+        return target_directory.joinpath(filename)
+
+    def on_transfer(self):
+        with self.loading():
+            source_mesh, target_mesh, strokes_data = self._transfer_meshes()
+
+            if not target_mesh:
+                return
+
+            message = f"Replace the current paint with its transfer onto '{target_mesh}'?"
+
+            if not self.paint.is_saved:
+                message += " All unsaved changes will be lost."
+
+            if not responses.question(self, "Warning", message):
+                return
+
+            min_dot = documents.NORMAL_AGREEMENT if self.normals_checkbox.isChecked() else None
+            target_strokes_data = documents.transfer_document(source_mesh, target_mesh, strokes_data, min_dot=min_dot)
+
+            self.paint.import_data(target_mesh, {"strokes": target_strokes_data})
+            self.paint.dirty()
+
+    def on_transfer_weights(self):
+        with self.loading():
+            source_mesh, target_mesh, strokes_data = self._transfer_meshes()
+
+            if not target_mesh:
+                return
+
+            current_path = self.file_system_tree.get_path()
+
+            if current_path and current_path.is_file() and current_path.suffix == FILE_EXTENSION:
+                document, status = documents.match_document(target_mesh, documents.read_document(current_path))
+
+                if status == documents.MISMATCHED:
+                    responses.modal(self, False, "Warning", f"'{current_path.name}' does not match the selected mesh.")
+                    return
+
+                target_strokes_data = document["strokes"]
+
+            else:
+                min_dot = documents.NORMAL_AGREEMENT if self.normals_checkbox.isChecked() else None
+                target_strokes_data = documents.transfer_document(source_mesh, target_mesh, strokes_data, min_dot=min_dot)
+
+            if not responses.question(self, "Warning", f"Transfer the skin weights of '{source_mesh}' onto '{target_mesh}'? This cannot be undone."):
+                return
+
+            try:
+                skin_cluster, weight_map = skinclusters.transfer_weights(source_mesh, target_mesh, strokes_data, target_strokes_data)
+
+            except ValueError as error:
+                responses.modal(self, False, "Warning", str(error))
+                return
+
+            constrained = int(weight_map.constrained.sum())
+            responses.modal(self, True, "Success", f"Transferred {len(weight_map.vertices)} vertices onto {skin_cluster}, {constrained} within matching strokes.")
+
+    def _transfer_meshes(self):
+        """The painted mesh, the selected mesh and the current strokes data, or
+        Nones when the selection cannot be transferred onto."""
+
+        selection = cmds.filterExpand(selectionMask=12)
+        target_mesh = selection[0] if selection else None
+
+        if not target_mesh:
+            responses.modal(self, False, "Please select a mesh.")
+            return None, None, None
+
+        source_mesh, strokes_data = self.paint.get_data()
+
+        if not source_mesh or not strokes_data:
+            return None, None, None
+
+        if source_mesh == target_mesh:
+            responses.modal(self, False, "Warning", "The selected mesh is already painted.")
+            return None, None, None
+
+        return source_mesh, target_mesh, strokes_data
+
+
+instrumentation.register(__name__, functions=False)
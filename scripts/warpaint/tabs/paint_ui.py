@@ -1,17 +1,33 @@
+from functools import partial
+import re
+
 from maya import cmds
+import numpy as np
 
 from warpaint.qt import QtWidgets, QtCore, QtGui
-from warpaint.library import api
+from warpaint.core import feathering, instrumentation, meshes, store
+from warpaint.core.store import counterpart_name
+from warpaint.library import api, transactions
 from warpaint.library.components import layouts, responses
+from warpaint.library.components.signals import DisableSignals
+from warpaint.library.setup.template import maya_window
+from warpaint.library.utils import deformers
+from warpaint.library.utils.painting import DragPaintContext
+from warpaint.library.utils.review import StrokeReview
 from warpaint.partials.regions_ui import Regions
 from warpaint.partials.strokes_ui import StrokesGroup
 
 
+MIRROR_AXES = ["x", "y", "z"]
+REVIEW_KEYS = {"Alt+Right": 1, "Alt+Left": -1}
+
+
 class PainterUI(QtWidgets.QWidget):
     def __init__(self, settings, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.settings = settings
         self.is_saved = True
+        self.review, self.review_strokes = None, []
 
         self.setup_widgets()
         self.setup_layouts()
@@ -33,6 +49,60 @@ class PainterUI(QtWidgets.QWidget):
         self.paint_button = QtWidgets.QPushButton(icon=QtGui.QIcon("icons:brush.svg"))
         self.paint_button.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Preferred)
 
+        self.drag_button = QtWidgets.QPushButton("drag", icon=QtGui.QIcon("icons:brush.svg"), checkable=True)
+        self.drag_button.setToolTip("Drag Paint: paint the faces under the cursor, hold Ctrl to erase.")
+        self.drag_context = DragPaintContext(self.on_drag_paint, self)
+
+        self.grow_button = QtWidgets.QPushButton("grow", toolTip="Grow the stroke by one ring, up to the other strokes.")
+        self.shrink_button = QtWidgets.QPushButton("shrink", toolTip="Shrink the stroke by one ring.")
+        self.fill_button = QtWidgets.QPushButton("fill", toolTip="Flood fill from the selected polygons up to the painted boundary.")
+        self.border_button = QtWidgets.QPushButton("border", toolTip="Select the border ring of the stroke.")
+
+        self.islands_button = QtWidgets.QToolButton(text="islands", toolTip="Find stray islands in the strokes.")
+        self.islands_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        self.islands_menu = QtWidgets.QMenu(self)
+        self.islands_menu.addAction("Report Islands", self.on_islands_report)
+        self.islands_menu.addAction("Keep Largest Island", self.on_keep_largest_island)
+        self.islands_menu.addAction("Select Strays", self.on_select_strays)
+        self.islands_button.setMenu(self.islands_menu)
+
+        self.mirror_button = QtWidgets.QToolButton(text="mirror", toolTip="Mirror L_/R_ strokes across an axis.")
+        self.mirror_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        self.mirror_menu = QtWidgets.QMenu(self)
+        self.mirror_menu.addAction("Mirror Stroke", self.on_mirror_stroke)
+        self.mirror_menu.addAction("Sync All Pairs", self.on_sync_pairs)
+        self.mirror_menu.addAction("Mirror Report", self.on_mirror_report)
+        self.mirror_menu.addSeparator()
+
+        self.axis_group = QtGui.QActionGroup(self, exclusive=True)
+        current_axis = self.settings["mirror_axis"] or MIRROR_AXES[0]
+
+        for axis in MIRROR_AXES:
+            action = self.mirror_menu.addAction(f"Axis {axis.upper()}")
+            action.setCheckable(True)
+            action.setChecked(axis == current_axis)
+            action.setData(axis)
+            self.axis_group.addAction(action)
+
+        self.mirror_button.setMenu(self.mirror_menu)
+
+        self.feather_button = QtWidgets.QToolButton(text="feather", toolTip="Turn strokes into deformer weights with a smooth falloff.")
+        self.feather_button.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+
+        self.feather_menu = QtWidgets.QMenu(self)
+        self.feather_menu.addAction("Feather to Cluster", self.on_feather_stroke)
+        self.feather_menu.addAction("Feather All to Clusters", self.on_feather_all)
+        self.feather_menu.addAction("Feather to Selected Deformer", self.on_feather_deformer)
+        self.feather_menu.addSeparator()
+        self.feather_menu.addAction("Feather Width...", self.on_feather_width)
+        self.feather_button.setMenu(self.feather_menu)
+
+        self.review_button = QtWidgets.QPushButton("review", checkable=True)
+        self.review_button.setToolTip("Step a camera through the visible strokes with Alt+Right and Alt+Left.")
+        self.review_shortcuts = []  # -- On the Maya window while reviewing.
+
         self.mode_group = QtWidgets.QButtonGroup(exclusive=True)
 
         self.replace_radio = QtWidgets.QRadioButton(icon=QtGui.QIcon("icons:cursor.svg"))
@@ -63,6 +133,17 @@ class PainterUI(QtWidgets.QWidget):
 
         main_layout.addWidget(self.strokes_group)
 
+        topology_layout = QtWidgets.QHBoxLayout(spacing=6)
+        topology_layout.addWidget(self.grow_button)
+        topology_layout.addWidget(self.shrink_button)
+        topology_layout.addWidget(self.fill_button)
+        topology_layout.addWidget(self.border_button)
+        topology_layout.addWidget(self.islands_button)
+        topology_layout.addWidget(self.mirror_button)
+        topology_layout.addWidget(self.feather_button)
+        topology_layout.addWidget(self.review_button)
+        main_layout.addLayout(topology_layout)
+
         radio_layout = QtWidgets.QHBoxLayout(spacing=24)
         radio_layout.addWidget(self.replace_radio)
         radio_layout.addWidget(self.append_radio)
@@ -71,6 +152,7 @@ class PainterUI(QtWidgets.QWidget):
         actions_layout = QtWidgets.QHBoxLayout(spacing=6)
         actions_layout.addLayout(radio_layout)
         actions_layout.addWidget(self.paint_button)
+        actions_layout.addWidget(self.drag_button)
         actions_layout.addWidget(self.clean_up_button)
 
         main_layout.addLayout(actions_layout)
@@ -89,8 +171,20 @@ class PainterUI(QtWidgets.QWidget):
         self.regions.region_renamed.connect(self.dirty)
         self.regions.region_deleted.connect(self.dirty)
         self.paint_button.clicked.connect(self.on_paint)
+        self.drag_button.toggled.connect(self.on_drag_toggle)
+        self.drag_context.pressed.connect(partial(transactions.begin, "drag"))
+        self.drag_context.released.connect(transactions.end)
+        self.drag_context.finished.connect(self.on_drag_finished)
         self.clean_up_button.clicked.connect(self.cleanup)
 
+        self.grow_button.clicked.connect(self.on_grow)
+        self.shrink_button.clicked.connect(self.on_shrink)
+        self.fill_button.clicked.connect(self.on_fill)
+        self.border_button.clicked.connect(self.on_border)
+        self.axis_group.triggered.connect(self.on_axis_change)
+
+        self.review_button.toggled.connect(self.on_review_toggle)
+
     def dirty(self):
         self.is_saved = False
 
@@ -99,26 +193,412 @@ class PainterUI(QtWidgets.QWidget):
         stroke = self.strokes_group.current_stroke()
 
         selection = cmds.filterExpand(selectionMask=34)
-        polygons = set(self._validate_selection(selection))
+        polygons = list(self._validate_selection(selection))
 
         if polygons:
-            if mode == self.remove_radio:
-                self._remove_paint(polygons)
-
-            if not stroke:
+            if mode != self.remove_radio and not stroke:
                 responses.modal(self, False, "No Stroke", "No stroke selected.")
                 return
 
-            if mode == self.append_radio and stroke:
-                self._append_paint(polygons, stroke)
-            elif mode == self.replace_radio and stroke:
-                self._replace_paint(polygons, stroke)
+            with transactions.transaction("remove" if mode == self.remove_radio else "paint"):
+                self._paint(api.get_indices(polygons), stroke, self._paint_mode())
+
+        self.dirty()
+
+    def on_drag_toggle(self, checked):
+        if not checked:
+            self.drag_context.exit()
+            return
+
+        mesh = self._current_mesh()
+
+        if not mesh:
+            responses.modal(self, False, "No Mesh", "Select a mesh or polygons to drag paint.")
+            with DisableSignals(self.drag_button):
+                self.drag_button.setChecked(False)
+            return
+
+        self.drag_context.enter(mesh)
+
+    def on_drag_finished(self):
+        transactions.end()
+
+        with DisableSignals(self.drag_button):
+            self.drag_button.setChecked(False)
+
+    def on_drag_paint(self, faces, erase, is_first):
+        mode = store.REMOVE if erase else self._paint_mode()
+        stroke = self.strokes_group.current_stroke()
+
+        if not stroke and mode != store.REMOVE:
+            return
+
+        # -- Only the first flush replaces, the following ones extend the drag.
+        if mode == store.REPLACE and not is_first:
+            mode = store.APPEND
+
+        # -- Joins the transaction of the drag (see bind_connections), undone at once.
+        with transactions.transaction("drag"):
+            self._paint(list(faces), stroke, mode)
 
         self.dirty()
 
+    # • ———————————————————————————
+    # • ———— Feather. ————
+
+    def on_feather_stroke(self):
+        stroke, mesh, _ = self._stroke_topology()
+
+        if stroke:
+            self._feather_to_clusters(mesh, [stroke])
+
+    def on_feather_all(self):
+        mesh, _ = self._mesh_topology()
+
+        if mesh:
+            self._feather_to_clusters(mesh, [stroke for stroke in self.strokes_group.all_strokes() if len(stroke.model.faces)])
+
+    def on_feather_deformer(self):
+        stroke, mesh, _ = self._stroke_topology()
+
+        if not stroke:
+            return
+
+        selection = cmds.ls(selection=True, type="geometryFilter")
+
+        if not selection:
+            responses.modal(self, False, "No Deformer", "Select a deformer deforming the mesh, e.g. a cluster.")
+            return
+
+        weight_maps = self._feather(mesh, [stroke])
+
+        try:
+            deformers.set_weights(selection[0], mesh, weight_maps.dense(weight_maps.names[0]))
+
+        except ValueError as error:
+            responses.modal(self, False, "Warning", str(error))
+
+    def on_feather_width(self):
+        rings, is_accepted = QtWidgets.QInputDialog.getInt(self, "Feather Width", "Falloff width, in edge lengths:", self._feather_rings(), 1, 100)
+
+        if is_accepted:
+            self.settings["feather_rings"] = str(rings)
+
+    def _feather(self, mesh, stroke_edits):
+        """Feathers the strokes in one batch, keyed by position as names may be
+        empty or duplicated."""
+
+        strokes_data = {str(index): {"indices": stroke_edit.model.faces} for index, stroke_edit in enumerate(stroke_edits)}
+        return feathering.feather_strokes(mesh, strokes_data, rings=self._feather_rings())
+
+    def _feather_to_clusters(self, mesh, stroke_edits):
+        if not stroke_edits:
+            responses.modal(self, False, "Nothing to Feather", "Paint some strokes first.")
+            return
+
+        weight_maps = self._feather(mesh, stroke_edits)
+        clusters = []
+
+        for name, stroke_edit in zip(weight_maps.names, stroke_edits):
+            label = re.sub(r"\W", "_", stroke_edit.model.name or "stroke")
+            clusters.append(deformers.create_cluster(mesh, f"{label}_featherCluster", weight_maps.dense(name))[1])
+
+        cmds.select(clusters)
+
+    def _feather_rings(self):
+        return int(self.settings["feather_rings"] or feathering.FEATHER_RINGS)
+
+    # • ———————————————————————————
+    # • ———— Review. ————
+
+    def on_review_toggle(self, checked):
+        """Starts reviewing the visible strokes, framed all at once, or stops and
+        restores the previous camera."""
+
+        if not checked:
+            if self.review:
+                self.review.stop()
+
+            self.review = None
+            self._remove_review_shortcuts()
+            return
+
+        mesh = self._current_mesh()
+        stroke_edits = list(self.strokes_group.all_strokes(visible_only=True))
+
+        if not mesh or not any(len(stroke_edit.model.faces) for stroke_edit in stroke_edits):
+            responses.modal(self, False, "Nothing to Review", "Paint some strokes first.")
+            with DisableSignals(self.review_button):
+                self.review_button.setChecked(False)
+            return
+
+        # -- Groups are keyed by position, as names may be empty or duplicated.
+        self.review_strokes = stroke_edits
+        self.review = StrokeReview(mesh, {str(index): stroke_edit.model.faces for index, stroke_edit in enumerate(stroke_edits)})
+        self._install_review_shortcuts()
+        self.on_review_step(1)
+
+    def on_review_step(self, offset):
+        if not self.review:
+            return
+
+        stroke_edit = self.review_strokes[int(self.review.step(offset))]
+
+        if stroke_edit.parent():
+            stroke_edit.radio_button.setChecked(True)
+            self.strokes_group.scroll_area.ensureWidgetVisible(stroke_edit)
+
+    def _install_review_shortcuts(self):
+        """Installs the stepping hotkeys on the Maya window, application wide, so
+        they fire while the artist looks at the viewport as well as the tool."""
+
+        main_window = maya_window()
+
+        for key, offset in REVIEW_KEYS.items():
+            shortcut = QtGui.QShortcut(QtGui.QKeySequence(key), main_window)
+            shortcut.setContext(QtCore.Qt.ApplicationShortcut)
+            shortcut.activated.connect(partial(self.on_review_step, offset))
+            self.review_shortcuts.append(shortcut)
+
+    def _remove_review_shortcuts(self):
+        for shortcut in self.review_shortcuts:
+            shortcut.setEnabled(False)
+            shortcut.deleteLater()
+
+        self.review_shortcuts = []
+
+    # • ———————————————————————————
+    # • ———— Topology. ————
+
+    def on_grow(self):
+        stroke, mesh, mesh_topology = self._stroke_topology()
+
+        if stroke:
+            faces = mesh_topology.grow(stroke.model.faces, blocked=self._painted_indices(exclude=stroke))
+
+            with transactions.transaction("grow"):
+                self._paint(faces, stroke, store.APPEND)
+            self.dirty()
+
+    def on_shrink(self):
+        stroke, mesh, mesh_topology = self._stroke_topology()
+
+        if stroke:
+            faces = mesh_topology.shrink(stroke.model.faces)
+
+            with transactions.transaction("shrink"):
+                self.strokes_group.stroke_store.remove_faces(stroke.model, store.difference(stroke.model.faces, faces))
+            self.dirty()
+
+    def on_fill(self):
+        stroke, mesh, mesh_topology = self._stroke_topology()
+
+        if not stroke:
+            return
+
+        seeds = list(self._validate_selection(cmds.filterExpand(selectionMask=34)))
+
+        if not seeds:
+            responses.modal(self, False, "No Selection", "Select the polygons to fill from.")
+            return
+
+        faces = mesh_topology.flood_fill(api.get_indices(seeds), blocked=self._painted_indices())
+
+        with transactions.transaction("fill"):
+            self._paint(faces, stroke, store.APPEND)
+        self.dirty()
+
+    def on_border(self):
+        stroke, mesh, mesh_topology = self._stroke_topology()
+
+        if stroke:
+            faces = mesh_topology.border(stroke.model.faces)
+            cmds.select(list(api.to_polygons(mesh, faces)))
+
+    def on_islands_report(self):
+        all_strokes, mesh, islands = self._stroke_islands()
+
+        if not mesh:
+            return
+
+        details = []
+
+        for label, stroke in enumerate(all_strokes):
+            sizes = [len(island) for island in islands.get(label, [])]
+
+            if len(sizes) > 1:
+                details.append(f"<b>{stroke.model.name or '...'}</b>: {len(sizes)} islands ({', '.join(map(str, sizes))})")
+
+        if not details:
+            responses.modal(self, True, "No Strays", "Every stroke is a single island.")
+            return
+
+        responses.modal(self, False, "Strays Found", "<br>".join(details))
+
+    def on_keep_largest_island(self):
+        stroke = self.strokes_group.current_stroke()
+
+        if not stroke:
+            responses.modal(self, False, "No Stroke", "No stroke selected.")
+            return
+
+        all_strokes, mesh, islands = self._stroke_islands()
+
+        if not mesh:
+            return
+
+        strays = islands.get(all_strokes.index(stroke), [])[1:]
+
+        if strays:
+            with transactions.transaction("keep largest island"):
+                self.strokes_group.stroke_store.remove_faces(stroke.model, np.concatenate(strays))
+            self.dirty()
+
+    def on_select_strays(self):
+        all_strokes, mesh, islands = self._stroke_islands()
+
+        if not mesh:
+            return
+
+        strays = [stray for label_islands in islands.values() for stray in label_islands[1:]]
+        cmds.select(list(api.to_polygons(mesh, np.concatenate(strays))) if strays else [])
+
+    # • ———————————————————————————
+    # • ———— Mirror. ————
+
+    def on_axis_change(self, action):
+        self.settings["mirror_axis"] = action.data()
+
+    def on_mirror_stroke(self):
+        stroke, mesh, _ = self._stroke_topology()
+
+        if not stroke:
+            return
+
+        if not counterpart_name(stroke.model.name):
+            responses.modal(self, False, "No Side", "Prefix the stroke name with L_ or R_ to mirror it.")
+            return
+
+        self._mirror_strokes(mesh, [stroke])
+
+    def on_sync_pairs(self):
+        mesh, _ = self._mesh_topology()
+
+        if mesh:
+            left_strokes = [stroke for stroke in self.strokes_group.all_strokes() if stroke.model.name.startswith("L_")]
+            self._mirror_strokes(mesh, left_strokes)
+
+    def on_mirror_report(self):
+        mesh, _ = self._mesh_topology()
+
+        if not mesh:
+            return
+
+        mirror_map = meshes.mirror_map(mesh, self._mirror_axis())
+        strokes_map = {stroke.model.name: stroke for stroke in self.strokes_group.all_strokes()}
+        details = []
+
+        for name, stroke in strokes_map.items():
+            if not name.startswith("L_"):
+                continue
+
+            counterpart = strokes_map.get(counterpart_name(name))
+
+            if not counterpart:
+                details.append(f"<b>{name}</b>: missing counterpart")
+                continue
+
+            mirrored = self._mirror_indices(mirror_map, stroke.model.faces)
+            mismatched = np.setxor1d(mirrored, counterpart.model.faces)
+
+            if len(mismatched):
+                details.append(f"<b>{name}</b> / <b>{counterpart.model.name}</b>: {len(mismatched)} mismatched face(s)")
+
+        if not details:
+            responses.modal(self, True, "Symmetric", "All L_/R_ pairs mirror each other.")
+            return
+
+        responses.modal(self, False, "Asymmetric", "<br>".join(details))
+
+    def _mirror_strokes(self, mesh, source_strokes):
+        mirror_map = meshes.mirror_map(mesh, self._mirror_axis())
+        strokes_map = {stroke.model.name: stroke for stroke in self.strokes_group.all_strokes()}
+
+        # -- All the pairs are synced, and their counterparts created, as a single undo step.
+        with transactions.transaction("mirror"):
+            for stroke in source_strokes:
+                name = counterpart_name(stroke.model.name)
+                counterpart = strokes_map.get(name)
+
+                if not counterpart:
+                    counterpart = self.strokes_group.append_stroke(name, colour=stroke.model.colour, region=stroke.model.region)
+
+                # -- Faces on the mirror plane map onto themselves, they stay in the source stroke.
+                faces = stroke.model.faces
+                mirrored = np.setdiff1d(self._mirror_indices(mirror_map, faces), faces)
+
+                self._paint(mirrored, counterpart, store.REPLACE)
+
+        self.dirty()
+
+    def _mirror_indices(self, mirror_map, indices):
+        mirrored = mirror_map[indices]
+        return mirrored[mirrored >= 0]
+
+    def _mirror_axis(self):
+        return self.settings["mirror_axis"] or MIRROR_AXES[0]
+
+    def _stroke_islands(self):
+        mesh, mesh_topology = self._mesh_topology()
+
+        if not mesh:
+            return None, None, None
+
+        all_strokes = list(self.strokes_group.all_strokes())
+        labels = mesh_topology.to_labels([stroke.model.faces for stroke in all_strokes])
+
+        return all_strokes, mesh, mesh_topology.islands(labels)
+
+    def _stroke_topology(self):
+        stroke = self.strokes_group.current_stroke()
+
+        if not stroke:
+            responses.modal(self, False, "No Stroke", "No stroke selected.")
+            return None, None, None
+
+        mesh, mesh_topology = self._mesh_topology()
+        return (stroke, mesh, mesh_topology) if mesh else (None, None, None)
+
+    def _mesh_topology(self):
+        mesh = self.mesh.text()
+
+        if not mesh or mesh == self.mesh.property("default_text") or not cmds.objExists(mesh):
+            responses.modal(self, False, "No Mesh", "Paint the mesh first.")
+            return None, None
+
+        return mesh, api.get_topology(mesh)
+
+    def _painted_indices(self, exclude=None):
+        return self.strokes_group.stroke_store.painted_faces(exclude=exclude.model if exclude else None)
+
     # • ———————————————————————————
     # • ———— Paint. ————
 
+    def _current_mesh(self):
+        mesh = self.mesh.text()
+
+        if mesh and mesh != self.mesh.property("default_text"):
+            return mesh
+
+        selection = cmds.filterExpand(selectionMask=[12, 34])
+
+        if not selection:
+            return None
+
+        mesh = api.get_node(selection[0])
+        self._set_mesh(mesh)
+        return mesh
+
     def _validate_selection(self, selection):
         if not selection:
             return
@@ -127,27 +607,28 @@ class PainterUI(QtWidgets.QWidget):
 
         if not mesh or mesh == self.mesh.property("default_text"):
             mesh = api.get_node(selection[0])
-            self.mesh.setText(mesh)
+            self._set_mesh(mesh)
 
         for item in selection:
             if mesh == api.get_node(item):
                 yield item
 
-    def _remove_paint(self, polygons):
-        for stroke in self.strokes_group.all_strokes():
-            stroke.model.remove_polygons(polygons)
+    def _set_mesh(self, mesh):
+        """Shows the painted mesh and paints the strokes on it from now on, None
+        for no mesh."""
 
-    def _append_paint(self, polygons, stroke):
-        for other_stroke in filter(lambda x: x != stroke, self.strokes_group.all_strokes()):
-            other_stroke.model.remove_polygons(polygons)
+        self.mesh.setText(mesh or self.mesh.property("default_text"))
+        self.strokes_group.stroke_store.mesh = mesh
 
-        stroke.model.add_polygons(polygons)
+    def _paint_mode(self):
+        modes = {self.replace_radio: store.REPLACE, self.append_radio: store.APPEND, self.remove_radio: store.REMOVE}
+        return modes[self.mode_group.checkedButton()]
 
-    def _replace_paint(self, polygons, stroke):
-        for other_stroke in filter(lambda x: x != stroke, self.strokes_group.all_strokes()):
-            other_stroke.model.remove_polygons(polygons)
+    def _paint(self, faces, stroke, mode):
+        """Paints faces onto the stroke edit through the store, which takes them
+        from the other strokes (see store.StrokeStore.paint)."""
 
-        stroke.model.set_polygons(polygons)
+        self.strokes_group.stroke_store.paint(stroke.model if stroke else None, faces, mode)
 
     def on_alias_change(self):
         self.strokes_group.update_placeholder()
@@ -155,26 +636,38 @@ class PainterUI(QtWidgets.QWidget):
     # • ———————————————————————————
     # • ———— IO. ————
 
+    @instrumentation.traced("import")
     def import_data(self, mesh, data):
-        self.mesh.setText(mesh)
+        self._set_mesh(mesh)
         self.regions.import_data(data["strokes"])
         self.strokes_group.import_data(mesh, data["strokes"])
 
-    def export_data(self):
+    def get_data(self):
+        """The painted mesh and its strokes data, without marking them as saved.
+        Warns and returns Nones when there is nothing valid to export."""
+
         names = [stroke_edit.model.name for stroke_edit in self.strokes_group.all_strokes()]
 
         if any(name == "" for name in names) or len(names) != len(set(names)):
             responses.modal(self, False, "Invalid inputs", "Data contains empty or duplicate names.")
             return None, None
 
-        strokes_data = dict([stroke_edit.model.data() for stroke_edit in self.strokes_group.all_strokes()])
-        mesh = self.mesh.text()
+        strokes_data = self.strokes_group.stroke_store.data()
+        mesh = self.strokes_group.stroke_store.mesh
 
         if not mesh or not strokes_data:
             responses.modal(self, False, "Error", "Nothing to Export, no data found.")
-            return
+            return None, None
+
+        return mesh, strokes_data
+
+    @instrumentation.traced("export")
+    def export_data(self):
+        mesh, strokes_data = self.get_data()
+
+        if mesh and strokes_data:
+            self.is_saved = True
 
-        self.is_saved = True
         return mesh, strokes_data
 
     # • ———————————————————————————
@@ -189,11 +682,19 @@ class PainterUI(QtWidgets.QWidget):
             if not responses.question(self, "Revert", "Are you sure you want to revert? All unsaved changes will be lost."):
                 return
 
-        default_text = self.mesh.property("default_text")
-        self.mesh.setText(default_text)
+        self.drag_button.setChecked(False)
+        self.review_button.setChecked(False)
+
+        # -- Read before the label is reset: the mesh may be untracked, e.g. its
+        # colours were saved with the scene, and only found through its history.
+        mesh, default_text = self.mesh.text(), self.mesh.property("default_text")
 
-        self.strokes_group.clear()
+        self.strokes_group.clear(decolourize=False)
+        self._set_mesh(None)
         self.regions.clear()
 
         self.is_saved = True
-        api.remove_all_colours()
+        api.remove_colours([mesh] if mesh and mesh != default_text else None)
+
+
+instrumentation.register(__name__, functions=False)
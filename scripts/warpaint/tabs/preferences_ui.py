@@ -6,6 +6,7 @@ from warpaint.qt import QtWidgets, QtCore, QtGui
 
 from warpaint.library.components import layouts
 from warpaint.partials.shades_ui import ShadesUI
+from warpaint.partials.instrumentation_ui import InstrumentationUI
 
 
 class PreferencesUI(QtWidgets.QWidget):
@@ -24,6 +25,7 @@ class PreferencesUI(QtWidgets.QWidget):
 
     def setup_widgets(self):
         self.shades = ShadesUI(self.settings)
+        self.instrumentation = InstrumentationUI(self.settings)
 
         self.save_button = QtWidgets.QPushButton("Save Preferences", icon=QtGui.QIcon("icons:save.svg"))
         self.save_button.setProperty("default_text", "Update")
@@ -31,6 +33,7 @@ class PreferencesUI(QtWidgets.QWidget):
     def setup_layouts(self):
         main_layout = QtWidgets.QVBoxLayout(self)
         main_layout.addWidget(self.shades)
+        main_layout.addWidget(self.instrumentation)
 
         main_layout.addStretch()
         main_layout.addWidget(layouts.horizontal_divider())
@@ -41,6 +44,7 @@ class PreferencesUI(QtWidgets.QWidget):
 
     def populate(self):
         self.shades.populate()
+        self.instrumentation.populate()
 
     # • ———————————————————————————
     # • ———— Connections. ————
@@ -50,6 +54,7 @@ class PreferencesUI(QtWidgets.QWidget):
 
     def on_update(self):
         self.shades.save()
+        self.instrumentation.save()
         self.updated.emit()
 
         self.save_button.setText("Changes Saved!")
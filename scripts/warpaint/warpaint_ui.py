@@ -29,7 +29,7 @@ class WarPaintUI(template.BaseTemplate):
         self.paint = paint_ui.PainterUI(self.settings)
         self.tabs.addTab(self.paint, "Paint")
 
-        self.blend = blend_ui.BlenderUI(self.settings)
+        self.blend = blend_ui.BlenderUI(self.settings, self.paint)
         self.tabs.addTab(self.blend, "Blend")
 
         self.files = files_ui.FilesUI(self.settings, self.loading, self.paint)
@@ -56,6 +56,7 @@ class WarPaintUI(template.BaseTemplate):
         self.raise_window.connect(self.alias.populate)
 
         self.alias.updated.connect(self.paint.on_alias_change)
+        self.blend.colours_changed.connect(self.paint.repaint)
         self.preferences.updated.connect(self.paint.repaint)
         self.preferences.updated.connect(self.alias.repaint)
 
@@ -0,0 +1,4 @@
+from pathlib import Path
+import sys
+
+sys.path.insert(0, Path(__file__).resolve().parents[1].joinpath("scripts").as_posix())
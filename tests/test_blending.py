@@ -0,0 +1,23 @@
+import numpy as np
+
+from warpaint.core import blending
+from warpaint.core.numpy_backend import NumpyBackend, NumpyMesh, grid_mesh
+
+
+def test_point_blend_writes_and_restores():
+    base = grid_mesh(4, 4)
+    points = base.points.copy()
+    points[:5, 1] += 1.0
+
+    backend = NumpyBackend({"base": base, "morph": NumpyMesh(base.face_counts, base.face_vertices, points)})
+    base_points = base.points.copy()
+    point_blend = blending.PointBlend("base", "morph", backend)
+
+    np.testing.assert_array_equal(point_blend.moved, np.arange(5))
+
+    for weight in [0.25, 0.5, 1.0]:
+        point_blend.set_weight(weight)
+        np.testing.assert_allclose(backend.get_points("base"), base_points + (points - base_points) * weight)
+
+    point_blend.restore()
+    np.testing.assert_array_equal(backend.get_points("base"), base_points)
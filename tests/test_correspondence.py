@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from warpaint.core import correspondence
+from warpaint.core.numpy_backend import NumpyBackend, NumpyMesh, grid_mesh
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    correspondence.clear_cache()
+
+
+def shuffled_mesh(mesh, seed=0):
+    """The mesh with its faces and vertices in a random order, as after a reorder."""
+
+    random = np.random.default_rng(seed)
+    face_order, vertex_order = random.permutation(mesh.face_count), random.permutation(len(mesh.points))
+
+    vertex_labels = np.empty_like(vertex_order)
+    vertex_labels[vertex_order] = np.arange(len(vertex_order))
+
+    rows = mesh.face_vertices.reshape(mesh.face_count, -1)[face_order]
+    return NumpyMesh(mesh.face_counts[face_order], vertex_labels[rows].ravel(), mesh.points[vertex_order])
+
+
+def test_solves_shuffled_topology():
+    mesh = grid_mesh(4, 6)
+    shuffled = shuffled_mesh(mesh)
+    backend = NumpyBackend({"mesh": mesh, "shuffled": shuffled})
+
+    solution = correspondence.solve(backend.get_topology("mesh"), backend.get_topology("shuffled"))
+
+    # -- Every face lands on the face with the same vertices, in the same winding.
+    rows, shuffled_rows = mesh.face_vertices.reshape(-1, 4), shuffled.face_vertices.reshape(-1, 4)
+    for face, target_face in enumerate(solution.face_map):
+        mapped = solution.vertex_map[rows[face]]
+        shift = list(shuffled_rows[target_face]).index(mapped[0])
+        np.testing.assert_array_equal(np.roll(shuffled_rows[target_face], -shift), mapped)
+
+
+def test_different_topologies():
+    # -- As many faces, but a longer strip. A 6x4 grid would be a rotation.
+    backend = NumpyBackend({"mesh": grid_mesh(4, 6), "other": grid_mesh(3, 8)})
+
+    assert correspondence.solve(backend.get_topology("mesh"), backend.get_topology("other")) is None
+
+
+def test_remap_faces():
+    solution = correspondence.Correspondence(np.array([2, 0, 1]), np.arange(3))
+
+    remapped = solution.remap_faces([[0, 1], [], [2]])
+
+    assert [group.tolist() for group in remapped] == [[2, 0], [], [1]]
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from warpaint.core import correspondence, documents
+from warpaint.core.numpy_backend import NumpyBackend, grid_mesh
+
+from test_correspondence import shuffled_mesh
+
+
+STROKES = {"left": {"indices": [0, 1, 6], "region": "body", "colour_name": "red"}, "right": {"indices": [23], "region": "body", "colour_name": "blue"}}
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    correspondence.clear_cache()
+
+
+@pytest.fixture
+def backend():
+    mesh = grid_mesh(4, 6)
+    return NumpyBackend({"mesh": mesh, "shuffled": shuffled_mesh(mesh), "other": grid_mesh(3, 8)})
+
+
+def test_plain_round_trip(tmp_path, backend):
+    document = documents.build_document("mesh", STROKES, backend)
+    filepath = tmp_path.joinpath("mesh.paint")
+
+    documents.write_document(filepath, document)
+    loaded, store = documents.open_document(filepath)
+
+    assert store is None
+    assert loaded == document
+
+
+def test_match_document(backend):
+    document = documents.build_document("mesh", STROKES, backend)
+
+    assert documents.match_document("mesh", document, backend) == (document, documents.MATCHED)
+    assert documents.match_document("other", document, backend)[1] == documents.MISMATCHED
+
+    remapped, status = documents.match_document("shuffled", document, backend)
+    solution = correspondence.solve(backend.get_topology("mesh"), backend.get_topology("shuffled"))
+
+    assert status == documents.REMAPPED
+    for name, values in STROKES.items():
+        assert remapped["strokes"][name]["indices"] == solution.face_map[values["indices"]].tolist()
+
+
+def test_transfer_onto_denser_grid():
+    backend = NumpyBackend({"source": grid_mesh(4, 4), "target": grid_mesh(8, 8, size=0.5)})
+    strokes_data = {"corner": {"indices": [0], "region": "body"}, "opposite": {"indices": [15]}}
+
+    transferred = documents.transfer_document("source", "target", strokes_data, backend=backend)
+
+    assert transferred == {"corner": {"indices": [0, 1, 8, 9], "region": "body"}, "opposite": {"indices": [54, 55, 62, 63]}}
+
+
+def test_transfer_strokes_skips_unmapped_faces():
+    face_map = np.array([1, -1, 0, 1])
+
+    transferred = documents.transfer_strokes({"a": {"indices": [0]}, "b": {"indices": [1]}}, face_map, 2)
+
+    assert transferred == {"a": {"indices": [2]}, "b": {"indices": [0, 3]}}
@@ -0,0 +1,32 @@
+import numpy as np
+
+from warpaint.core import feathering
+from warpaint.core.numpy_backend import NumpyBackend, grid_mesh
+
+
+def feather(strokes_data, **kwargs):
+    return feathering.feather_strokes("grid", strokes_data, backend=NumpyBackend({"grid": grid_mesh(8, 8)}), **kwargs)
+
+
+def test_weights_fall_off_from_the_stroke():
+    weight_maps = feather({"middle": {"indices": [27, 28, 35, 36]}}, rings=2)
+    weights = weight_maps.dense("middle").reshape(9, 9)
+
+    # -- 1 on the stroke's vertices, decreasing along the row, 0 from 2 edges away.
+    np.testing.assert_array_equal(weights[3:6, 3:6], 1)
+    row = weights[4, 5:]
+    assert (np.diff(row) <= 0).all() and 0 < row[1] < 1 and row[2] == 0 and row[3] == 0
+    np.testing.assert_array_equal(weights, weights.T)
+
+
+def test_strokes_are_stored_sparsely(tmp_path):
+    weight_maps = feather({"corner": {"indices": [0]}, "empty": {"indices": []}}, rings=1)
+    filepath = tmp_path.joinpath(f"grid{feathering.FILE_EXTENSION}")
+
+    weight_maps.save(filepath)
+    loaded = feathering.WeightMaps.load(filepath)
+
+    assert loaded.names == ["corner", "empty"] and loaded.vertex_count == 81
+    assert not len(loaded.get("empty")[0])
+    np.testing.assert_allclose(loaded.dense("corner"), weight_maps.dense("corner"), atol=1e-6)
+    assert len(loaded.get("corner")[0]) < 81
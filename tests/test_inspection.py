@@ -0,0 +1,33 @@
+from warpaint.core import inspection
+from warpaint.core.numpy_backend import NumpyBackend, grid_mesh
+
+
+def inspect(strokes_data, template=None):
+    return inspection.inspect_strokes("grid", strokes_data, template=template, backend=NumpyBackend({"grid": grid_mesh(4, 6)}))
+
+
+def test_symmetric_pair():
+    # -- Faces 0 and 5 are the corners of the first row, mirrored across X.
+    report = inspect({"L_arm": {"indices": [0]}, "R_arm": {"indices": [5]}})
+
+    assert report.issues == 0
+    assert [stroke_report.mirror_mismatch for stroke_report in report.strokes] == [0, 0]
+    assert report.painted_faces == 2 and report.area_coverage == 2 / 24
+
+
+def test_asymmetric_and_unpaired():
+    report = inspect({"L_arm": {"indices": [0, 6]}, "R_arm": {"indices": [4]}, "L_leg": {"indices": [1]}})
+
+    assert report.asymmetric == ["L_arm", "R_arm"]
+    assert report.unpaired == ["L_leg"]
+    assert report.strokes[0].mirror_mismatch == 3
+
+
+def test_coverage_and_template():
+    report = inspect({"body": {"indices": list(range(12))}, "head": {"indices": [11, 12]}, "empty": {"indices": []}}, template=["body", "head", "tail"])
+
+    assert report.coverage == 13 / 24
+    assert report.overlapping_faces == 1
+    assert report.unpainted_islands == 1
+    assert report.empty == ["empty"] and report.missing == ["tail"] and report.extra == ["empty"]
+    assert report.issues == 3
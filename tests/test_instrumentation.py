@@ -0,0 +1,66 @@
+import sys, types
+
+import pytest
+
+from warpaint.core import instrumentation
+
+
+class FunctionSet:
+    def __init__(self, node):
+        self.node = node
+
+    def get_points(self, points):
+        return points
+
+
+def fake_maya_module():
+    module = types.SimpleNamespace(FunctionSet=FunctionSet, kWorld=4)
+    module.select = lambda items: items
+    return module
+
+
+@pytest.fixture
+def instrumented(monkeypatch):
+    """A registered module using a fake Maya module, instrumented."""
+
+    module = types.ModuleType("warpaint_instrumented")
+    module.om2 = fake_maya_module()
+    module.get_points = lambda node: instrumentation.counting(module.om2.FunctionSet(node)).get_points([0, 1, 2])
+
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    instrumentation.register(module.__name__, functions=False)
+    instrumentation.enable()
+
+    yield module
+
+    instrumentation.enable(False)
+    instrumentation._REGISTERED.pop(module.__name__)
+    instrumentation.clear()
+
+
+def test_counts_functions_and_methods(instrumented):
+    span = instrumentation.open_span("operation")
+    instrumented.om2.select(["a", "b"])
+    instrumented.get_points("mesh")
+    instrumentation.close_span(span)
+
+    assert span.maya_calls == 2
+    assert span.components == 5
+
+
+def test_classes_are_not_wrapped(instrumented):
+    assert instrumented.om2.FunctionSet is FunctionSet
+    assert instrumented.om2.kWorld == 4
+
+    function_set = instrumentation.counting(instrumented.om2.FunctionSet("mesh"))
+
+    assert isinstance(function_set, instrumented.om2.FunctionSet)
+    assert function_set.node == "mesh"
+
+
+def test_disabled_leaves_everything_untouched(instrumented):
+    instrumentation.enable(False)
+
+    function_set = FunctionSet("mesh")
+    assert instrumentation.counting(function_set) is function_set
+    assert not isinstance(instrumented.om2, instrumentation.CountingModule)
@@ -0,0 +1,37 @@
+import numpy as np
+
+from warpaint.core import masks
+from warpaint.core.numpy_backend import NumpyBackend, grid_mesh
+
+
+def test_rasterize_strokes():
+    mesh = grid_mesh(4, 6)
+    strokes_data = {"all": {"indices": list(range(mesh.face_count)), "region": "body"}, "half": {"indices": list(range(12)), "region": "body"}}
+
+    stroke_masks = masks.rasterize_strokes("grid", strokes_data, resolution=16, workers=1, backend=NumpyBackend({"grid": mesh}))
+
+    assert stroke_masks["all"].shape == (16, 16) and stroke_masks["all"].all()
+    assert stroke_masks["half"].mean() == 0.5
+
+
+def test_rasterize_triangles():
+    square = np.array([[[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]], [[1.0, 0.0], [1.0, 1.0], [0.0, 1.0]]])
+
+    lower = masks.rasterize(square[:1], 8)
+
+    assert masks.rasterize(square, 8).all()
+    assert lower[-1].all() and not lower[0, 1:].any()  # -- Row 0 at V = 1.
+    np.testing.assert_array_equal(lower.sum(axis=1), np.arange(1, 9))
+
+
+def test_rasterize_small_triangle():
+    speck = np.array([[[0.5, 0.5], [0.51, 0.5], [0.5, 0.51]]])
+
+    assert masks.rasterize(speck, 8).sum() == 1
+    assert masks.rasterize(speck, 8, padding=1).sum() == 5
+
+
+def test_region_groups():
+    strokes_data = {"a": {"indices": [0], "region": "arm"}, "b": {"indices": [1]}, "c": {"indices": [2, 3], "region": "arm"}}
+
+    assert masks.region_groups(strokes_data) == {"arm": [0, 2, 3], "default": [1]}
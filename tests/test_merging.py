@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from warpaint.core import merging
+
+
+BASE = {"point_order_hash": "hash", "strokes": {"a": {"indices": [0, 1, 2], "region": "arm"}, "b": {"indices": [5, 6]}, "c": {"indices": [9]}}}
+OURS = {"point_order_hash": "hash", "strokes": {"a": {"indices": [0, 1, 2, 3], "region": "arm"}, "b": {"indices": [5]}, "c": {"indices": [9, 10]}}}
+THEIRS = {"point_order_hash": "hash", "strokes": {"a": {"indices": [0, 1], "region": "leg"}, "b": {"indices": [5, 6, 3]}, "d": {"indices": [12]}}}
+
+
+def stroke_indices(document):
+    return {name: values["indices"] for name, values in document["strokes"].items()}
+
+
+def test_diff_documents():
+    diff = merging.diff_documents(BASE, THEIRS)
+
+    assert diff.data() == {
+        "added": ["d"],
+        "removed": ["c"],
+        "changed": [{"name": "a", "added": [], "removed": [2], "changes": {"region": ("arm", "leg")}}, {"name": "b", "added": [3], "removed": [], "changes": {}}],
+    }
+    assert not merging.diff_documents(BASE, BASE)
+
+
+@pytest.mark.parametrize(
+    "policy, owner, deleted",
+    [(merging.OURS, "a", False), (merging.THEIRS, "b", True), (merging.BASE, None, False)],
+)
+def test_merge_documents(policy, owner, deleted):
+    result = merging.merge_documents(BASE, OURS, THEIRS, policy)
+    indices = stroke_indices(result.document)
+
+    # -- Face 3 was given to a by us and to b by them, face 2 removed by them.
+    np.testing.assert_array_equal(result.conflicts, [3])
+    assert result.stroke_conflicts == ["c"]
+    assert indices["a"] == ([0, 1, 3] if owner == "a" else [0, 1])
+    assert indices["b"] == ([3, 5] if owner == "b" else [5])
+    assert indices["d"] == [12]
+    assert ("c" not in indices) if deleted else indices["c"] == [9, 10]
+
+    # -- Only they changed the region, whatever the policy.
+    assert result.document["strokes"]["a"]["region"] == "leg"
+
+
+def test_merge_rejects_other_meshes():
+    with pytest.raises(ValueError):
+        merging.merge_documents(BASE, OURS, dict(THEIRS, point_order_hash="other"))
+
+    with pytest.raises(ValueError):
+        merging.merge_documents(BASE, OURS, THEIRS, policy="mine")
+
+
+def test_sorted_set_operations():
+    values, other = np.array([1, 3, 5, 7]), np.array([3, 4, 7])
+
+    np.testing.assert_array_equal(merging.sorted_difference(values, other), [1, 5])
+    np.testing.assert_array_equal(merging.sorted_intersection(values, other), [3, 7])
+    np.testing.assert_array_equal(merging.sorted_union(values, other), [1, 3, 4, 5, 7])
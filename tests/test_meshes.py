@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from warpaint.core import meshes, spatial
+from warpaint.core.numpy_backend import NumpyBackend, NumpyMesh, grid_mesh
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    spatial.clear_cache()
+
+
+def strip_mesh(xs):
+    """A strip of quads on the XZ plane, between the given X coordinates."""
+
+    points = np.array([[x, 0.0, z] for z in (0.0, 1.0) for x in xs])
+    count = len(xs)
+    face_vertices = np.array([[i, i + 1, count + i + 1, count + i] for i in range(count - 1)])
+
+    return NumpyMesh(np.full(count - 1, 4), face_vertices.ravel(), points)
+
+
+def test_transfer_onto_the_face_underneath():
+    # -- The small face's centroid is nearer, but the target lies on the large face.
+    backend = NumpyBackend({"source": strip_mesh([0.0, 10.0, 10.2]), "target": strip_mesh([9.4, 9.6])})
+
+    np.testing.assert_array_equal(meshes.transfer_map("source", "target", backend=backend), [0])
+    np.testing.assert_array_equal(meshes.transfer_map("source", "target", min_dot=0.5, backend=backend), [0])
+
+
+def test_transfer_keeps_the_nearest_face_when_none_agree():
+    # -- The same grid flipped over, all its faces disagree with the source.
+    source, flipped = grid_mesh(4, 4), grid_mesh(4, 4)
+    flipped.face_vertices = flipped.face_vertices.reshape(-1, 4)[:, ::-1].ravel()
+    backend = NumpyBackend({"source": source, "flipped": flipped})
+
+    np.testing.assert_array_equal(meshes.transfer_map("source", "flipped", min_dot=0.5, backend=backend), np.arange(16))
@@ -0,0 +1,81 @@
+import json
+
+import numpy as np
+
+from warpaint.core import documents, objects
+from warpaint.core.numpy_backend import NumpyBackend, grid_mesh
+
+
+STROKES = {"left": {"indices": [0, 1, 6], "colour_name": "red"}, "right": {"indices": [23], "colour_name": "blue"}}
+
+
+def test_put_stores_blocks_once(tmp_path):
+    store = objects.ObjectStore(tmp_path)
+
+    key = store.put(b"content")
+
+    assert store.put(b"content") == key
+    assert store.get(key) == b"content"
+    assert store.keys() == {key}
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def test_map_indices(tmp_path):
+    store = objects.ObjectStore(tmp_path)
+    indices = np.array([3, 1, 4], dtype=objects.INDEX_DTYPE)
+
+    np.testing.assert_array_equal(store.map(store.put(indices.tobytes())), indices)
+    assert not len(store.map(store.put(b"")))
+
+
+def test_prune_unused_blocks(tmp_path):
+    store = objects.ObjectStore(tmp_path)
+    used, unused = store.put(b"used"), store.put(b"unused")
+
+    assert store.prune([used]) == 1
+    assert store.keys() == {used}
+    assert not store.path(unused).exists()
+
+
+def test_manifest_keys(tmp_path):
+    store = objects.ObjectStore(tmp_path.joinpath(objects.OBJECTS_DIRNAME))
+    document = {"point_order_hash": "hash", "strokes": {"a": {"indices": [0, 1]}, "b": {"indices": [2]}}}
+
+    objects.write_manifest(tmp_path.joinpath("a.paint"), document, store)
+    manifest = json.loads(tmp_path.joinpath("a.paint").read_text())
+
+    assert objects.is_manifest(manifest) and manifest["objects"] == objects.OBJECTS_DIRNAME
+    assert set(objects.manifest_keys(manifest)) == store.keys()
+    assert manifest["strokes"]["a"]["indices"]["count"] == 2
+
+
+def test_manifest_round_trip(tmp_path):
+    document = documents.build_document("mesh", STROKES, NumpyBackend({"mesh": grid_mesh(4, 6)}))
+    store = objects.ObjectStore(tmp_path.joinpath(objects.OBJECTS_DIRNAME))
+
+    documents.write_document(tmp_path.joinpath("mesh.paint"), document, store)
+    documents.write_document(tmp_path.joinpath("copy.paint"), document, store)
+    loaded, loaded_store = documents.open_document(tmp_path.joinpath("mesh.paint"))
+
+    # -- Both documents share their blocks: one per stroke, one for the topology.
+    assert len(store.keys()) == 3
+    assert loaded_store.directory.resolve() == store.directory.resolve()
+    assert loaded["topology"] == document["topology"] and loaded["point_order_hash"] == document["point_order_hash"]
+
+    for name, values in STROKES.items():
+        np.testing.assert_array_equal(loaded["strokes"][name]["indices"], values["indices"])
+        assert loaded["strokes"][name]["colour_name"] == values["colour_name"]
+
+
+def test_manifests_are_recorded_as_referrers(tmp_path):
+    store = objects.ObjectStore(tmp_path.joinpath("objects"))
+    filepath = tmp_path.joinpath("a.paint")
+
+    objects.write_manifest(filepath, {"strokes": {}}, store)
+    objects.write_manifest(filepath, {"strokes": {"a": {"indices": [0]}}}, store)
+
+    assert store.referrers() == {filepath.resolve().as_posix()}
+    assert len(store.keys()) == 1  # -- Records are not blocks.
+
+    store.remove_referrer(filepath)
+    assert not store.referrers()
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from warpaint.core import spatial
+from warpaint.core.numpy_backend import grid_mesh
+
+
+def sphere_points(rows, columns):
+    theta, phi = np.meshgrid(np.linspace(0.05, np.pi - 0.05, rows), np.linspace(0, 2 * np.pi, columns, endpoint=False), indexing="ij")
+    return np.stack([np.sin(theta) * np.cos(phi), np.cos(theta), np.sin(theta) * np.sin(phi)], axis=-1).reshape(-1, 3)
+
+
+def brute_force(points, queries):
+    squared = ((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=2)
+    return np.sqrt(squared.min(axis=1))
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    spatial.clear_cache()
+
+
+@pytest.mark.parametrize("scale", [1.0, 1.01, 1.05, 1.5])
+def test_nearest_on_scaled_target(scale):
+    points = sphere_points(60, 120)
+    queries = points[::7] * scale
+
+    indices, distances = spatial.UniformGrid(points).nearest(queries)
+
+    assert (indices >= 0).all()
+    np.testing.assert_allclose(distances, brute_force(points, queries))
+    np.testing.assert_allclose(np.linalg.norm(points[indices] - queries, axis=1), distances)
+
+
+def test_nearest_on_offset_target():
+    points = grid_mesh(80, 80).points
+    queries = points * 1.03 + [5.0, 2.0, -3.0]
+
+    indices, distances = spatial.UniformGrid(points).nearest(queries)
+
+    assert (indices >= 0).all()
+    np.testing.assert_allclose(distances, brute_force(points, queries))
+
+
+def test_nearest_random_points():
+    rng = np.random.default_rng(0)
+    points = rng.random((3000, 3)) * [1.0, 1.0, 0.01]
+    queries = rng.random((400, 3)) * 3 - 1
+
+    _, distances = spatial.UniformGrid(points).nearest(queries)
+    np.testing.assert_allclose(distances, brute_force(points, queries))
+
+
+def test_nearest_max_distance():
+    points = grid_mesh(10, 10).points
+    queries = points + [0.0, 0.5, 0.0]
+
+    near, _ = spatial.UniformGrid(points).nearest(queries, max_distance=0.6)
+    far, distances = spatial.UniformGrid(points).nearest(queries, max_distance=0.4)
+
+    assert (near >= 0).all()
+    assert (far == -1).all() and np.isinf(distances).all()
+
+
+def test_nearest_accept():
+    points = grid_mesh(10, 10).points
+    odd = np.arange(len(points)) % 2 == 1
+
+    indices, _ = spatial.UniformGrid(points).nearest(points, accept=lambda queries, candidates: odd[candidates])
+    assert odd[indices].all()
+
+
+def test_mirror_map_is_an_involution():
+    mesh = grid_mesh(20, 30)
+    centroids = mesh.points[mesh.face_vertices.reshape(-1, 4)].mean(axis=1)
+
+    mirror_map = spatial.mirror_map(centroids)
+
+    assert (mirror_map >= 0).all()
+    np.testing.assert_array_equal(mirror_map[mirror_map], np.arange(len(centroids)))
+
+
+def test_transfer_map_matches_every_scaled_face():
+    source = sphere_points(80, 160)
+    target = sphere_points(50, 100) * 1.03
+
+    face_map = spatial.transfer_map(source, target, source, target / 1.03, min_dot=0.5)
+
+    assert (face_map >= 0).all()
+    np.testing.assert_allclose(np.linalg.norm(source[face_map] - target, axis=1), brute_force(source, target))
+
+
+def test_transfer_map_prefers_agreeing_normals():
+    sheet = grid_mesh(30, 30, size=0.01).points
+    source = np.concatenate([sheet, sheet + [0.0, 0.004, 0.0]])
+    normals = np.repeat([[0.0, -1.0, 0.0], [0.0, 1.0, 0.0]], len(sheet), axis=0)
+
+    # -- Lower sheet faces, nearer to the upper sheet.
+    target = sheet + [0.0, 0.003, 0.0]
+    face_map = spatial.transfer_map(source, target, normals, normals[: len(sheet)], min_dot=0.5)
+
+    assert (face_map < len(sheet)).all()
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from warpaint import storage
+from warpaint.core import objects
+
+
+def write_library(directory, store, strokes_data):
+    directory.mkdir()
+    objects.write_manifest(directory.joinpath("asset.paint"), {"strokes": strokes_data}, store)
+    return directory
+
+
+@pytest.fixture
+def shared(tmp_path):
+    """Two libraries sharing a store, each with a block of its own."""
+
+    store = objects.ObjectStore(tmp_path.joinpath("objects"))
+    hero = write_library(tmp_path.joinpath("hero"), store, {"a": {"indices": [0]}})
+    crowd = write_library(tmp_path.joinpath("crowd"), store, {"a": {"indices": [1]}})
+
+    return store, hero, crowd
+
+
+def test_prune_counts_without_yes(shared, capsys):
+    store, hero, crowd = shared
+    hero.joinpath("asset.paint").unlink()
+    store.put(b"unused")
+
+    assert storage.main(["prune", str(crowd)]) == 0
+    assert "2 unused block(s), run with --yes" in capsys.readouterr().out
+    assert len(store.keys()) == 3
+
+    assert storage.main(["prune", str(crowd), "--yes"]) == 0
+    assert len(store.keys()) == 1 and len(store.referrers()) == 1
+
+
+def test_prune_skips_stores_shared_with_other_libraries(shared, capsys):
+    store, hero, crowd = shared
+
+    assert storage.main(["prune", str(hero), "--yes"]) == 1
+    assert "1 other manifest(s)" in capsys.readouterr().out
+    assert len(store.keys()) == 2
+
+    assert storage.main(["prune", str(hero), str(crowd), "--yes"]) == 0
+    assert len(store.keys()) == 2
+
+
+def test_prune_skips_unrecorded_manifests(shared, capsys):
+    store, hero, crowd = shared
+    store.remove_referrer(hero.joinpath("asset.paint"))
+
+    assert storage.main(["prune", str(hero), str(crowd), "--yes"]) == 1
+    assert "not recorded" in capsys.readouterr().out
+
+    assert storage.main(["pack", str(hero)]) == 0
+    assert storage.main(["prune", str(hero), str(crowd), "--yes"]) == 0
+
+
+def test_unpack_forgets_the_referrer(shared):
+    store, hero, crowd = shared
+
+    assert storage.main(["unpack", str(hero)]) == 0
+
+    assert not objects.is_manifest(json.loads(hero.joinpath("asset.paint").read_text()))
+    assert store.referrers() == {crowd.joinpath("asset.paint").resolve().as_posix()}
@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+from warpaint.core import store
+from warpaint.core.numpy_backend import NumpyBackend, grid_mesh
+
+
+RED, BLUE = (255, 0, 0), (0, 0, 255)
+
+
+def palette(stroke):
+    return {"red": RED, "blue": BLUE}[stroke.colour_name] if stroke.is_highlighted else (10, 10, 10)
+
+
+@pytest.fixture
+def stroke_store():
+    backend = NumpyBackend({"grid": grid_mesh(4, 4)})
+    strokes_data = {"a": {"colour_name": "red", "indices": [0, 1, 2, 3], "region": "face"}, "b": {"colour_name": "blue", "indices": [4, 5], "region": "body"}}
+    return store.StrokeStore.from_data("grid", strokes_data, backend, palette)
+
+
+def faces(stroke_store):
+    return {stroke.name: stroke.faces.tolist() for stroke in stroke_store.all_strokes()}
+
+
+def coloured(stroke_store):
+    return np.flatnonzero(stroke_store.backend.meshes["grid"].coloured).tolist()
+
+
+@pytest.mark.parametrize(
+    "mode, expected",
+    [
+        (store.APPEND, {"a": [0, 1, 2, 3, 4, 6], "b": [5]}),
+        (store.REPLACE, {"a": [3, 4, 6], "b": [5]}),
+        (store.REMOVE, {"a": [0, 1, 2], "b": [5]}),
+    ],
+)
+def test_paint_modes(stroke_store, mode, expected):
+    stroke_store.paint(stroke_store.all_strokes()[0], [3, 4, 6, 4], mode)
+
+    assert faces(stroke_store) == expected
+    assert coloured(stroke_store) == sorted(np.concatenate([indices for indices in expected.values()]).tolist())
+
+    # -- Every face is displayed after its stroke.
+    colours = stroke_store.backend.meshes["grid"].colours
+    assert [tuple(colour) for colour in colours[expected["b"]]] == [BLUE] * len(expected["b"])
+    assert [tuple(colour) for colour in colours[expected["a"]]] == [RED] * len(expected["a"])
+
+
+def test_apply_reverts_recorded_changes(stroke_store):
+    recorded = []
+    stroke_store.recorder = lambda stroke_store, stroke, added, removed: recorded.append((stroke, added, removed))
+
+    before = faces(stroke_store)
+    stroke_store.paint(stroke_store.all_strokes()[1], [0, 1, 8], store.REPLACE)
+
+    assert faces(stroke_store) == {"a": [2, 3], "b": [0, 1, 8]}
+    assert [(stroke.name, added.tolist(), removed.tolist()) for stroke, added, removed in recorded] == [("a", [], [0, 1]), ("b", [0, 1, 8], [4, 5])]
+
+    # -- As undoing does, without recording.
+    stroke_store.apply([(stroke, removed, added) for stroke, added, removed in reversed(recorded)], record=False)
+
+    assert faces(stroke_store) == before
+    assert coloured(stroke_store) == [0, 1, 2, 3, 4, 5]
+    assert len(recorded) == 2
+
+
+def test_remove_faces_and_strokes(stroke_store):
+    a, b = stroke_store.all_strokes()
+
+    stroke_store.remove_faces(a, [3, 4])
+    assert faces(stroke_store) == {"a": [0, 1, 2], "b": [4, 5]}
+
+    stroke_store.remove_stroke(b)
+    assert b.is_deleted and stroke_store.all_strokes() == [a]
+    assert coloured(stroke_store) == [0, 1, 2]
+
+    stroke_store.remove_stroke(a, decolour=False)
+    assert coloured(stroke_store) == [0, 1, 2]
+
+
+def test_regions(stroke_store):
+    stroke_store.set_region("body")
+    colours = stroke_store.backend.meshes["grid"].colours
+
+    assert [stroke.is_highlighted for stroke in stroke_store.all_strokes()] == [False, True]
+    assert tuple(colours[0]) == (10, 10, 10) and tuple(colours[4]) == BLUE
+
+    stroke_store.rename_region("body", "torso")
+    assert stroke_store.regions() == ["face", "torso"]
+    assert [stroke.name for stroke in stroke_store.all_strokes("torso")] == ["b"]
+
+    stroke_store.delete_region("face")
+    assert stroke_store.regions() == ["torso"]
+    assert coloured(stroke_store) == [4, 5]
+
+
+def test_queries_and_data(stroke_store):
+    a, b = stroke_store.all_strokes()
+
+    assert stroke_store.labels()[:7].tolist() == [0, 0, 0, 0, 1, 1, -1]
+    assert stroke_store.painted_faces(exclude=a).tolist() == [4, 5]
+    assert stroke_store.vertices(b).tolist() == [5, 6, 7, 10, 11, 12]
+
+    stroke_store.select(b)
+    assert stroke_store.backend.selection["grid"].tolist() == [4, 5]
+
+    assert stroke_store.data() == {"a": {"colour_name": "red", "indices": [0, 1, 2, 3], "region": "face"}, "b": {"colour_name": "blue", "indices": [4, 5], "region": "body"}}
+
+
+def test_counterpart_name():
+    assert store.counterpart_name("L_eye") == "R_eye"
+    assert store.counterpart_name("R_eye") == "L_eye"
+    assert store.counterpart_name("nose") is None
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from warpaint.core import spatial, surface_maps
+from warpaint.core.numpy_backend import NumpyBackend, NumpyMesh, sphere_mesh
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    spatial.clear_cache()
+
+
+def cap_strokes(mesh, height):
+    """A stroke of the faces above the height, by face centroid."""
+
+    backend = NumpyBackend({"mesh": mesh})
+    centroids = backend.get_topology("mesh").face_centroids(mesh.points)
+
+    return {"cap": {"indices": np.flatnonzero(centroids[:, 1] > height).tolist()}}
+
+
+def test_scaled_target_maps_every_vertex(tmp_path):
+    source, target = sphere_mesh(40, 80), sphere_mesh(30, 60, radius=1.05)
+    backend = NumpyBackend({"source": source, "target": target})
+    source_strokes, target_strokes = cap_strokes(source, 0.5), cap_strokes(target, 0.5 * 1.05)
+
+    surface_map = surface_maps.get_surface_map("source", "target", source_strokes, target_strokes, tmp_path, backend)
+
+    np.testing.assert_array_equal(surface_map.vertices, np.arange(len(target.points)))
+    assert surface_map.constrained.any() and not surface_map.constrained.all()
+
+    # -- Interpolated source positions lie on the unit sphere, under the target vertices.
+    positions = surface_map.interpolate(source.points)
+    directions = target.points / np.linalg.norm(target.points, axis=1, keepdims=True)
+    assert np.abs(np.linalg.norm(positions, axis=1) - 1).max() < 0.02
+    assert (np.einsum("ij,ij->i", positions, directions) > 0.95).all()
+
+
+def test_cached_map_round_trip(tmp_path):
+    backend = NumpyBackend({"source": sphere_mesh(10, 20), "target": sphere_mesh(8, 16, radius=1.2)})
+    strokes = {}
+
+    surface_map = surface_maps.get_surface_map("source", "target", strokes, strokes, tmp_path, backend)
+    spatial.clear_cache()
+    loaded = surface_maps.get_surface_map("source", "target", strokes, strokes, tmp_path, backend)
+
+    assert len(list(tmp_path.iterdir())) == 1
+    np.testing.assert_array_equal(loaded.triangles, surface_map.triangles)
+    np.testing.assert_allclose(loaded.barycentrics, surface_map.barycentrics, atol=1e-6)
+
+
+def test_empty_source_is_not_cached(tmp_path):
+    empty = NumpyMesh(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.zeros((3, 3)))
+    backend = NumpyBackend({"source": empty, "target": sphere_mesh(4, 8)})
+
+    with pytest.raises(ValueError):
+        surface_maps.get_surface_map("source", "target", {}, {}, tmp_path, backend)
+
+    assert not list(tmp_path.iterdir())
+
+
+def test_closest_barycentrics():
+    a, b, c = np.array([[0.0, 0, 0]]), np.array([[1.0, 0, 0]]), np.array([[0.0, 1, 0]])
+    points = np.array([[0.25, 0.25, 1.0], [2.0, 0.0, 0.0], [-1.0, -1.0, 0.0]])
+
+    barycentrics = surface_maps.closest_barycentrics(points, *(np.repeat(corner, 3, axis=0) for corner in (a, b, c)))
+
+    np.testing.assert_allclose(barycentrics, [[0.5, 0.25, 0.25], [0, 1, 0], [1, 0, 0]])
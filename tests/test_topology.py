@@ -0,0 +1,62 @@
+import numpy as np
+
+from warpaint.core import topology
+from warpaint.core.numpy_backend import NumpyBackend, grid_mesh
+
+
+def grid_topology():
+    """The topology of a 5x5 grid, face 12 in its middle."""
+
+    return NumpyBackend({"grid": grid_mesh(5, 5)}).get_topology("grid")
+
+
+def test_neighbours_grow_and_shrink():
+    mesh_topology = grid_topology()
+
+    np.testing.assert_array_equal(mesh_topology.neighbours([12]), [7, 11, 13, 17])
+    np.testing.assert_array_equal(mesh_topology.grow([12]), [7, 11, 12, 13, 17])
+    np.testing.assert_array_equal(mesh_topology.shrink(mesh_topology.grow([12], 2)), [7, 11, 12, 13, 17])
+
+
+def test_border_and_flood_fill():
+    mesh_topology = grid_topology()
+    cross = mesh_topology.grow([12])
+
+    assert not len(mesh_topology.border(np.arange(mesh_topology.face_count)))
+    np.testing.assert_array_equal(mesh_topology.border(cross), [7, 11, 13, 17])
+
+    # -- The border walls the middle face off, the fill goes around it.
+    filled = mesh_topology.flood_fill([0], blocked=mesh_topology.border(cross))
+    np.testing.assert_array_equal(filled, np.setdiff1d(np.arange(mesh_topology.face_count), cross))
+
+
+def test_islands_and_labels():
+    mesh_topology = grid_topology()
+    labels = mesh_topology.to_labels([[0, 1, 5], [23, 24]])
+
+    islands = mesh_topology.islands(labels)
+
+    assert list(islands) == [0, 1]
+    np.testing.assert_array_equal(islands[0][0], [0, 1, 5])
+    np.testing.assert_array_equal(islands[1][0], [23, 24])
+
+    split = topology.split_labels(np.array([0, 1, -1, 0]), 2)
+    np.testing.assert_array_equal(split[0], [0, 3])
+    np.testing.assert_array_equal(split[1], [1])
+
+
+def test_face_queries():
+    mesh = grid_mesh(5, 5)
+    mesh_topology = NumpyBackend({"grid": mesh}).get_topology("grid")
+
+    np.testing.assert_array_equal(mesh_topology.face_vertex_indices([0]), [0, 1, 6, 7])
+    np.testing.assert_allclose(mesh_topology.face_areas(mesh.points), 1.0)
+
+    loops = mesh_topology.boundary_loops([12])
+    assert len(loops) == 1 and sorted(loops[0]) == [14, 15, 20, 21]
+
+
+def test_data_round_trip():
+    mesh_topology = grid_topology()
+
+    assert topology.from_data(mesh_topology.data()).fingerprint == mesh_topology.fingerprint